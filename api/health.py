@@ -1,35 +1,40 @@
-"""Health check endpoint."""
+"""Health check endpoint.
+
+Serves /health, /readyz (readiness, ?probe=ready) and /livez (liveness,
+?probe=live). Reads the data metadata sidecar written by the build instead
+of the full dataset, so a cold probe costs a small file read.
+"""
 
-import hashlib
-import json
 import os
 import sys
-from datetime import datetime, timezone
 from http.server import BaseHTTPRequestHandler
-from pathlib import Path
 
 # Add src to path so security_controls_mcp is importable
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from security_controls_mcp.http_server import (  # noqa: E402
-    SERVER_VERSION,
-    scf_data,
-    DATA_FINGERPRINT,
-    DATA_BUILT,
+from security_controls_mcp.health import (  # noqa: E402
+    LIVENESS_BODY,
+    health_body,
+    load_metadata,
+    readiness_body,
 )
 
+METADATA = load_metadata()
+HEALTH_BODY = health_body(METADATA)
+READINESS_BODY = readiness_body(METADATA, loaded=False)
+
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
+        if 'probe=live' in self.path:
+            body = LIVENESS_BODY
+        elif 'probe=ready' in self.path:
+            body = READINESS_BODY
+        else:
+            body = HEALTH_BODY
         self.send_response(200)
         self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
         self.end_headers()
-        self.wfile.write(json.dumps({
-            'status': 'ok',
-            'server': 'security-controls-mcp',
-            'version': SERVER_VERSION,
-            'controls_count': len(scf_data.controls),
-            'frameworks_count': len(scf_data.frameworks),
-            'data_fingerprint': DATA_FINGERPRINT,
-            'data_built': DATA_BUILT,
-        }).encode())
+        self.wfile.write(body)
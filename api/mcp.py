@@ -1,11 +1,11 @@
 """Vercel serverless handler for Security Controls MCP.
 
 Returns JSON responses (not SSE) for serverless compatibility.
-Imports tool logic from the existing http_server module.
+Dispatch lives in security_controls_mcp.serverless, which imports only the
+tool engine and data, keeps one event loop per warm instance and serves
+initialize/tools/list from precomputed responses.
 """
 
-import asyncio
-import json
 import os
 import sys
 from http.server import BaseHTTPRequestHandler
@@ -13,11 +13,7 @@ from http.server import BaseHTTPRequestHandler
 # Add src to path so security_controls_mcp is importable
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from security_controls_mcp.http_server import (  # noqa: E402
-    SERVER_VERSION,
-    call_tool,
-    list_tools,
-)
+from security_controls_mcp import serverless  # noqa: E402
 
 
 def _cors_headers(handler):
@@ -34,103 +30,19 @@ class handler(BaseHTTPRequestHandler):
         self.end_headers()
 
     def do_GET(self):
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        _cors_headers(self)
-        self.end_headers()
-        self.wfile.write(json.dumps({
-            'name': 'security-controls-mcp',
-            'version': SERVER_VERSION,
-            'protocol': 'mcp-streamable-http',
-        }).encode())
+        self._send_json(serverless.INFO)
 
     def do_POST(self):
-        request_id = 1
         try:
             content_length = int(self.headers.get('Content-Length', 0))
-            raw = self.rfile.read(content_length)
-            if not raw:
-                response = {
-                    'jsonrpc': '2.0',
-                    'id': request_id,
-                    'error': {'code': -32700, 'message': 'Parse error: empty request body'},
-                }
-            else:
-                body = json.loads(raw)
-                method = body.get('method')
-                params = body.get('params', {})
-                request_id = body.get('id', 1)
-                response = asyncio.run(_handle_method(method, params, request_id))
-        except json.JSONDecodeError:
-            response = {
-                'jsonrpc': '2.0',
-                'id': request_id,
-                'error': {'code': -32700, 'message': 'Parse error: invalid JSON'},
-            }
-        except Exception as e:
-            response = {
-                'jsonrpc': '2.0',
-                'id': request_id,
-                'error': {'code': -32603, 'message': str(e)},
-            }
+        except ValueError:
+            content_length = 0
+        self._send_json(serverless.handle(self.rfile.read(content_length)))
 
+    def _send_json(self, body):
         self.send_response(200)
         self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
         _cors_headers(self)
         self.end_headers()
-        self.wfile.write(json.dumps(response).encode())
-
-
-async def _handle_method(method, params, request_id):
-    if method == 'initialize':
-        return {
-            'jsonrpc': '2.0',
-            'id': request_id,
-            'result': {
-                'protocolVersion': '2025-03-26',
-                'capabilities': {'tools': {}},
-                'serverInfo': {
-                    'name': 'security-controls-mcp',
-                    'version': SERVER_VERSION,
-                },
-            },
-        }
-
-    if method == 'notifications/initialized':
-        return {'jsonrpc': '2.0', 'id': request_id, 'result': {}}
-
-    if method == 'ping':
-        return {'jsonrpc': '2.0', 'id': request_id, 'result': {}}
-
-    if method == 'tools/list':
-        tools = await list_tools()
-        return {
-            'jsonrpc': '2.0',
-            'id': request_id,
-            'result': {
-                'tools': [
-                    {
-                        'name': t.name,
-                        'description': t.description,
-                        'inputSchema': t.inputSchema,
-                    }
-                    for t in tools
-                ]
-            },
-        }
-
-    if method == 'tools/call':
-        result = await call_tool(params.get('name'), params.get('arguments', {}))
-        return {
-            'jsonrpc': '2.0',
-            'id': request_id,
-            'result': {
-                'content': [{'type': 'text', 'text': item.text} for item in result]
-            },
-        }
-
-    return {
-        'jsonrpc': '2.0',
-        'id': request_id,
-        'error': {'code': -32601, 'message': f'Method not found: {method}'},
-    }
+        self.wfile.write(body)
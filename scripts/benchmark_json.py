@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Compare JSON encoders on the largest real HTTP/MCP responses.
+
+Builds the response bodies from the bundled SCF data and times every
+installed backend of security_controls_mcp.json_codec on each of them.
+
+Usage:
+    poetry run python scripts/benchmark_json.py
+    poetry run python scripts/benchmark_json.py --repeat 50
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from security_controls_mcp.http_server import call_tool, list_tools, scf_data  # noqa: E402
+from security_controls_mcp.json_codec import BACKENDS, _load_backend  # noqa: E402
+
+
+def build_payloads() -> dict:
+    """Response bodies as the HTTP server sends them."""
+    largest = sorted(
+        scf_data.frameworks, key=lambda fw: -scf_data.frameworks[fw]["controls_mapped"]
+    )
+    source, targets = largest[0], largest[1:11]
+
+    tools = asyncio.run(list_tools())
+    text = asyncio.run(call_tool("get_framework_controls", {"framework": source}))[0].text
+    catalog = [
+        {key: ctrl[key] for key in ("id", "name", "domain", "description", "framework_mappings")}
+        for ctrl in scf_data.controls
+    ]
+    return {
+        f"POST /api/map ({source} -> 10 targets)": {
+            "source_framework": source,
+            "targets": targets,
+            "mappings": list(scf_data.iter_mappings(source, targets)),
+        },
+        "GET /api/controls/* (every control with mappings)": catalog,
+        "GET /api/frameworks": {"frameworks": list(scf_data.frameworks.values())},
+        "MCP tools/list": {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "result": {
+                "tools": [
+                    {"name": t.name, "description": t.description, "inputSchema": t.inputSchema}
+                    for t in tools
+                ]
+            },
+        },
+        f"MCP tools/call get_framework_controls({source})": {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "result": {"content": [{"type": "text", "text": text}]},
+        },
+    }
+
+
+def time_encode(dumps, payload, repeat: int) -> float:
+    """Best time of `repeat` encodes, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        dumps(payload)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--repeat", type=int, default=20, help="Encodes per backend (default 20)")
+    args = parser.parse_args()
+
+    backends = [backend for backend in map(_load_backend, BACKENDS) if backend is not None]
+    print(f"Backends: {', '.join(name for name, _, _ in backends)}\n")
+
+    for label, payload in build_payloads().items():
+        print(label)
+        baseline = None
+        for name, dumps, _ in reversed(backends):
+            elapsed = time_encode(dumps, payload, args.repeat)
+            size = len(dumps(payload))
+            baseline = baseline or elapsed
+            print(
+                f"  {name:<8} {elapsed:9.2f} ms  {size / 1024:9.1f} KiB  "
+                f"{size / elapsed / 1000:8.1f} MB/s  x{baseline / elapsed:.1f}"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Measure cold and warm invocations of the Vercel handler (api/mcp.py).
+
+Simulates the serverless runtime locally: each cold run is a fresh
+interpreter that imports the handler and serves its first requests; warm
+runs reuse one imported handler. Requests go through the handler class
+itself, with in-memory request and response streams.
+
+Usage:
+    poetry run python scripts/benchmark_serverless.py
+    poetry run python scripts/benchmark_serverless.py --cold 10 --warm 200
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import io
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+HANDLER_FILE = PROJECT_ROOT / "api" / "mcp.py"
+
+REQUESTS = {
+    "initialize": {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}},
+    "tools/list": {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+    "tools/call get_control": {
+        "jsonrpc": "2.0",
+        "id": 3,
+        "method": "tools/call",
+        "params": {"name": "get_control", "arguments": {"control_id": "GOV-01"}},
+    },
+    "tools/call search_controls": {
+        "jsonrpc": "2.0",
+        "id": 4,
+        "method": "tools/call",
+        "params": {"name": "search_controls", "arguments": {"query": "encryption"}},
+    },
+}
+
+
+def load_handler():
+    """Import api/mcp.py as the serverless runtime does."""
+    spec = importlib.util.spec_from_file_location("vercel_mcp", HANDLER_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.handler
+
+
+def invoke(handler_class, body: bytes) -> bytes:
+    """Serve one POST with the handler class, without a socket."""
+    handler = handler_class.__new__(handler_class)
+    handler.rfile = io.BytesIO(body)
+    handler.wfile = io.BytesIO()
+    handler.headers = {"Content-Length": str(len(body))}
+    handler.request_version = "HTTP/1.1"
+    handler.requestline = "POST /api/mcp HTTP/1.1"
+    handler.command = "POST"
+    handler.client_address = ("127.0.0.1", 0)
+    handler.log_message = lambda *args: None
+    handler.do_POST()
+    return handler.wfile.getvalue()
+
+
+def cold_run() -> dict:
+    """Import the handler and serve each request once; timings in ms."""
+    start = time.perf_counter()
+    handler_class = load_handler()
+    timings = {"import": (time.perf_counter() - start) * 1000}
+    for label, request in REQUESTS.items():
+        body = json.dumps(request).encode()
+        start = time.perf_counter()
+        invoke(handler_class, body)
+        timings[label] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+def warm_runs(repeat: int) -> dict:
+    """Per-request latencies of an already imported handler, in ms."""
+    handler_class = load_handler()
+    timings = {}
+    for label, request in REQUESTS.items():
+        body = json.dumps(request).encode()
+        invoke(handler_class, body)
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            invoke(handler_class, body)
+            samples.append((time.perf_counter() - start) * 1000)
+        timings[label] = samples
+    return timings
+
+
+def loop_overhead(repeat: int) -> tuple:
+    """Median ms of a trivial tool call with a new loop per call vs the instance loop."""
+    from security_controls_mcp import serverless
+    from security_controls_mcp.server import call_tool
+
+    def median(run):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run(call_tool("version_info", {}))
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
+
+    return median(asyncio.run), median(serverless.run)
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--cold", type=int, default=5, help="Cold starts (default 5)")
+    parser.add_argument("--warm", type=int, default=100, help="Warm requests each (default 100)")
+    parser.add_argument("--cold-child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cold_child:
+        print(json.dumps(cold_run()))
+        return
+
+    cold = [
+        json.loads(
+            subprocess.run(
+                [sys.executable, __file__, "--cold-child"],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(args.cold)
+    ]
+    print(f"Cold start (median of {args.cold} fresh interpreters)")
+    for label in cold[0]:
+        print(f"  {label:<28} {statistics.median(run[label] for run in cold):9.2f} ms")
+
+    print(f"\nWarm instance ({args.warm} requests each)")
+    for label, samples in warm_runs(args.warm).items():
+        print(
+            f"  {label:<28} p50 {statistics.median(samples):7.3f} ms"
+            f"  p95 {percentile(samples, 0.95):7.3f} ms"
+        )
+
+    per_request, reused = loop_overhead(args.warm)
+    print("\nversion_info via asyncio.run() per request vs the instance loop")
+    print(f"  new loop {per_request:.3f} ms, reused loop {reused:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
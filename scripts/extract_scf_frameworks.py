@@ -5,15 +5,23 @@ Extract all frameworks from SCF 2025.4 spreadsheet.
 This script parses the official SCF Excel file and generates:
 1. scf-controls.json - All controls with complete framework mappings
 2. framework-to-scf.json - Reverse index from framework controls to SCF IDs
+3. control-similarity.json.gz - Top related controls per control
+4. scf-metadata.json - Fingerprint and counts for the readiness probe
+5. crosswalks/*.json.gz - Optional precomputed crosswalks (--crosswalks)
 
 Usage:
     poetry run python scripts/extract_scf_frameworks.py
+    poetry run python scripts/extract_scf_frameworks.py --crosswalks
+    poetry run python scripts/extract_scf_frameworks.py --crosswalks-only \
+        --crosswalk-pairs iso_27001_2022:dora,dora:nis2
+    poetry run python scripts/extract_scf_frameworks.py --similarity-only
 """
 
+import argparse
 import json
 import re
+import sys
 from pathlib import Path
-from openpyxl import load_workbook
 
 # Paths
 SCRIPT_DIR = Path(__file__).parent
@@ -610,7 +618,76 @@ def get_framework_stats(controls: list[dict]) -> dict[str, int]:
     return stats
 
 
+def write_crosswalks(pairs_arg: str | None) -> None:
+    """Precompute crosswalk artifacts from the extracted data in OUTPUT_DIR."""
+    sys.path.insert(0, str(PROJECT_ROOT / "src"))
+    from security_controls_mcp.crosswalks import (
+        DEFAULT_CROSSWALK_PAIRS,
+        parse_pairs,
+        write_crosswalk_artifacts,
+    )
+    from security_controls_mcp.data_loader import SCFData
+
+    pairs = parse_pairs(pairs_arg) if pairs_arg else DEFAULT_CROSSWALK_PAIRS
+    print(f"\nPrecomputing {len(pairs)} crosswalks...")
+    for path in write_crosswalk_artifacts(SCFData(), pairs, OUTPUT_DIR):
+        print(f"  Saved {path} ({path.stat().st_size:,} bytes)")
+
+
+def write_similarity() -> None:
+    """Precompute the control similarity snapshot from the data in OUTPUT_DIR."""
+    sys.path.insert(0, str(PROJECT_ROOT / "src"))
+    from security_controls_mcp.data_loader import SCFData
+    from security_controls_mcp.similarity import write_similarity_snapshot
+
+    scf_data = SCFData()
+    path = write_similarity_snapshot(scf_data.controls, scf_data.fingerprint, OUTPUT_DIR)
+    print(f"  Saved {path} ({path.stat().st_size:,} bytes)")
+
+
+def write_metadata() -> None:
+    """Write the data metadata sidecar read by the readiness probe."""
+    sys.path.insert(0, str(PROJECT_ROOT / "src"))
+    from security_controls_mcp.data_loader import SCFData
+    from security_controls_mcp.health import write_metadata as write_metadata_sidecar
+
+    path = write_metadata_sidecar(SCFData(), OUTPUT_DIR)
+    print(f"  Saved {path}")
+
+
 def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--crosswalks",
+        action="store_true",
+        help="Also precompute compressed crosswalk artifacts for the HTTP server",
+    )
+    parser.add_argument(
+        "--crosswalks-only",
+        action="store_true",
+        help="Only precompute crosswalks from the already extracted data",
+    )
+    parser.add_argument(
+        "--crosswalk-pairs",
+        help="Comma-separated source:target pairs (default: ISO 27001 <-> NIST CSF 2.0, "
+        "DORA, NIS2 and SOC 2)",
+    )
+    parser.add_argument(
+        "--similarity-only",
+        action="store_true",
+        help="Only rebuild the control similarity snapshot from the already extracted data",
+    )
+    args = parser.parse_args()
+
+    if args.crosswalks_only:
+        write_crosswalks(args.crosswalk_pairs)
+        return
+    if args.similarity_only:
+        write_similarity()
+        return
+
+    from openpyxl import load_workbook
+
     print(f"Loading SCF spreadsheet: {SCF_XLSX}")
     wb = load_workbook(SCF_XLSX, data_only=True)
     ws = wb["SCF 2025.4"]
@@ -671,6 +748,13 @@ def main():
         json.dump(metadata, f, indent=2, ensure_ascii=False)
     print(f"  Saved {metadata_file}")
 
+    # Save control similarity snapshot and metadata sidecar (need the controls file above)
+    write_similarity()
+    write_metadata()
+
+    if args.crosswalks:
+        write_crosswalks(args.crosswalk_pairs)
+
     print("\nDone!")
 
 
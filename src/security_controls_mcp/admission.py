@@ -0,0 +1,327 @@
+"""Admission control for the HTTP server.
+
+Two in-memory limits protect the server from a runaway client:
+
+- Per-client token buckets: each client (API key if it sends one, else its
+  IP address) may make SECURITY_CONTROLS_MCP_RATE_LIMIT requests per second
+  on average, with bursts of up to SECURITY_CONTROLS_MCP_RATE_BURST. Off by
+  default, since behind a proxy every client shares the proxy's address
+  unless SECURITY_CONTROLS_MCP_TRUST_FORWARDED_FOR=1.
+- A global concurrency cap: at most SECURITY_CONTROLS_MCP_MAX_CONCURRENCY
+  requests run at once. Up to SECURITY_CONTROLS_MCP_MAX_QUEUE more wait for
+  a slot, each for at most SECURITY_CONTROLS_MCP_QUEUE_TIMEOUT seconds.
+
+Rejections are immediate and cheap: 429 with Retry-After for rate limits,
+503 when the queue is full or the wait times out. MCP requests get the same
+status with a JSON-RPC error event, so MCP clients can surface it. Limits
+apply per process (per worker with --workers N).
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, List, Optional, Sequence, Tuple
+
+from .json_codec import dumps, sse_message
+from .metrics import REGISTRY, Family
+from .tenancy import _api_key_from_headers
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 64
+DEFAULT_QUEUE_TIMEOUT = 1.0
+
+# Clients with a bucket; the least recently seen are dropped beyond this
+MAX_CLIENTS = 10000
+
+# JSON-RPC error codes (implementation-defined server error range)
+RATE_LIMITED_CODE = -32029
+OVERLOADED_CODE = -32030
+
+ADMISSION_QUEUE_TIME = REGISTRY.histogram(
+    "admission_queue_seconds", "Time requests waited for a concurrency slot.", ()
+)
+ADMISSION_REJECTIONS = REGISTRY.counter(
+    "admission_rejections_total", "Requests rejected by admission control.", ("reason",)
+)
+
+
+def _number_from_env(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        logger.warning(f"Invalid {name} '{value}', using default")
+        return default
+
+
+def rate_limit_from_env() -> Tuple[float, float]:
+    """(requests per second, burst) per client; a rate of 0 disables the limit."""
+    rate = _number_from_env("SECURITY_CONTROLS_MCP_RATE_LIMIT", 0.0)
+    burst = _number_from_env("SECURITY_CONTROLS_MCP_RATE_BURST", max(2 * rate, 1.0))
+    return rate, max(burst, 1.0)
+
+
+def concurrency_from_env() -> Tuple[int, int, float]:
+    """(max concurrent requests, max queued requests, queue timeout); 0 = no cap."""
+    limit = int(_number_from_env("SECURITY_CONTROLS_MCP_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
+    queue = int(_number_from_env("SECURITY_CONTROLS_MCP_MAX_QUEUE", limit))
+    timeout = _number_from_env("SECURITY_CONTROLS_MCP_QUEUE_TIMEOUT", DEFAULT_QUEUE_TIMEOUT)
+    return limit, queue, timeout
+
+
+def _flag_from_env(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second up to `burst`."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """Take a token; returns 0 on success, else seconds until one is available."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Token buckets per client, bounded to MAX_CLIENTS (least recently seen dropped)."""
+
+    def __init__(self, rate: float, burst: float, max_clients: int = MAX_CLIENTS):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, client: str, now: Optional[float] = None) -> float:
+        """0 if the client may proceed, else seconds until it may retry."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = TokenBucket(self.rate, self.burst, now)
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+            return bucket.take(now)
+
+    def clients(self) -> int:
+        with self._lock:
+            return len(self._buckets)
+
+
+class ConcurrencyLimiter:
+    """Caps concurrent requests; a bounded queue waits for free slots in FIFO order."""
+
+    def __init__(self, limit: int, max_queue: int, timeout: float):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting in the queue if needed; False if rejected."""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return True
+        if len(self._waiters) >= self.max_queue or self.timeout <= 0:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.timeout)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            # Give back a slot handed over just as the request went away
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            waiter.cancel()
+            raise
+        finally:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+        # Also true if the slot was handed over just as the wait timed out
+        if waiter.done() and not waiter.cancelled():
+            return True
+        waiter.cancel()
+        return False
+
+    def release(self) -> None:
+        # Hand the slot straight to the first waiter still waiting
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+def limiters_from_env() -> Tuple[Optional[RateLimiter], Optional[ConcurrencyLimiter]]:
+    """The configured limiters; None for a limit that is disabled."""
+    rate, burst = rate_limit_from_env()
+    limit, max_queue, timeout = concurrency_from_env()
+    rate_limiter = RateLimiter(rate, burst) if rate > 0 else None
+    concurrency = ConcurrencyLimiter(limit, max_queue, timeout) if limit > 0 else None
+    return rate_limiter, concurrency
+
+
+def admission_families(
+    rate_limiter: Optional[RateLimiter], concurrency: Optional[ConcurrencyLimiter]
+) -> List[Family]:
+    """Metrics collector for the current state of the limiters."""
+    families = []
+    if concurrency is not None:
+        families.append(
+            ("admission_active", "gauge", "Requests holding a slot.", [({}, concurrency.active)])
+        )
+        families.append(
+            (
+                "admission_queued",
+                "gauge",
+                "Requests waiting for a slot.",
+                [({}, concurrency.queued)],
+            )
+        )
+    if rate_limiter is not None:
+        families.append(
+            (
+                "admission_clients",
+                "gauge",
+                "Clients with a rate-limit bucket.",
+                [({}, rate_limiter.clients())],
+            )
+        )
+    return families
+
+
+def client_id(scope, trust_forwarded_for: bool = False) -> str:
+    """Client identity for rate limiting: a hash of its API key, else its address."""
+    headers = {
+        key.decode("latin-1").lower(): value.decode("latin-1") for key, value in scope["headers"]
+    }
+    api_key = _api_key_from_headers(headers)
+    if api_key:
+        return "key:" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+    if trust_forwarded_for and headers.get("x-forwarded-for"):
+        return "ip:" + headers["x-forwarded-for"].split(",")[0].strip()
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying the rate and concurrency limits (see module docstring)."""
+
+    def __init__(
+        self,
+        app,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency: Optional[ConcurrencyLimiter] = None,
+        exempt_paths: Sequence[str] = (),
+        jsonrpc_paths: Sequence[str] = ("/mcp",),
+        trust_forwarded_for: Optional[bool] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI app
+            rate_limiter: Per-client limits, or None for no rate limit
+            concurrency: Global concurrency cap, or None for no cap
+            exempt_paths: Paths never limited (health checks, metrics)
+            jsonrpc_paths: Paths answered with JSON-RPC error events
+            trust_forwarded_for: Identify clients by X-Forwarded-For. If
+                None, read from environment.
+            clock: Monotonic clock, for tests
+        """
+        self.app = app
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.exempt_paths = frozenset(exempt_paths)
+        self.jsonrpc_paths = frozenset(jsonrpc_paths)
+        if trust_forwarded_for is None:
+            trust_forwarded_for = _flag_from_env("SECURITY_CONTROLS_MCP_TRUST_FORWARDED_FOR")
+        self.trust_forwarded_for = trust_forwarded_for
+        self.clock = clock
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        if self.rate_limiter is not None:
+            retry_after = self.rate_limiter.check(
+                client_id(scope, self.trust_forwarded_for), self.clock()
+            )
+            if retry_after:
+                await self._reject(scope, send, "rate_limited", retry_after)
+                return
+
+        if self.concurrency is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = self.clock()
+        admitted = await self.concurrency.acquire()
+        ADMISSION_QUEUE_TIME.observe(self.clock() - start)
+        if not admitted:
+            await self._reject(scope, send, "overloaded", self.concurrency.timeout or 1.0)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.concurrency.release()
+
+    async def _reject(self, scope, send, reason: str, retry_after: float) -> None:
+        ADMISSION_REJECTIONS.inc(reason=reason)
+        status = 429 if reason == "rate_limited" else 503
+        message = "Rate limit exceeded" if reason == "rate_limited" else "Server overloaded"
+        if scope["path"] in self.jsonrpc_paths:
+            code = RATE_LIMITED_CODE if reason == "rate_limited" else OVERLOADED_CODE
+            body = sse_message(
+                {"jsonrpc": "2.0", "id": None, "error": {"code": code, "message": message}}
+            )
+            content_type = b"text/event-stream"
+        else:
+            body = dumps(
+                {
+                    "error": "Too Many Requests" if status == 429 else "Service Unavailable",
+                    "message": message,
+                }
+            )
+            content_type = b"application/json"
+        headers = [
+            (b"content-type", content_type),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(math.ceil(retry_after), 1)).encode()),
+        ]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -15,6 +15,7 @@ except ImportError:
 
 from .config import Config
 from .extractors import extract_standard
+from .storage import COMPACT_INDEX_FILE, FULL_TEXT_FILE, write_compact_standard
 
 
 @click.group()
@@ -61,6 +62,14 @@ def main():
     is_flag=True,
     help="Overwrite existing standard if it exists",
 )
+@click.option(
+    "--format",
+    "storage_format",
+    type=click.Choice(["compact", "json"]),
+    default="compact",
+    show_default=True,
+    help="On-disk format: compressed clause store or plain full_text.json",
+)
 def import_standard(
     pdf_file: Path,
     standard_type: str,
@@ -69,6 +78,7 @@ def import_standard(
     purchase_date: str,
     version: str,
     force: bool,
+    storage_format: str,
 ):
     """Import a purchased standard from PDF file.
 
@@ -128,16 +138,12 @@ def import_standard(
         output_dir.mkdir(parents=True, exist_ok=True)
 
         # Save files
-        import json
-
         metadata_file = output_dir / "metadata.json"
-        full_text_file = output_dir / "full_text.json"
 
-        with open(metadata_file, "w") as f:
-            json.dump(result["metadata"], f, indent=2)
-
-        with open(full_text_file, "w") as f:
-            json.dump(result["structure"], f, indent=2)
+        # Write clause data before metadata and replace atomically so a running
+        # server that hot-reloads never reads a half-written file
+        _write_clause_data(output_dir, result["structure"], storage_format)
+        _write_json_atomic(metadata_file, result["metadata"])
 
         click.echo("✅ Extraction complete!")
         click.echo()
@@ -160,7 +166,7 @@ def import_standard(
         click.echo("✓ Standard successfully imported!")
         click.echo()
         click.echo("Next steps:")
-        click.echo("  1. Restart your MCP server")
+        click.echo("  1. Running MCP servers load the standard automatically within a few seconds")
         click.echo(f"  2. Use list_available_standards to verify '{standard_type}' is loaded")
         click.echo("  3. Query the standard with query_standard or get_clause")
         click.echo()
@@ -173,6 +179,28 @@ def import_standard(
         sys.exit(1)
 
 
+def _write_clause_data(output_dir: Path, structure, storage_format: str) -> None:
+    """Write a standard's clauses in the requested format and drop the other one."""
+    if storage_format == "compact":
+        write_compact_standard(structure, output_dir)
+        (output_dir / FULL_TEXT_FILE).unlink(missing_ok=True)
+    else:
+        _write_json_atomic(output_dir / FULL_TEXT_FILE, structure)
+        # The provider prefers the compact index, so remove a stale one
+        (output_dir / COMPACT_INDEX_FILE).unlink(missing_ok=True)
+
+
+def _write_json_atomic(path: Path, data) -> None:
+    """Write JSON to a temp file next to path, then rename it into place."""
+    import json
+    import os
+
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
 def _check_git_safety():
     """Check that we're not accidentally going to commit paid content."""
     import subprocess
@@ -251,5 +279,41 @@ def list_standards():
         click.echo()
 
 
+@main.command("compact-standards")
+def compact_standards():
+    """Convert imported standards from full_text.json to the compact format."""
+    import json
+
+    config = Config()
+    converted = 0
+
+    for standard_id in config.get_enabled_standards():
+        standard_dir = config.get_standard_path(standard_id)
+        if standard_dir is None:
+            click.echo(
+                f"⚠️  Skipping {standard_id}: its path is outside the standards directory",
+                err=True,
+            )
+            continue
+        full_text_file = standard_dir / FULL_TEXT_FILE
+        if not full_text_file.exists():
+            continue
+
+        with open(full_text_file, "r") as f:
+            full_text = json.load(f)
+
+        stats = write_compact_standard(full_text, standard_dir)
+        size_before = full_text_file.stat().st_size
+        full_text_file.unlink()
+        converted += 1
+
+        click.echo(
+            f"✓ {standard_id}: {stats['clauses']} clauses, "
+            f"{size_before:,} → {stats['blob_bytes']:,} bytes of content"
+        )
+
+    click.echo(f"Converted {converted} standard(s).")
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,324 @@
+"""Response compression for the HTTP server.
+
+CompressionMiddleware negotiates brotli (when the brotli package is
+installed) or gzip from Accept-Encoding and compresses text responses of at
+least DEFAULT_MINIMUM_SIZE bytes:
+
+- Complete bodies are compressed in one go. Bodies of cacheable requests
+  (see cache_key) are kept compressed, keyed by the data fingerprint and
+  URL, and served from memory on the next request without calling the app.
+- Streamed bodies (NDJSON/CSV exports, MCP SSE events) are compressed chunk
+  by chunk with a sync flush after each, so rows and events still reach the
+  client as soon as they are produced. An SSE stream is compressed only if
+  its first event reaches the minimum size; it is never held back waiting
+  for more events.
+- Responses that already have a Content-Encoding (e.g. precomputed gzip
+  crosswalks) are passed through untouched.
+"""
+
+import gzip
+import logging
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MINIMUM_SIZE = 1024
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+# Bodies larger than this are compressed in a worker thread
+THREAD_THRESHOLD = 256 * 1024
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+)
+
+# (quality for one-off responses, quality for cached responses)
+GZIP_LEVELS = (6, 9)
+BROTLI_QUALITIES = (4, 9)
+
+CacheKeyFunc = Callable[[Scope], Optional[str]]
+
+
+def cache_bytes_from_env() -> int:
+    """Get the compressed response cache budget in bytes from the environment."""
+    value = os.getenv("SECURITY_CONTROLS_MCP_COMPRESSION_CACHE_BYTES")
+    if value is None:
+        return DEFAULT_CACHE_BYTES
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        logger.warning(
+            f"Invalid SECURITY_CONTROLS_MCP_COMPRESSION_CACHE_BYTES '{value}', using default"
+        )
+        return DEFAULT_CACHE_BYTES
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Supported content codings, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the preferred supported coding the client accepts, or None."""
+    accepted = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip()] = quality
+
+    for coding in available_encodings():
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def compress(data: bytes, encoding: str, cached: bool = False) -> bytes:
+    """Compress a complete body; cached bodies get a higher level."""
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITIES[cached])
+    return gzip.compress(data, compresslevel=GZIP_LEVELS[cached], mtime=0)
+
+
+class StreamCompressor:
+    """Incremental compressor whose output is decodable after every chunk."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITIES[0])
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVELS[0], zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it."""
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        """End the compressed stream."""
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class CompressedResponseCache:
+    """LRU cache of compressed responses bounded by body bytes."""
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget in bytes. If None, read from environment.
+        """
+        self.max_bytes = cache_bytes_from_env() if max_bytes is None else max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Message, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Optional[Tuple[Message, bytes]]:
+        """(response start message, compressed body) for (request key, coding)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Tuple[str, str], start: Message, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size_bytes -= len(previous[1])
+            self._entries[key] = (start, body)
+            self.size_bytes += len(body)
+            while self.size_bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size_bytes -= len(evicted)
+
+    def stats(self) -> Dict[str, int]:
+        """Cache statistics."""
+        with self._lock:
+            return {
+                "responses": len(self._entries),
+                "size_bytes": self.size_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses (see module docstring)."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = DEFAULT_MINIMUM_SIZE,
+        cache_key: Optional[CacheKeyFunc] = None,
+        cache: Optional[CompressedResponseCache] = None,
+    ):
+        """Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI app
+            minimum_size: Smallest body worth compressing, in bytes
+            cache_key: Returns a key for requests whose successful response
+                depends only on that key (e.g. data fingerprint + URL), or
+                None for requests that must not be cached
+            cache: Cache for those responses. Created if cache_key is given.
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache_key = cache_key
+        self.cache = cache if cache is not None or cache_key is None else CompressedResponseCache()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = self.cache_key(scope) if self.cache_key else None
+        if key is not None:
+            cached = self.cache.get((key, encoding))
+            if cached is not None:
+                start, body = cached
+                await send(start)
+                await send({"type": "http.response.body", "body": body})
+                return
+
+        responder = _CompressingResponder(self, encoding, key, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    """Rewrites one response's messages; see CompressionMiddleware."""
+
+    def __init__(
+        self, middleware: CompressionMiddleware, encoding: str, key: Optional[str], send: Send
+    ):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.key = key
+        self._send = send
+        self.start: Optional[Message] = None
+        # "pending" (buffering), "passthrough" or "streaming"
+        self.mode = "pending"
+        self.buffer: List[bytes] = []
+        self.buffered = 0
+        self.is_sse = False
+        self.compressor: Optional[StreamCompressor] = None
+
+    def _compressed_start(self, content_length: Optional[int]) -> Message:
+        headers = MutableHeaders(raw=list(self.start["headers"]))
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("accept-encoding")
+        if content_length is None:
+            del headers["content-length"]
+        else:
+            headers["content-length"] = str(content_length)
+        return {**self.start, "headers": headers.raw}
+
+    async def _pass_through(self, more_body: bool) -> None:
+        self.mode = "passthrough"
+        await self._send(self.start)
+        await self._send(
+            {"type": "http.response.body", "body": b"".join(self.buffer), "more_body": more_body}
+        )
+        self.buffer = []
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.is_sse = content_type.startswith("text/event-stream")
+            if (
+                "content-encoding" in headers
+                or message["status"] in (204, 304)
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            ):
+                self.mode = "passthrough"
+                await self._send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.mode == "passthrough":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.mode == "streaming":
+            chunk = self.compressor.compress(body) if body else b""
+            if not more_body:
+                chunk += self.compressor.finish()
+            await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+            return
+
+        self.buffer.append(body)
+        self.buffered += len(body)
+        if not more_body:
+            await self._complete()
+        elif self.buffered >= self.middleware.minimum_size:
+            self.mode = "streaming"
+            self.compressor = StreamCompressor(self.encoding)
+            chunk = self.compressor.compress(b"".join(self.buffer))
+            self.buffer = []
+            await self._send(self._compressed_start(None))
+            await self._send({"type": "http.response.body", "body": chunk, "more_body": True})
+        elif self.is_sse:
+            # Never hold back an event stream
+            await self._pass_through(more_body=True)
+
+    async def _complete(self) -> None:
+        """Send a complete buffered body, compressed if large enough."""
+        data = b"".join(self.buffer)
+        if len(data) < self.middleware.minimum_size:
+            await self._pass_through(more_body=False)
+            return
+
+        cacheable = self.key is not None and self.start["status"] == 200
+        if len(data) > THREAD_THRESHOLD:
+            body = await anyio.to_thread.run_sync(compress, data, self.encoding, cacheable)
+        else:
+            body = compress(data, self.encoding, cacheable)
+        start = self._compressed_start(len(body))
+        if cacheable:
+            self.middleware.cache.put((self.key, self.encoding), start, body)
+        await self._send(start)
+        await self._send({"type": "http.response.body", "body": body})
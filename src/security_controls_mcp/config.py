@@ -42,6 +42,10 @@ class Config:
         # Load or create config
         self.data = self._load_config()
 
+    def reload(self) -> None:
+        """Re-read configuration from disk (e.g., after an import by the CLI)."""
+        self.data = self._load_config()
+
     def _ensure_directories(self) -> None:
         """Ensure config and standards directories exist."""
         self.config_dir.mkdir(parents=True, exist_ok=True)
@@ -71,9 +75,15 @@ class Config:
             return default_config
 
     def _save_config(self, data: Dict[str, Any]) -> None:
-        """Save configuration to file."""
-        with open(self.config_file, "w") as f:
+        """Save configuration to file.
+
+        Written to a temp file and renamed into place, so a concurrent reader
+        (e.g. the server's hot reload) never sees a partially written file.
+        """
+        tmp_file = self.config_file.with_name(f".{self.config_file.name}.tmp")
+        with open(tmp_file, "w") as f:
             json.dump(data, f, indent=2)
+        os.replace(tmp_file, self.config_file)
 
     def get_enabled_standards(self) -> Dict[str, Dict[str, Any]]:
         """Get all enabled paid standards.
@@ -0,0 +1,192 @@
+"""Precomputed crosswalk artifacts for frequently requested framework pairs.
+
+scripts/extract_scf_frameworks.py can write one gzip-compressed JSON file
+per configured (source, target) pair next to framework-to-scf.json. Each
+artifact holds the finished /api/crosswalks response body plus the data
+fingerprint it was built from, so the HTTP server can serve it as a static
+response and answer repeat requests with 304 Not Modified.
+"""
+
+import gzip
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .data_loader import SCFData
+from .json_codec import dumps
+
+logger = logging.getLogger(__name__)
+
+CROSSWALK_DIR = "crosswalks"
+
+# Pairs precomputed by default; override with --crosswalk-pairs
+DEFAULT_CROSSWALK_PAIRS: List[Tuple[str, str]] = [
+    ("iso_27001_2022", "nist_csf_2.0"),
+    ("iso_27001_2022", "dora"),
+    ("iso_27001_2022", "nis2"),
+    ("iso_27001_2022", "soc_2_tsc"),
+    ("nist_csf_2.0", "iso_27001_2022"),
+    ("dora", "iso_27001_2022"),
+    ("nis2", "iso_27001_2022"),
+    ("soc_2_tsc", "iso_27001_2022"),
+]
+
+
+def parse_pairs(value: str) -> List[Tuple[str, str]]:
+    """Parse "src:tgt,src:tgt" into pairs.
+
+    Raises:
+        ValueError: If an entry is not of the form source:target
+    """
+    pairs = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        source, sep, target = entry.partition(":")
+        if not sep or not source.strip() or not target.strip():
+            raise ValueError(f"Invalid crosswalk pair '{entry}', expected source:target")
+        pairs.append((source.strip(), target.strip()))
+    return pairs
+
+
+def artifact_name(source_framework: str, target_framework: str) -> str:
+    """File name of the artifact for a pair."""
+    return f"{source_framework}__{target_framework}.json.gz"
+
+
+def crosswalk_etag(fingerprint: str, source_framework: str, target_framework: str) -> str:
+    """Strong ETag of a crosswalk; depends only on the data and the pair."""
+    return f'"{fingerprint}-{source_framework}-{target_framework}"'
+
+
+def crosswalk_body(
+    scf_data: SCFData, source_framework: str, target_framework: str
+) -> Dict[str, Any]:
+    """The /api/crosswalks response body for a pair."""
+    mappings = scf_data.map_frameworks(source_framework, target_framework)
+    return {
+        "source_framework": source_framework,
+        "target_framework": target_framework,
+        "fingerprint": scf_data.fingerprint,
+        "count": len(mappings),
+        "mappings": mappings,
+    }
+
+
+def encode_body(body: Dict[str, Any]) -> bytes:
+    """Gzip-compressed compact JSON; mtime is fixed so builds are reproducible."""
+    return gzip.compress(dumps(body), compresslevel=9, mtime=0)
+
+
+def write_crosswalk_artifacts(
+    scf_data: SCFData, pairs: Iterable[Tuple[str, str]], output_dir: Path
+) -> List[Path]:
+    """Write one artifact per pair to output_dir/crosswalks.
+
+    Stale artifacts from earlier builds are removed.
+
+    Raises:
+        ValueError: If a framework of a pair does not exist
+    """
+    pairs = list(pairs)
+    for pair in pairs:
+        for fw_key in pair:
+            if fw_key not in scf_data.frameworks:
+                raise ValueError(f"Unknown framework in crosswalk pair: {fw_key}")
+
+    crosswalk_dir = Path(output_dir) / CROSSWALK_DIR
+    crosswalk_dir.mkdir(parents=True, exist_ok=True)
+    wanted = {artifact_name(source, target) for source, target in pairs}
+    for stale in crosswalk_dir.glob("*.json.gz"):
+        if stale.name not in wanted:
+            stale.unlink()
+
+    written = []
+    for source, target in pairs:
+        path = crosswalk_dir / artifact_name(source, target)
+        path.write_bytes(encode_body(crosswalk_body(scf_data, source, target)))
+        written.append(path)
+    return written
+
+
+class CrosswalkStore:
+    """Compressed crosswalk bodies, from build-time artifacts or built on demand.
+
+    Artifacts whose fingerprint does not match the loaded data are ignored.
+    Valid artifacts are kept once read; pairs without one are computed on
+    demand and kept in a small LRU.
+    """
+
+    def __init__(self, scf_data: SCFData, data_dir: Optional[Path] = None, max_computed: int = 64):
+        """Initialize the store.
+
+        Args:
+            scf_data: Loaded SCF data
+            data_dir: Directory containing the crosswalks directory.
+                Defaults to the package data directory.
+            max_computed: Number of on-demand bodies to keep
+        """
+        self.scf_data = scf_data
+        self.directory = (data_dir or Path(__file__).parent / "data") / CROSSWALK_DIR
+        self.max_computed = max_computed
+        self._artifacts: Dict[Tuple[str, str], Optional[bytes]] = {}
+        self._computed: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _load_artifact(self, source_framework: str, target_framework: str) -> Optional[bytes]:
+        path = self.directory / artifact_name(source_framework, target_framework)
+        if not path.is_file():
+            return None
+        compressed = path.read_bytes()
+        try:
+            fingerprint = json.loads(gzip.decompress(compressed)).get("fingerprint")
+        except (OSError, ValueError):
+            logger.warning(f"Ignoring unreadable crosswalk artifact: {path}")
+            return None
+        if fingerprint != self.scf_data.fingerprint:
+            logger.warning(f"Ignoring crosswalk artifact built from other data: {path}")
+            return None
+        return compressed
+
+    def get(self, source_framework: str, target_framework: str) -> bytes:
+        """Gzip-compressed JSON body for a pair (frameworks must exist)."""
+        key = (source_framework, target_framework)
+        if key not in self._artifacts:
+            artifact = self._load_artifact(source_framework, target_framework)
+            with self._lock:
+                self._artifacts[key] = artifact
+        artifact = self._artifacts[key]
+        if artifact is not None:
+            self.hits += 1
+            return artifact
+
+        with self._lock:
+            body = self._computed.get(key)
+            if body is not None:
+                self._computed.move_to_end(key)
+                self.hits += 1
+                return body
+            self.misses += 1
+
+        body = encode_body(crosswalk_body(self.scf_data, source_framework, target_framework))
+        with self._lock:
+            self._computed[key] = body
+            while len(self._computed) > self.max_computed:
+                self._computed.popitem(last=False)
+        return body
+
+    def stats(self) -> Dict[str, int]:
+        """Store statistics (hits are artifact or computed-LRU reads)."""
+        with self._lock:
+            return {
+                "artifacts": sum(1 for body in self._artifacts.values() if body is not None),
+                "computed": len(self._computed),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -1,8 +1,110 @@
 """Data loader for SCF controls and framework mappings."""
 
+import hashlib
 import json
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
+
+from .similarity import (
+    SIMILARITY_FILE,
+    SIMILARITY_METRICS,
+    SimilarityTable,
+    build_similarity,
+    load_similarity_snapshot,
+)
+from .timing import timed_phase
+
+# Ranking metrics accepted by SCFData.closest_frameworks
+CLOSEST_METRICS = ("jaccard", "coverage")
+
+# ISO 27001 Annex A controls are the ISO 27002 controls. SCF maps them under
+# the 27002 key (5.15) while 27001 holds the management clauses (5.1, 6.1.1(a)),
+# so "A.5.15" for 27001 is looked up in 27002.
+ANNEX_A_FRAMEWORKS = {"iso_27001_2022": "iso_27002_2022"}
+
+# Families of nested baselines/profiles, roughly from smallest to largest.
+# Which member actually contains which is computed from the mappings.
+BASELINE_FAMILIES = {
+    "nist_800_53b_r5": [
+        "nist_800_53b_r5_low",
+        "nist_800_53b_r5_moderate",
+        "nist_800_53b_r5_high",
+        "nist_800_53_r5",
+    ],
+    "nist_800_53_r4": [
+        "nist_800_53_r4_low",
+        "nist_800_53_r4_moderate",
+        "nist_800_53_r4_high",
+        "nist_800_53_r4",
+    ],
+    "fedramp_r5": [
+        "fedramp_r5_lisaas",
+        "fedramp_r5_low",
+        "fedramp_r5_moderate",
+        "fedramp_r5_high",
+        "fedramp_r5",
+    ],
+    "fedramp_r4": [
+        "fedramp_r4_lisaas",
+        "fedramp_r4_low",
+        "fedramp_r4_moderate",
+        "fedramp_r4_high",
+        "fedramp_r4",
+    ],
+    "cis_csc_8.1": ["cis_csc_8.1_ig1", "cis_csc_8.1_ig2", "cis_csc_8.1_ig3", "cis_csc_8.1"],
+    "cmmc_2.0": [
+        "cmmc_2.0_level_1",
+        "cmmc_2.0_level_1_aos",
+        "cmmc_2.0_level_2",
+        "cmmc_2.0_level_3",
+    ],
+    "pci_dss_4.0.1": [
+        "pci_dss_4.0.1_saq_a",
+        "pci_dss_4.0.1_saq_a_ep",
+        "pci_dss_4.0.1_saq_b",
+        "pci_dss_4.0.1_saq_b_ip",
+        "pci_dss_4.0.1_saq_c",
+        "pci_dss_4.0.1_saq_c_vt",
+        "pci_dss_4.0.1_saq_p2pe",
+        "pci_dss_4.0.1_saq_d_merchant",
+        "pci_dss_4.0.1_saq_d_sp",
+        "pci_dss_4.0.1",
+    ],
+    "govramp": [
+        "govramp_core",
+        "govramp_low",
+        "govramp_low_plus",
+        "govramp_moderate",
+        "govramp_high",
+    ],
+    "nist_800_82_r3": ["nist_800_82_r3_low", "nist_800_82_r3_moderate", "nist_800_82_r3_high"],
+    "nist_800_161_r1": [
+        "nist_800_161_r1_level1",
+        "nist_800_161_r1_level2",
+        "nist_800_161_r1_level3",
+        "nist_800_161_r1",
+    ],
+    "hipaa_hicp": ["hipaa_hicp_small", "hipaa_hicp_medium", "hipaa_hicp_large"],
+    "tx_ramp": ["tx_ramp_level_1", "tx_ramp_level_2"],
+}
+
+
+def normalize_requirement_id(requirement_id: str) -> str:
+    """Normalize a framework requirement ID for lookups.
+
+    Drops all whitespace, upper-cases and strips an Annex-style "A." prefix,
+    so " a.5.15", "A.5.15" and "5.15" are the same key.
+    """
+    key = "".join(str(requirement_id or "").split()).upper()
+    return key[2:] if key.startswith("A.") else key
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """Yield the positions of set bits in ascending order."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
 
 
 class SCFData:
@@ -14,6 +116,30 @@ class SCFData:
         self.framework_to_scf: dict[str, dict[str, list[str]]] = {}
         self.frameworks: dict[str, dict[str, Any]] = {}
         self.framework_categories: dict[str, list[str]] = {}
+        # Short SHA-256 of the controls file, identifies the dataset version
+        self.fingerprint = ""
+        # Framework key -> bitset over control positions (bit i = self.controls[i])
+        self.framework_bits: dict[str, int] = {}
+        # Shared-control counts for every framework pair (diagonal = framework size)
+        self.overlap_matrix: list[list[int]] = []
+        self._overlap_index: dict[str, int] = {}
+        # Baseline family -> containment lattice of its members (see _build_baseline_lattice)
+        self.baseline_lattice: dict[str, dict[str, Any]] = {}
+        self._baseline_family: dict[str, str] = {}
+        # Framework key -> {requirement ID: bitset of its SCF controls}, built on first use
+        self._requirement_bits: dict[str, dict[str, int]] = {}
+        # Framework key -> {normalized requirement ID: control positions}, built on first use
+        self._requirement_index: dict[str, dict[str, list[int]]] = {}
+        self._control_positions: dict[str, int] = {}
+        # Framework key -> mapped control positions in catalog order
+        self._catalog_order: dict[str, list[int]] = {}
+        # Framework key -> [(domain, [(control position, framework control IDs)])]
+        self._framework_domains: dict[str, list[tuple[str, list[tuple[int, list[str]]]]]] = {}
+        # Framework key -> the rows of _framework_domains, flattened
+        self._framework_index: dict[str, list[tuple[int, list[str]]]] = {}
+        # SCF ID -> top related controls (see similarity.py), from the snapshot
+        # or built on first use
+        self._similarity: SimilarityTable | None = None
         self._load_data()
 
     def _load_data(self):
@@ -21,19 +147,130 @@ class SCFData:
         data_dir = Path(__file__).parent / "data"
 
         # Load controls
-        with open(data_dir / "scf-controls.json", "r", encoding="utf-8") as f:
-            data = json.load(f)
-            self.controls = data["controls"]
+        controls_bytes = (data_dir / "scf-controls.json").read_bytes()
+        self.fingerprint = hashlib.sha256(controls_bytes).hexdigest()[:12]
+        data = json.loads(controls_bytes)
+        self.controls = data["controls"]
 
         # Build ID index
         self.controls_by_id = {ctrl["id"]: ctrl for ctrl in self.controls}
+        self._control_positions = {ctrl["id"]: i for i, ctrl in enumerate(self.controls)}
 
         # Load reverse index
         with open(data_dir / "framework-to-scf.json", "r", encoding="utf-8") as f:
             self.framework_to_scf = json.load(f)
 
         # Build framework metadata
+        self._build_framework_bits()
+        self._build_framework_views()
         self._build_framework_metadata()
+        self._build_overlap_matrix()
+        self._build_baseline_lattice()
+
+        # Precomputed similarity table, ignored if built from other data
+        self._similarity = load_similarity_snapshot(data_dir / SIMILARITY_FILE, self.fingerprint)
+
+    def _build_framework_bits(self):
+        """Build one bitset per framework over control positions."""
+        positions: dict[str, list[int]] = {}
+        for position, ctrl in enumerate(self.controls):
+            for fw_key, mapped_ids in ctrl["framework_mappings"].items():
+                if mapped_ids:
+                    positions.setdefault(fw_key, []).append(position)
+
+        self._catalog_order = positions
+        self.framework_bits = {
+            fw_key: sum(1 << position for position in fw_positions)
+            for fw_key, fw_positions in positions.items()
+        }
+
+    def _build_framework_views(self):
+        """Group every framework's controls by domain.
+
+        Domains are sorted by name and controls keep catalog order within a
+        domain. Frameworks only present in the reverse index get one row per
+        (section, control) pair.
+        """
+        for fw_key in {**self._catalog_order, **self.framework_to_scf}:
+            rows = [
+                (position, self.controls[position]["framework_mappings"][fw_key])
+                for position in self._catalog_order.get(fw_key, [])
+            ]
+            if not rows:
+                for section_id, scf_ids in (self.framework_to_scf.get(fw_key) or {}).items():
+                    for scf_id in scf_ids:
+                        position = self._control_positions.get(scf_id)
+                        if position is not None:
+                            rows.append((position, [section_id]))
+            if not rows:
+                continue
+
+            by_domain: dict[str, list[tuple[int, list[str]]]] = {}
+            for row in rows:
+                by_domain.setdefault(self.controls[row[0]]["domain"], []).append(row)
+            domains = sorted(by_domain.items())
+            self._framework_domains[fw_key] = domains
+            self._framework_index[fw_key] = [
+                row for _, domain_rows in domains for row in domain_rows
+            ]
+
+    def _build_overlap_matrix(self):
+        """Count shared SCF controls for every pair of frameworks."""
+        keys = list(self.frameworks)
+        bits = [self.framework_bits[fw_key] for fw_key in keys]
+        size = len(keys)
+        matrix = [[0] * size for _ in range(size)]
+
+        for i in range(size):
+            row = matrix[i]
+            row[i] = bits[i].bit_count()
+            for j in range(i + 1, size):
+                shared = (bits[i] & bits[j]).bit_count()
+                row[j] = shared
+                matrix[j][i] = shared
+
+        self._overlap_index = {fw_key: i for i, fw_key in enumerate(keys)}
+        self.overlap_matrix = matrix
+
+    def _build_baseline_lattice(self):
+        """Record which members of each baseline family contain which.
+
+        For every family: the members present, the members each one is a
+        subset of, members with identical control sets, and the upgrade
+        steps (covering pairs of the subset order, i.e. with no member in
+        between) with the number of SCF controls each step adds.
+        """
+        bits = self.framework_bits
+        for family, members in BASELINE_FAMILIES.items():
+            levels = [fw_key for fw_key in members if fw_key in self.frameworks]
+            if len(levels) < 2:
+                continue
+
+            subset_of = {
+                a: [b for b in levels if b != a and not bits[a] & ~bits[b] and bits[a] != bits[b]]
+                for a in levels
+            }
+            equivalent = [
+                [a, b] for i, a in enumerate(levels) for b in levels[i + 1 :] if bits[a] == bits[b]
+            ]
+            steps = [
+                {"from": a, "to": b, "added": (bits[b] & ~bits[a]).bit_count()}
+                for a in levels
+                for b in subset_of[a]
+                if not any(b in subset_of[c] for c in subset_of[a])
+            ]
+
+            self.baseline_lattice[family] = {
+                "family": family,
+                "levels": [
+                    {"framework": fw_key, "controls": bits[fw_key].bit_count()} for fw_key in levels
+                ],
+                "subset_of": subset_of,
+                "equivalent": equivalent,
+                "steps": steps,
+            }
+            for fw_key in levels:
+                self._baseline_family[fw_key] = family
 
     def _build_framework_metadata(self):
         """Build framework metadata from controls."""
@@ -751,7 +988,7 @@ class SCFData:
 
         # Count controls per framework (only for frameworks that have mappings)
         for fw_key, fw_name in framework_names.items():
-            count = sum(1 for ctrl in self.controls if ctrl["framework_mappings"].get(fw_key))
+            count = self.framework_bits.get(fw_key, 0).bit_count()
             if count > 0:  # Only include frameworks with actual mappings
                 self.frameworks[fw_key] = {
                     "key": fw_key,
@@ -763,6 +1000,7 @@ class SCFData:
         """Get control by SCF ID."""
         return self.controls_by_id.get(control_id)
 
+    @timed_phase("search")
     def search_controls(
         self, query: str, frameworks: list[str] | None = None, limit: int = 10
     ) -> list[dict[str, Any]]:
@@ -834,98 +1072,500 @@ class SCFData:
         selected.sort(key=lambda item: item["relevance"], reverse=True)
         return selected[:limit]
 
+    def _framework_row(
+        self, position: int, framework_control_ids: list[str], include_descriptions: bool
+    ) -> dict[str, Any]:
+        ctrl = self.controls[position]
+        row = {
+            "scf_id": ctrl["id"],
+            "scf_name": ctrl["name"],
+            "domain": ctrl["domain"],
+            "framework_control_ids": framework_control_ids,
+            "weight": ctrl["weight"],
+        }
+        if include_descriptions:
+            row["description"] = ctrl["description"]
+        return row
+
+    @timed_phase("search")
     def get_framework_controls(
         self, framework: str, include_descriptions: bool = False
     ) -> list[dict[str, Any]]:
-        """Get all controls that map to a framework.
+        """Get all controls that map to a framework, grouped by domain.
 
         Uses per-control framework_mappings first; falls back to the
         framework-to-scf reverse index for frameworks that only exist there.
         """
-        results = []
+        return [
+            self._framework_row(position, framework_control_ids, include_descriptions)
+            for position, framework_control_ids in self.framework_index(framework)
+        ]
 
-        for ctrl in self.controls:
-            fw_mappings = ctrl["framework_mappings"].get(framework)
-            if fw_mappings:
-                result = {
-                    "scf_id": ctrl["id"],
-                    "scf_name": ctrl["name"],
-                    "framework_control_ids": fw_mappings,
-                    "weight": ctrl["weight"],
-                }
+    def catalog_order(self, framework: str) -> list[int]:
+        """Positions of the controls mapped to a framework, in catalog order."""
+        return self._catalog_order.get(framework, [])
 
-                if include_descriptions:
-                    result["description"] = ctrl["description"]
+    def framework_index(self, framework: str) -> list[tuple[int, list[str]]]:
+        """Ordered (control position, framework control IDs) rows of a framework.
 
-                results.append(result)
+        The order get_framework_controls output is grouped and paged in.
+        """
+        return self._framework_index.get(framework, [])
 
-        # Fallback: use reverse index if no per-control mappings found
-        if not results and framework in self.framework_to_scf:
-            reverse = self.framework_to_scf[framework]
-            for section_id, scf_ids in reverse.items():
-                for scf_id in scf_ids:
-                    ctrl = self.controls_by_id.get(scf_id)
-                    if ctrl:
-                        result = {
-                            "scf_id": ctrl["id"],
-                            "scf_name": ctrl["name"],
-                            "framework_control_ids": [section_id],
-                            "weight": ctrl["weight"],
-                        }
-                        if include_descriptions:
-                            result["description"] = ctrl["description"]
-                        results.append(result)
+    @timed_phase("search")
+    def framework_domains(
+        self, framework: str, per_domain: int | None = None, include_descriptions: bool = False
+    ) -> list[dict[str, Any]]:
+        """A framework's controls per domain, for grouped summaries.
 
-        return results
+        Args:
+            framework: Framework key
+            per_domain: Maximum controls to return per domain (None for all)
+            include_descriptions: Include control descriptions
+
+        Returns:
+            [{"domain", "total", "controls"}] with domains sorted by name
+        """
+        return [
+            {
+                "domain": domain,
+                "total": len(domain_rows),
+                "controls": [
+                    self._framework_row(position, framework_control_ids, include_descriptions)
+                    for position, framework_control_ids in domain_rows[:per_domain]
+                ],
+            }
+            for domain, domain_rows in self._framework_domains.get(framework, [])
+        ]
+
+    @timed_phase("search")
+    def get_framework_controls_page(
+        self,
+        framework: str,
+        offset: int,
+        limit: int,
+        include_descriptions: bool = False,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """One page of a framework's controls, sliced from framework_index.
+
+        Returns:
+            (rows for [offset, offset + limit), total number of rows)
+        """
+        index = self.framework_index(framework)
+        rows = [
+            self._framework_row(position, framework_control_ids, include_descriptions)
+            for position, framework_control_ids in index[offset : offset + limit]
+        ]
+        return rows, len(index)
+
+    @timed_phase("search")
+    def map_frameworks_page(
+        self,
+        source_framework: str,
+        target_frameworks: list[str],
+        offset: int,
+        limit: int,
+        source_control: str | None = None,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """One page of iter_mappings rows, sliced from the source's ordered index.
+
+        Returns:
+            (rows for [offset, offset + limit), total number of rows)
+        """
+        if source_control:
+            lookup_framework, positions = self.lookup_requirement(source_framework, source_control)
+        else:
+            lookup_framework, positions = source_framework, self.catalog_order(source_framework)
+
+        rows = list(
+            self._mapping_rows(
+                source_framework,
+                lookup_framework,
+                positions[offset : offset + limit],
+                target_frameworks,
+            )
+        )
+        return rows, len(positions)
 
+    @timed_phase("search")
     def map_frameworks(
         self,
         source_framework: str,
         target_framework: str,
         source_control: str | None = None,
     ) -> list[dict[str, Any]]:
-        """Map controls between two frameworks via SCF."""
-        results = []
+        """Map controls between two frameworks via SCF.
 
-        # If source_control specified, filter to only controls with that mapping
-        for ctrl in self.controls:
-            source_mappings = ctrl["framework_mappings"].get(source_framework)
-            target_mappings = ctrl["framework_mappings"].get(target_framework)
+        With source_control, only controls mapped to that requirement are
+        returned (one index lookup, see lookup_requirement). Annex A IDs of
+        ISO 27001 resolve through ISO 27002 and are reported as "A.x".
+        """
+        return [
+            {
+                "scf_id": row["scf_id"],
+                "scf_name": row["scf_name"],
+                "source_controls": row["source_controls"],
+                "target_controls": row["targets"][target_framework],
+                "weight": row["weight"],
+            }
+            for row in self.iter_mappings(source_framework, [target_framework], source_control)
+        ]
+
+    def iter_mappings(
+        self,
+        source_framework: str,
+        target_frameworks: list[str],
+        source_control: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Map one source framework to many targets in a single pass.
+
+        Walks only the SCF controls mapped to the source framework and yields
+        one row per control, with a column per target under "targets"
+        (empty list where the target has no mapping). Rows are produced
+        lazily so large crosswalks can be streamed.
+        """
+        if source_control:
+            lookup_framework, positions = self.lookup_requirement(source_framework, source_control)
+        else:
+            lookup_framework, positions = source_framework, self.catalog_order(source_framework)
+
+        yield from self._mapping_rows(
+            source_framework, lookup_framework, positions, target_frameworks
+        )
 
-            # Skip if no source mapping
+    def _mapping_rows(
+        self,
+        source_framework: str,
+        lookup_framework: str,
+        positions: Iterable[int],
+        target_frameworks: list[str],
+    ) -> Iterator[dict[str, Any]]:
+        """Build iter_mappings rows for the given control positions."""
+        for position in positions:
+            ctrl = self.controls[position]
+            mappings = ctrl["framework_mappings"]
+            source_mappings = mappings.get(lookup_framework)
             if not source_mappings:
                 continue
 
-            # Filter by source_control if specified
-            if source_control and not any(
-                self._source_control_matches(source_control, mapped_id)
-                for mapped_id in source_mappings
-            ):
-                continue
+            if lookup_framework != source_framework:
+                source_mappings = [f"A.{mapped_id}" for mapped_id in source_mappings]
+
+            yield {
+                "scf_id": ctrl["id"],
+                "scf_name": ctrl["name"],
+                "source_controls": source_mappings,
+                "targets": {fw_key: mappings.get(fw_key) or [] for fw_key in target_frameworks},
+                "weight": ctrl["weight"],
+            }
+
+    @timed_phase("search")
+    def compare_frameworks(self, source_framework: str, target_framework: str) -> dict[str, Any]:
+        """Compare two frameworks by the SCF controls they share.
+
+        Coverage is the share of the target's SCF controls that the source
+        also maps to, i.e. how much of the target an implementation of the
+        source addresses. Both frameworks must be in self.frameworks.
+        """
+        i = self._overlap_index[source_framework]
+        j = self._overlap_index[target_framework]
+        shared = self.overlap_matrix[i][j]
+        source_total = self.overlap_matrix[i][i]
+        target_total = self.overlap_matrix[j][j]
+        union = source_total + target_total - shared
+
+        return {
+            "source_framework": source_framework,
+            "target_framework": target_framework,
+            "source_controls": source_total,
+            "target_controls": target_total,
+            "shared_controls": shared,
+            "target_coverage": round(shared / target_total, 4) if target_total else 0.0,
+            "source_coverage": round(shared / source_total, 4) if source_total else 0.0,
+            "jaccard": round(shared / union, 4) if union else 0.0,
+        }
+
+    @timed_phase("search")
+    def closest_frameworks(
+        self, framework: str, limit: int = 10, metric: str = "jaccard"
+    ) -> list[dict[str, Any]]:
+        """Rank other frameworks by overlap with a framework.
+
+        Args:
+            framework: Framework key (must be in self.frameworks)
+            limit: Maximum number of frameworks to return
+            metric: "jaccard" (similarity) or "coverage" (share of the other
+                framework that the given framework covers)
+        """
+        if metric not in CLOSEST_METRICS:
+            raise ValueError(f"Unknown metric '{metric}'. Use one of: {', '.join(CLOSEST_METRICS)}")
+
+        score_key = "jaccard" if metric == "jaccard" else "target_coverage"
+        row = self.overlap_matrix[self._overlap_index[framework]]
+        candidates = [
+            self.compare_frameworks(framework, other)
+            for other, j in self._overlap_index.items()
+            if other != framework and row[j]
+        ]
+        candidates.sort(
+            key=lambda item: (-item[score_key], -item["shared_controls"], item["target_framework"])
+        )
+        return candidates[:limit]
+
+    def baseline_family(self, framework: str) -> dict[str, Any] | None:
+        """The baseline lattice containing a framework, or None."""
+        family = self._baseline_family.get(framework)
+        return self.baseline_lattice[family] if family else None
+
+    @timed_phase("search")
+    def baseline_delta(self, from_framework: str, to_framework: str) -> dict[str, Any]:
+        """SCF controls to add (and those no longer required) going from one framework to another.
 
+        Typically used between levels of a baseline family, e.g. NIST 800-53B
+        Moderate -> High, but works for any two frameworks in self.frameworks.
+        "added" rows carry the target's requirement IDs, "removed" rows the
+        source's.
+        """
+        from_bits = self.framework_bits[from_framework]
+        to_bits = self.framework_bits[to_framework]
+
+        def rows(bits: int, framework: str) -> list[dict[str, Any]]:
+            return [
+                {
+                    "scf_id": self.controls[position]["id"],
+                    "scf_name": self.controls[position]["name"],
+                    "domain": self.controls[position]["domain"],
+                    "weight": self.controls[position]["weight"],
+                    "framework_control_ids": self.controls[position]["framework_mappings"][
+                        framework
+                    ],
+                }
+                for position in iter_bits(bits)
+            ]
+
+        removed = from_bits & ~to_bits
+        return {
+            "from_framework": from_framework,
+            "to_framework": to_framework,
+            "from_controls": from_bits.bit_count(),
+            "to_controls": to_bits.bit_count(),
+            "is_subset": not removed,
+            "added": rows(to_bits & ~from_bits, to_framework),
+            "removed": rows(removed, from_framework),
+        }
+
+    def preload_indexes(self) -> None:
+        """Build every index that is otherwise built on first use.
+
+        Used before forking HTTP workers, so they share one copy instead of
+        each building its own.
+        """
+        for framework in self.frameworks:
+            self.requirement_bits(framework)
+            self.requirement_index(framework)
+        if self._similarity is None:
+            self._similarity = build_similarity(self.controls)
+
+    @timed_phase("search")
+    def related_controls(
+        self, control_id: str, limit: int = 10, metric: str = "jaccard"
+    ) -> list[dict[str, Any]]:
+        """Controls that share the most framework requirements with a control.
+
+        Args:
+            control_id: SCF control ID (must exist)
+            limit: Maximum number of controls to return
+            metric: "jaccard" or "cosine" over the controls' requirement sets
+        """
+        if metric not in SIMILARITY_METRICS:
+            raise ValueError(
+                f"Unknown metric '{metric}'. Use one of: {', '.join(SIMILARITY_METRICS)}"
+            )
+        if self._similarity is None:
+            self._similarity = build_similarity(self.controls)
+
+        score = 2 if metric == "jaccard" else 3
+        entries = sorted(
+            self._similarity.get(control_id, []),
+            key=lambda entry: (-entry[score], -entry[1], self._control_positions[entry[0]]),
+        )
+        results = []
+        for related_id, shared, jaccard, cosine in entries[:limit]:
+            ctrl = self.controls_by_id[related_id]
             results.append(
                 {
-                    "scf_id": ctrl["id"],
+                    "scf_id": related_id,
                     "scf_name": ctrl["name"],
-                    "source_controls": source_mappings,
-                    "target_controls": target_mappings or [],
-                    "weight": ctrl["weight"],
+                    "domain": ctrl["domain"],
+                    "shared_requirements": shared,
+                    "jaccard": jaccard,
+                    "cosine": cosine,
                 }
             )
-
         return results
 
-    @staticmethod
-    def _source_control_matches(source_control: str, mapped_id: str) -> bool:
-        """Compare source control IDs with normalization for Annex-style aliases."""
-        source = str(source_control or "").strip().upper()
-        mapped = str(mapped_id or "").strip().upper()
-        if not source or not mapped:
-            return False
-        if source == mapped:
-            return True
-
-        # Accept "A.5.15" and "5.15" as equivalent to reduce UX friction.
-        source_no_annex = source[2:] if source.startswith("A.") else source
-        mapped_no_annex = mapped[2:] if mapped.startswith("A.") else mapped
-        return source_no_annex == mapped_no_annex
+    def shared_control_ids(self, source_framework: str, target_framework: str) -> list[str]:
+        """SCF control IDs mapped by both frameworks, in catalog order."""
+        bits = self.framework_bits.get(source_framework, 0) & self.framework_bits.get(
+            target_framework, 0
+        )
+        return [self.controls[position]["id"] for position in iter_bits(bits)]
+
+    def requirement_bits(self, framework: str) -> dict[str, int]:
+        """Requirement ID -> bitset of the SCF controls it maps to, in framework order.
+
+        Built from the reverse index on first use and cached.
+        """
+        cached = self._requirement_bits.get(framework)
+        if cached is not None:
+            return cached
+
+        requirements: dict[str, int] = {}
+        reverse = self.framework_to_scf.get(framework)
+        if reverse is not None:
+            for requirement_id, scf_ids in reverse.items():
+                bits = 0
+                for scf_id in scf_ids:
+                    position = self._control_positions.get(scf_id)
+                    if position is not None:
+                        bits |= 1 << position
+                if bits:
+                    requirements[requirement_id] = bits
+        else:
+            for position, ctrl in enumerate(self.controls):
+                for requirement_id in ctrl["framework_mappings"].get(framework) or []:
+                    requirements[requirement_id] = requirements.get(requirement_id, 0) | (
+                        1 << position
+                    )
+
+        self._requirement_bits[framework] = requirements
+        return requirements
+
+    def requirement_index(self, framework: str) -> dict[str, list[int]]:
+        """Normalized requirement ID -> positions of the controls mapping to it.
+
+        Built from per-control mappings on first use and cached.
+        """
+        cached = self._requirement_index.get(framework)
+        if cached is not None:
+            return cached
+
+        index: dict[str, list[int]] = {}
+        for position, ctrl in enumerate(self.controls):
+            for requirement_id in ctrl["framework_mappings"].get(framework) or []:
+                positions = index.setdefault(normalize_requirement_id(requirement_id), [])
+                if not positions or positions[-1] != position:
+                    positions.append(position)
+
+        self._requirement_index[framework] = index
+        return index
+
+    def lookup_requirement(self, framework: str, requirement_id: str) -> tuple[str, list[int]]:
+        """Resolve a requirement ID to the controls mapping to it.
+
+        "A."-prefixed IDs of frameworks in ANNEX_A_FRAMEWORKS are looked up in
+        the framework holding the Annex A controls.
+
+        Returns:
+            (framework the ID was looked up in, control positions in catalog order)
+        """
+        compact = "".join(str(requirement_id or "").split()).upper()
+        annex_framework = ANNEX_A_FRAMEWORKS.get(framework)
+        if annex_framework and compact.startswith("A."):
+            framework = annex_framework
+        return framework, self.requirement_index(framework).get(
+            normalize_requirement_id(compact), []
+        )
+
+    def _weight(self, bits: int) -> int:
+        """Sum of control weights over a bitset."""
+        return sum(self.controls[position]["weight"] or 0 for position in iter_bits(bits))
+
+    @timed_phase("search")
+    def gap_analysis(
+        self,
+        target_frameworks: list[str],
+        implemented_controls: list[str] | None = None,
+        source_framework: str | None = None,
+        implemented_requirements: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Score implemented controls against several target frameworks at once.
+
+        The implementation is given as SCF control IDs, as requirement IDs of
+        source_framework (resolved to their SCF controls), or both. A target
+        requirement is met when all of its SCF controls are implemented and
+        partial when some are.
+
+        Raises:
+            ValueError: If a framework key is unknown or requirement IDs are
+                given without source_framework
+        """
+        for fw_key in [*target_frameworks, *([source_framework] if source_framework else [])]:
+            if fw_key not in self.frameworks:
+                raise ValueError(f"Framework '{fw_key}' not found")
+        if implemented_requirements and not source_framework:
+            raise ValueError("source_framework is required with implemented_requirements")
+
+        implemented = 0
+        unknown: list[str] = []
+        for scf_id in implemented_controls or []:
+            position = self._control_positions.get(str(scf_id).strip().upper())
+            if position is None:
+                unknown.append(scf_id)
+            else:
+                implemented |= 1 << position
+
+        for requirement_id in implemented_requirements or []:
+            _, positions = self.lookup_requirement(source_framework, requirement_id)
+            if not positions:
+                unknown.append(requirement_id)
+            for position in positions:
+                implemented |= 1 << position
+
+        targets = []
+        for fw_key in target_frameworks:
+            met: list[str] = []
+            partial: list[str] = []
+            missing: list[str] = []
+            for requirement_id, bits in self.requirement_bits(fw_key).items():
+                covered = bits & implemented
+                if covered == bits:
+                    met.append(requirement_id)
+                elif covered:
+                    partial.append(requirement_id)
+                else:
+                    missing.append(requirement_id)
+
+            fw_bits = self.framework_bits.get(fw_key, 0)
+            total_weight = self._weight(fw_bits)
+            total = len(met) + len(partial) + len(missing)
+            targets.append(
+                {
+                    "framework": fw_key,
+                    "name": self.frameworks[fw_key]["name"],
+                    "requirements_total": total,
+                    "requirements_met": len(met),
+                    "requirements_partial": len(partial),
+                    "requirements_missing": len(missing),
+                    "coverage": round(len(met) / total, 4) if total else 0.0,
+                    "controls_total": fw_bits.bit_count(),
+                    "controls_implemented": (fw_bits & implemented).bit_count(),
+                    "weighted_score": (
+                        round(self._weight(fw_bits & implemented) / total_weight, 4)
+                        if total_weight
+                        else 0.0
+                    ),
+                    "missing_requirements": missing,
+                    "partial_requirements": partial,
+                    "missing_controls": [
+                        self.controls[position]["id"]
+                        for position in iter_bits(fw_bits & ~implemented)
+                    ],
+                }
+            )
+
+        return {
+            "implemented_controls": implemented.bit_count(),
+            "unknown_ids": unknown,
+            "targets": targets,
+        }
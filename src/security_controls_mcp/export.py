@@ -0,0 +1,170 @@
+"""Row generators and serializers for streaming REST exports.
+
+Exports never build the full result in memory: rows are produced one at a
+time from SCFData and encoded as NDJSON or CSV lines, which are sent in
+small batches as they are ready.
+"""
+
+import csv
+import io
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .data_loader import SCFData
+from .json_codec import dumps_text
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+FRAMEWORK_FIELDS = (
+    "scf_id",
+    "scf_name",
+    "domain",
+    "framework_control_ids",
+    "weight",
+    "description",
+)
+CROSSWALK_FIELDS = ("scf_id", "scf_name", "source_controls", "target_controls", "weight")
+CATALOG_FIELDS = (
+    "scf_id",
+    "scf_name",
+    "domain",
+    "description",
+    "weight",
+    "pptdf",
+    "validation_cadence",
+    "framework_mappings",
+)
+
+# Rows per chunk written to the response
+BATCH_ROWS = 64
+
+
+class ExportError(ValueError):
+    """Raised for an unknown export format or field."""
+
+
+def select_fields(requested: Optional[str], available: Iterable[str]) -> List[str]:
+    """Parse a comma-separated field list, defaulting to all available fields.
+
+    Raises:
+        ExportError: If a requested field is not available
+    """
+    available = list(available)
+    if not requested:
+        return available
+    fields = [field.strip() for field in requested.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in available]
+    if unknown or not fields:
+        raise ExportError(
+            f"Unknown field(s): {', '.join(unknown) or requested}. "
+            f"Available: {', '.join(available)}"
+        )
+    return fields
+
+
+def iter_framework_rows(scf_data: SCFData, framework: str) -> Iterator[Dict[str, Any]]:
+    """Controls mapped to a framework, in domain order."""
+    for position, framework_control_ids in scf_data.framework_index(framework):
+        ctrl = scf_data.controls[position]
+        yield {
+            "scf_id": ctrl["id"],
+            "scf_name": ctrl["name"],
+            "domain": ctrl["domain"],
+            "framework_control_ids": framework_control_ids,
+            "weight": ctrl["weight"],
+            "description": ctrl["description"],
+        }
+
+
+def iter_crosswalk_rows(
+    scf_data: SCFData, source_framework: str, target_framework: str
+) -> Iterator[Dict[str, Any]]:
+    """Source -> target mappings, one row per SCF control mapped to the source."""
+    for row in scf_data.iter_mappings(source_framework, [target_framework]):
+        yield {
+            "scf_id": row["scf_id"],
+            "scf_name": row["scf_name"],
+            "source_controls": row["source_controls"],
+            "target_controls": row["targets"][target_framework],
+            "weight": row["weight"],
+        }
+
+
+def iter_catalog_rows(scf_data: SCFData) -> Iterator[Dict[str, Any]]:
+    """Every SCF control with its non-empty framework mappings."""
+    for ctrl in scf_data.controls:
+        yield {
+            "scf_id": ctrl["id"],
+            "scf_name": ctrl["name"],
+            "domain": ctrl["domain"],
+            "description": ctrl["description"],
+            "weight": ctrl["weight"],
+            "pptdf": ctrl["pptdf"],
+            "validation_cadence": ctrl["validation_cadence"],
+            "framework_mappings": {
+                fw_key: mapped_ids
+                for fw_key, mapped_ids in ctrl["framework_mappings"].items()
+                if mapped_ids
+            },
+        }
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return "; ".join(str(item) for item in value)
+    if isinstance(value, dict):
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+
+def _ndjson_lines(rows: Iterable[Dict[str, Any]], fields: List[str]) -> Iterator[str]:
+    for row in rows:
+        yield dumps_text({field: row[field] for field in fields}) + "\n"
+
+
+def _csv_lines(rows: Iterable[Dict[str, Any]], fields: List[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def line(values: List[Any]) -> str:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(values)
+        return buffer.getvalue()
+
+    yield line(fields)
+    for row in rows:
+        yield line([_csv_value(row[field]) for field in fields])
+
+
+def encode_rows(rows: Iterable[Dict[str, Any]], fields: List[str], fmt: str) -> Iterator[str]:
+    """Encode rows as NDJSON or CSV text chunks of up to BATCH_ROWS lines.
+
+    The first chunk is sent as soon as it is ready (for CSV, that is the
+    header), so clients see the first byte without waiting for the batch.
+
+    Raises:
+        ExportError: If fmt is not an export format
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    lines = _csv_lines(rows, fields) if fmt == "csv" else _ndjson_lines(rows, fields)
+
+    def chunks() -> Iterator[str]:
+        batch: List[str] = []
+        first = True
+        for text in lines:
+            batch.append(text)
+            if first or len(batch) >= BATCH_ROWS:
+                yield "".join(batch)
+                batch = []
+                first = False
+        if batch:
+            yield "".join(batch)
+
+    return chunks()
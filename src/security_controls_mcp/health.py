@@ -0,0 +1,127 @@
+"""Liveness and readiness probes.
+
+- Liveness only says the process is up and answering; its body is a
+  constant.
+- Readiness reports whether the SCF data is loaded and describes it:
+  fingerprint, build time, SCF version, control and framework counts.
+
+The description comes from a small metadata sidecar (scf-metadata.json)
+written next to the data at build time, so a probe does not read or parse
+the full data files. A process that already holds the data (the HTTP
+server) falls back to it if the sidecar is missing or stale; the serverless
+health function then reads the data once per instance. Probe bodies
+are encoded once, and the HTTP server exempts the probes from admission
+control, so health checkers polling a fleet do not compete with an
+instance that is warming up.
+
+`python -m security_controls_mcp.health` writes the sidecar from the data
+in the package (the Docker build, the Vercel build and
+scripts/extract_scf_frameworks.py run it).
+"""
+
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from . import __version__
+from .json_codec import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent / "data"
+METADATA_FILE = "scf-metadata.json"
+CONTROLS_FILE = "scf-controls.json"
+SCF_VERSION = "SCF 2025.4"
+
+LIVENESS_BODY = dumps({"status": "alive"})
+
+
+def data_built(data_dir: Path = DATA_DIR) -> str:
+    """Modification time of the controls file as an ISO timestamp, without reading it."""
+    try:
+        mtime = (Path(data_dir) / CONTROLS_FILE).stat().st_mtime
+        return datetime.fromtimestamp(mtime, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    except OSError:
+        return "unknown"
+
+
+def build_metadata(scf_data, built: str) -> Dict[str, Any]:
+    """Sidecar contents for loaded SCF data."""
+    return {
+        "fingerprint": scf_data.fingerprint,
+        "built": built,
+        "scf_version": SCF_VERSION,
+        "controls_count": len(scf_data.controls),
+        "frameworks_count": len(scf_data.frameworks),
+    }
+
+
+def write_metadata(scf_data, output_dir: Path = DATA_DIR) -> Path:
+    """Write the sidecar for loaded SCF data to output_dir."""
+    path = Path(output_dir) / METADATA_FILE
+    path.write_bytes(dumps(build_metadata(scf_data, data_built(output_dir))) + b"\n")
+    return path
+
+
+def read_metadata(data_dir: Path = DATA_DIR) -> Optional[Dict[str, Any]]:
+    """The sidecar, or None if it is missing or unreadable."""
+    try:
+        metadata = loads((Path(data_dir) / METADATA_FILE).read_bytes())
+    except (OSError, ValueError):
+        return None
+    return metadata if isinstance(metadata, dict) else None
+
+
+def load_metadata() -> Dict[str, Any]:
+    """The sidecar, or the same fields computed from the full data if it is missing."""
+    metadata = read_metadata()
+    if metadata is None:
+        from .data_loader import SCFData
+
+        logger.warning(f"{METADATA_FILE} missing, reading the full data to describe it")
+        metadata = build_metadata(SCFData(), data_built())
+    return metadata
+
+
+def health_body(metadata: Dict[str, Any]) -> bytes:
+    """Encoded /health report of the serverless deployment (its original shape)."""
+    return dumps(
+        {
+            "status": "ok",
+            "server": "security-controls-mcp",
+            "version": __version__,
+            "controls_count": metadata.get("controls_count"),
+            "frameworks_count": metadata.get("frameworks_count"),
+            "data_fingerprint": metadata.get("fingerprint"),
+            "data_built": metadata.get("built"),
+        }
+    )
+
+
+def readiness_body(metadata: Optional[Dict[str, Any]], loaded: bool) -> bytes:
+    """Encoded readiness report.
+
+    Args:
+        metadata: Description of the data (sidecar contents), or None if unknown
+        loaded: Whether this process holds the data in memory
+    """
+    return dumps(
+        {
+            "status": "ready" if metadata is not None else "unavailable",
+            "service": "security-controls-api",
+            "version": __version__,
+            "data": {"loaded": loaded, **(metadata or {})},
+        }
+    )
+
+
+def main():
+    from .data_loader import SCFData
+
+    path = write_metadata(SCFData())
+    print(f"Saved {path}")
+
+
+if __name__ == "__main__":
+    main()
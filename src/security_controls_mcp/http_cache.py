@@ -0,0 +1,142 @@
+"""HTTP conditional caching for read-only endpoints.
+
+Responses of the REST GET endpoints only change with the SCF data, so their
+ETag is derived from the data fingerprint plus the request path and
+canonical query string. ConditionalGetMiddleware answers If-None-Match with
+304 Not Modified without calling the app, and stamps ETag and Cache-Control
+on successful responses so CDNs and clients can absorb repeat reads.
+
+Compressed responses get the content coding appended to their ETag
+("...-gzip"), since a strong ETag identifies exact bytes; any coding's ETag
+revalidates, as all of them encode the same data. Endpoints that also
+negotiate on other request headers (Accept on /api/map) pass the chosen
+variant into the ETag and name those headers in Vary.
+"""
+
+import hashlib
+import logging
+import os
+from typing import Callable, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .compression import available_encodings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_AGE = 300
+
+# Returns (ETag, Cache-Control) for cacheable requests, None otherwise
+CacheRuleFunc = Callable[[Scope], Optional[Tuple[str, str]]]
+
+# Returns the request headers, besides Accept-Encoding, a response varies on
+VaryFunc = Callable[[Scope], Sequence[str]]
+
+
+def max_age_from_env() -> int:
+    """Seconds clients and CDNs may reuse a response without revalidating."""
+    value = os.getenv("SECURITY_CONTROLS_MCP_CACHE_MAX_AGE")
+    if value is None:
+        return DEFAULT_MAX_AGE
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        logger.warning(f"Invalid SECURITY_CONTROLS_MCP_CACHE_MAX_AGE '{value}', using default")
+        return DEFAULT_MAX_AGE
+
+
+def cache_control(max_age: int) -> str:
+    """Cache-Control for shared, data-versioned responses."""
+    return f"public, max-age={max_age}" if max_age else "public, no-cache"
+
+
+def request_etag(fingerprint: str, path: str, query_string: bytes, variant: str = "") -> str:
+    """Strong ETag for a request: data fingerprint + hash of path, sorted query and variant."""
+    query = urlencode(sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)))
+    resource = f"{path}?{query}#{variant}" if variant else f"{path}?{query}"
+    digest = hashlib.sha256(resource.encode("utf-8")).hexdigest()[:16]
+    return f'"{fingerprint}-{digest}"'
+
+
+def representation_etag(etag: str, content_encoding: Optional[str]) -> str:
+    """ETag of one content coding of a response."""
+    if not content_encoding:
+        return etag
+    return f'{etag[:-1]}-{content_encoding}"'
+
+
+def _opaque(etag: str) -> str:
+    return etag.strip().removeprefix("W/")
+
+
+def matching_etag(if_none_match: str, etag: str) -> Optional[str]:
+    """The If-None-Match entry matching etag in any coding (weak comparison), or None."""
+    candidates: List[str] = [item.strip() for item in if_none_match.split(",") if item.strip()]
+    if "*" in candidates:
+        return etag
+    variants = {_opaque(etag)} | {
+        _opaque(representation_etag(etag, coding)) for coding in available_encodings()
+    }
+    for candidate in candidates:
+        if _opaque(candidate) in variants:
+            return candidate
+    return None
+
+
+class ConditionalGetMiddleware:
+    """ASGI middleware adding ETag/Cache-Control and answering revalidations with 304."""
+
+    def __init__(self, app: ASGIApp, cache_rule: CacheRuleFunc, vary: Optional[VaryFunc] = None):
+        """Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI app
+            cache_rule: Returns (ETag, Cache-Control) for requests whose
+                successful response is determined by the ETag, or None
+            vary: Returns further request headers the response is
+                negotiated on (sent in Vary), if any
+        """
+        self.app = app
+        self.cache_rule = cache_rule
+        self.vary = vary
+
+    def _add_vary(self, headers: MutableHeaders, scope: Scope) -> None:
+        # The compression layer may already have added Accept-Encoding
+        present = {name.strip().lower() for name in headers.get("vary", "").split(",")}
+        for name in ("accept-encoding", *(self.vary(scope) if self.vary else ())):
+            if name.lower() not in present:
+                headers.add_vary_header(name)
+                present.add(name.lower())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+        rule = self.cache_rule(scope)
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        etag, control = rule
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        matched = matching_etag(if_none_match, etag) if if_none_match else None
+        if matched is not None:
+            headers = MutableHeaders({"etag": matched, "cache-control": control})
+            self._add_vary(headers, scope)
+            await send({"type": "http.response.start", "status": 304, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_validators(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(raw=list(message["headers"]))
+                if "etag" not in headers:
+                    headers["etag"] = representation_etag(etag, headers.get("content-encoding"))
+                    headers.setdefault("cache-control", control)
+                    self._add_vary(headers, scope)
+                message = {**message, "headers": headers.raw}
+            await send(message)
+
+        await self.app(scope, receive, send_with_validators)
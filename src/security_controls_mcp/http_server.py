@@ -4,39 +4,142 @@
 This provides HTTP transport (Server-Sent Events) for remote MCP clients.
 Compatible with Ansvar platform's HTTP MCP client.
 """
+import argparse
+import asyncio
+import gzip
 import hashlib
-import json
 import json as json_module
 import logging
 import os
+import sys
+import threading
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict
 
+import anyio
 import uvicorn
 from mcp.server import Server
 from mcp.types import TextContent, Tool
 from starlette.applications import Starlette
+from starlette.datastructures import Headers
+from starlette.middleware import Middleware
 from starlette.requests import Request
-from starlette.responses import HTMLResponse, JSONResponse, StreamingResponse
+from starlette.responses import HTMLResponse, Response, StreamingResponse
+from starlette.responses import JSONResponse as StarletteJSONResponse
 from starlette.routing import Route
 
+from .admission import AdmissionMiddleware, admission_families, limiters_from_env
+from .compression import CompressedResponseCache, CompressionMiddleware
 from .config import Config
-from .data_loader import SCFData
+from .crosswalks import CrosswalkStore, crosswalk_etag
+from .data_loader import CLOSEST_METRICS, SCFData
+from .export import (
+    CATALOG_FIELDS,
+    CROSSWALK_FIELDS,
+    FRAMEWORK_FIELDS,
+    MEDIA_TYPES,
+    ExportError,
+    encode_rows,
+    iter_catalog_rows,
+    iter_crosswalk_rows,
+    iter_framework_rows,
+    select_fields,
+)
+from .health import LIVENESS_BODY, build_metadata, read_metadata, readiness_body
+from .http_cache import (
+    ConditionalGetMiddleware,
+    cache_control,
+    matching_etag,
+    max_age_from_env,
+    representation_etag,
+    request_etag,
+)
+from .json_codec import dumps, sse_message
 from .legal_notice import print_legal_notice
+from .metrics import (
+    CONTENT_TYPE,
+    EXTRACTION_DURATION,
+    REGISTRY,
+    MetricsMiddleware,
+    instrument_tool,
+    register_cache,
+)
+from .pagination import (
+    MAX_PAGE_SIZE,
+    CursorError,
+    format_page_footer,
+    next_cursor,
+    query_key,
+    resolve_page,
+)
+from .prefork import (
+    PreforkSupervisor,
+    graceful_timeout_from_env,
+    max_requests_from_env,
+    max_requests_jitter_from_env,
+    workers_from_env,
+)
 from .registry import StandardRegistry
+from .similarity import SIMILARITY_METRICS, TOP_K
+from .singleflight import (
+    SingleFlight,
+    request_key,
+    single_flight_from_env,
+    single_flight_threads_from_env,
+)
+from .tenancy import TenantAuthError, current_registry, load_tenant_registries, use_registry
+from .timing import (
+    ServerTimingMiddleware,
+    annotate,
+    phase,
+    server_timing_from_env,
+    timed_phase,
+    timing_log_from_env,
+)
+from .watcher import StandardsWatcher
 
 logger = logging.getLogger(__name__)
 
 SERVER_VERSION = "1.1.0"
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB max upload size
 
+
+class JSONResponse(StarletteJSONResponse):
+    """JSONResponse rendered with the fast JSON backend (see json_codec)."""
+
+    def render(self, content) -> bytes:
+        with phase("encode"):
+            return dumps(content)
+
+
+def _sse_response(message, status_code: int = 200) -> StreamingResponse:
+    """Single-event SSE response for a JSON-RPC message."""
+    with phase("encode"):
+        event = sse_message(message)
+    return StreamingResponse(
+        iter([event]),
+        media_type="text/event-stream",
+        status_code=status_code,
+    )
+
 # Initialize data loader
 scf_data = SCFData()
-
-# Initialize configuration and registry for paid standards
-config = Config()
-registry = StandardRegistry(config)
+crosswalks = CrosswalkStore(scf_data)
+# Compressed bodies of cacheable GET responses (see _compression_cache_key)
+compression_cache = CompressedResponseCache()
+
+# Per-tenant registries, if SECURITY_CONTROLS_MCP_TENANTS_FILE is set
+tenants = load_tenant_registries()
+
+# Registry for paid standards. In tenant mode the default config dir is never
+# loaded: requests without a tenant get the anonymous (empty) registry.
+if tenants is None:
+    config = Config()
+    registry = StandardRegistry(config)
+else:
+    registry = tenants.anonymous
+    config = registry.config
 
 # Compute data fingerprint and build timestamp once at module load
 _data_dir = Path(__file__).parent / "data"
@@ -716,7 +819,8 @@ async def list_tools() -> list[Tool]:
                 "domain. WARNING: Large frameworks like NIST 800-53 can return 700+ "
                 "controls (~5000 tokens with descriptions, ~2000 without). "
                 "Set include_descriptions=false (default) to reduce token usage. "
-                "Controls are capped at 10 per domain with overflow indicated. "
+                "Controls are capped at 10 per domain with overflow indicated; "
+                "pass page_size (and then cursor) to page through every control. "
                 "Returns 'not found' with a list of valid framework keys if the "
                 "framework doesn't exist. Use list_frameworks to discover valid keys."
             ),
@@ -739,6 +843,23 @@ async def list_tools() -> list[Tool]:
                         ),
                         "default": False,
                     },
+                    "page_size": {
+                        "type": "integer",
+                        "description": (
+                            f"Optional: return one page of this many rows (max {MAX_PAGE_SIZE}) "
+                            "instead of the capped summary. The response ends with a "
+                            "cursor for the next page."
+                        ),
+                        "minimum": 1,
+                        "maximum": MAX_PAGE_SIZE,
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": (
+                            "Optional: cursor from a previous page, to get the next page. "
+                            "Cursors expire when the SCF data changes."
+                        ),
+                    },
                 },
                 "required": ["framework"],
                 "additionalProperties": False,
@@ -751,8 +872,10 @@ async def list_tools() -> list[Tool]:
                 "Shows which target framework requirements are satisfied by source "
                 "framework controls, and identifies gaps where no mapping exists. "
                 "Useful for gap analysis and compliance mapping. "
+                "Pass targets to map one source to several frameworks at once. "
                 "Results are capped at 20 mappings; use source_control to filter "
-                "to a specific control for detailed mapping. "
+                "to a specific control for detailed mapping, or pass page_size "
+                "(and then cursor) to page through every mapping. "
                 "Returns 'not found' if either framework key is invalid. "
                 "Typical response: ~1500-3000 tokens."
             ),
@@ -782,8 +905,207 @@ async def list_tools() -> list[Tool]:
                             "discover keys."
                         ),
                     },
+                    "targets": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": (
+                            "Optional: several target framework keys to map to in one "
+                            "pass (e.g., ['dora', 'nis2', 'nist_csf_2.0']), one column "
+                            "per target. Use instead of or together with target_framework."
+                        ),
+                        "maxItems": 50,
+                    },
+                    "page_size": {
+                        "type": "integer",
+                        "description": (
+                            f"Optional: return one page of this many rows (max {MAX_PAGE_SIZE}) "
+                            "instead of the capped summary. The response ends with a "
+                            "cursor for the next page."
+                        ),
+                        "minimum": 1,
+                        "maximum": MAX_PAGE_SIZE,
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": (
+                            "Optional: cursor from a previous page, to get the next page. "
+                            "Cursors expire when the SCF data changes."
+                        ),
+                    },
+                },
+                "required": ["source_framework"],
+                "additionalProperties": False,
+            },
+        ),
+        Tool(
+            name="compare_frameworks",
+            description=(
+                "Compare frameworks by the SCF controls they share, using a precomputed "
+                "overlap matrix (instant for any pair). With target_framework: shows how "
+                "much of the target an implementation of the source covers, and the "
+                "reverse. Without target_framework: lists the frameworks closest to the "
+                "source. Coverage is measured in SCF controls, not individual "
+                "requirements; use map_frameworks for requirement-level detail. "
+                "Returns 'not found' if a framework key is invalid. "
+                "Typical response: ~200-800 tokens."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "source_framework": {
+                        "type": "string",
+                        "description": (
+                            "Framework key you HAVE implemented (e.g., 'iso_27002_2022'). "
+                            "Use list_frameworks to discover keys."
+                        ),
+                    },
+                    "target_framework": {
+                        "type": "string",
+                        "description": (
+                            "Optional: framework key to compare against (e.g., 'dora'). "
+                            "Omit to list the closest frameworks instead."
+                        ),
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Number of closest frameworks to list (default: 10, max: 50)",
+                        "default": 10,
+                        "minimum": 1,
+                        "maximum": 50,
+                    },
+                    "metric": {
+                        "type": "string",
+                        "enum": ["jaccard", "coverage"],
+                        "description": (
+                            "Ranking for closest frameworks: 'jaccard' (overall similarity, "
+                            "default) or 'coverage' (share of each other framework the "
+                            "source covers)."
+                        ),
+                        "default": "jaccard",
+                    },
+                },
+                "required": ["source_framework"],
+                "additionalProperties": False,
+            },
+        ),
+        Tool(
+            name="gap_analysis",
+            description=(
+                "Score an implementation against several target frameworks at once. "
+                "Give the implemented SCF control IDs, or requirement IDs of a framework "
+                "you have implemented (source_framework + implemented_requirements). "
+                "For each target: requirements met (all mapped SCF controls implemented), "
+                "partial and missing, weight-weighted score, and the first missing "
+                "requirements. Returns 'not found' if a framework key is invalid. "
+                "Typical response: ~300 tokens per target."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "target_frameworks": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": (
+                            "Framework keys to score against (e.g., ['dora', 'nis2', "
+                            "'iso_27002_2022']). Use list_frameworks to discover keys."
+                        ),
+                        "minItems": 1,
+                        "maxItems": 50,
+                    },
+                    "implemented_controls": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "SCF control IDs already implemented (e.g., ['GOV-01', 'IAC-01'])",
+                    },
+                    "source_framework": {
+                        "type": "string",
+                        "description": (
+                            "Framework of implemented_requirements (e.g., 'iso_27002_2022')"
+                        ),
+                    },
+                    "implemented_requirements": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": (
+                            "Requirement IDs of source_framework already implemented "
+                            "(e.g., ['5.1', '5.15']). Resolved to their SCF controls."
+                        ),
+                    },
+                },
+                "required": ["target_frameworks"],
+                "additionalProperties": False,
+            },
+        ),
+        Tool(
+            name="baseline_delta",
+            description=(
+                "Answer 'what do I need to add to go from one baseline to the next', "
+                "e.g. NIST 800-53B Moderate -> High, FedRAMP Low -> Moderate, CIS IG1 -> IG2 "
+                "or CMMC Level 1 -> Level 2, from a containment lattice of nested "
+                "baselines precomputed at load (instant). With to_framework: lists the "
+                "SCF controls to add, and any no longer required if the baselines are "
+                "not nested. Without to_framework: shows the baseline family of "
+                "from_framework, which levels contain it and the upgrade steps. "
+                "Returns 'not found' if a framework key is invalid. "
+                "Typical response: ~300-2500 tokens."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "from_framework": {
+                        "type": "string",
+                        "description": (
+                            "Framework key of the baseline you HAVE "
+                            "(e.g., 'nist_800_53b_r5_moderate', 'cis_csc_8.1_ig1')."
+                        ),
+                    },
+                    "to_framework": {
+                        "type": "string",
+                        "description": (
+                            "Optional: framework key of the baseline you want to reach "
+                            "(e.g., 'nist_800_53b_r5_high'). Omit to show the baseline family."
+                        ),
+                    },
+                },
+                "required": ["from_framework"],
+                "additionalProperties": False,
+            },
+        ),
+        Tool(
+            name="related_controls",
+            description=(
+                "Find SCF controls related to a control because they map to the same "
+                "framework requirements (e.g., controls that usually get implemented or "
+                "audited together). Scored by Jaccard or cosine similarity over the "
+                "controls' requirement sets, from a table precomputed at build time "
+                "(instant). Returns 'not found' if the control ID is invalid. "
+                "Typical response: ~200-600 tokens."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "control_id": {
+                        "type": "string",
+                        "description": "SCF control ID (e.g., GOV-01, IAC-05)",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of related controls (default 10, max 20)",
+                        "default": 10,
+                        "minimum": 1,
+                        "maximum": 20,
+                    },
+                    "metric": {
+                        "type": "string",
+                        "enum": ["jaccard", "cosine"],
+                        "description": (
+                            "Similarity metric: 'jaccard' (default, penalizes controls with "
+                            "many unrelated mappings) or 'cosine' (favours broad controls)."
+                        ),
+                        "default": "jaccard",
+                    },
                 },
-                "required": ["source_framework", "target_framework"],
+                "required": ["control_id"],
                 "additionalProperties": False,
             },
         ),
@@ -881,8 +1203,12 @@ async def list_tools() -> list[Tool]:
 
 
 @mcp_server.call_tool()
+@instrument_tool
+@timed_phase("render")
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Handle tool calls."""
+    # Paid standards of the tenant selected for this request
+    active_registry = current_registry(registry)
 
     if name == "version_info":
         # Collect framework categories for summary
@@ -905,8 +1231,8 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             "and `map_frameworks` to map between any two frameworks.*"
         )
 
-        if registry.has_paid_standards():
-            standards = registry.list_standards()
+        if active_registry.has_paid_standards():
+            standards = active_registry.list_standards()
             paid = [s for s in standards if s["type"] == "paid"]
             if paid:
                 text += f"\n\n**Paid Standards Loaded:** {len(paid)}\n"
@@ -1055,44 +1381,76 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 )
             ]
 
-        controls = scf_data.get_framework_controls(framework, include_descriptions)
-
         fw_info = scf_data.frameworks[framework]
+
+        if "page_size" in arguments or arguments.get("cursor"):
+            # Slice one page from the framework's precomputed domain-ordered index
+            query = query_key("get_framework_controls", framework)
+            try:
+                offset, page_size = resolve_page(
+                    arguments.get("cursor"), arguments.get("page_size"), scf_data.fingerprint, query
+                )
+            except CursorError as e:
+                return [TextContent(type="text", text=f"Error: {e}")]
+            rows, total = scf_data.get_framework_controls_page(
+                framework, offset, page_size, include_descriptions
+            )
+
+            text = f"**{fw_info['name']}**\n"
+            text += f"**Total Controls:** {total}\n"
+            current_domain = None
+            for ctrl in rows:
+                if ctrl["domain"] != current_domain:
+                    current_domain = ctrl["domain"]
+                    text += f"\n**{current_domain}**\n"
+                text += f"- **{ctrl['scf_id']}**: {ctrl['scf_name']}\n"
+                text += f"  Maps to: {', '.join(ctrl['framework_control_ids'])}\n"
+                if include_descriptions:
+                    text += f"  {ctrl['description']}\n"
+
+            cursor = next_cursor(scf_data.fingerprint, query, offset, page_size, total)
+            text += format_page_footer(offset, len(rows), total, cursor)
+            return [TextContent(type="text", text=text)]
+
+        # Domain groups are precomputed at load; take up to 10 controls per domain
+        domains = scf_data.framework_domains(framework, 10, include_descriptions)
+
         text = f"**{fw_info['name']}**\n"
-        text += f"**Total Controls:** {len(controls)}\n\n"
-
-        # Group by domain for readability
-        by_domain: Dict[str, list] = {}
-        for ctrl in controls:
-            # Get full control to get domain
-            full_ctrl = scf_data.get_control(ctrl["scf_id"])
-            if full_ctrl:
-                domain = full_ctrl["domain"]
-                if domain not in by_domain:
-                    by_domain[domain] = []
-                by_domain[domain].append(ctrl)
-
-        for domain, domain_ctrls in sorted(by_domain.items()):
-            text += f"\n**{domain}**\n"
-            for ctrl in domain_ctrls[:10]:  # Limit per domain for readability
+        text += f"**Total Controls:** {len(scf_data.framework_index(framework))}\n\n"
+
+        for group in domains:
+            text += f"\n**{group['domain']}**\n"
+            for ctrl in group["controls"]:
                 text += f"- **{ctrl['scf_id']}**: {ctrl['scf_name']}\n"
                 text += f"  Maps to: {', '.join(ctrl['framework_control_ids'][:5])}\n"
                 if include_descriptions:
                     text += f"  {ctrl['description'][:100]}...\n"
 
-            if len(domain_ctrls) > 10:
-                text += f"  *... and {len(domain_ctrls) - 10} more controls*\n"
+            if group["total"] > 10:
+                text += f"  *... and {group['total'] - 10} more controls*\n"
+
+        if any(group["total"] > 10 for group in domains):
+            text += "\n*Pass page_size to page through every control.*\n"
 
         return [TextContent(type="text", text=text)]
 
     elif name == "map_frameworks":
         source_framework = str(arguments.get("source_framework") or "").strip()
         target_framework = str(arguments.get("target_framework") or "").strip()
-        if not source_framework or not target_framework:
+        targets = arguments.get("targets") or []
+        if not isinstance(targets, list):
+            return [
+                TextContent(
+                    type="text",
+                    text="Error: targets must be a list of framework keys.",
+                )
+            ]
+        targets = [str(fw).strip() for fw in targets if str(fw).strip()]
+        if not source_framework or not (target_framework or targets):
             return [
                 TextContent(
                     type="text",
-                    text="Error: both source_framework and target_framework are required. "
+                    text="Error: source_framework and target_framework (or targets) are required. "
                     "Use list_frameworks to discover valid framework keys.",
                 )
             ]
@@ -1108,27 +1466,132 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 )
             ]
 
-        if target_framework not in scf_data.frameworks:
-            available = ", ".join(scf_data.frameworks.keys())
-            return [
-                TextContent(
-                    type="text",
-                    text=f"Target framework '{target_framework}' not found. Available: {available}",
+        if target_framework and target_framework not in targets:
+            targets.insert(0, target_framework)
+        for fw_key in targets:
+            if fw_key not in scf_data.frameworks:
+                available = ", ".join(scf_data.frameworks.keys())
+                return [
+                    TextContent(
+                        type="text",
+                        text=f"Target framework '{fw_key}' not found. Available: {available}",
+                    )
+                ]
+
+        # Annex A IDs of ISO 27001 are looked up under the ISO 27002 key
+        resolved_via = None
+        if source_control:
+            lookup_framework, _ = scf_data.lookup_requirement(source_framework, source_control)
+            if lookup_framework != source_framework:
+                resolved_via = lookup_framework
+
+        source_name = scf_data.frameworks[source_framework]["name"]
+
+        if "page_size" in arguments or arguments.get("cursor"):
+            # Slice one page from the source framework's precomputed ordered index
+            query = query_key("map_frameworks", source_framework, targets, source_control)
+            try:
+                offset, page_size = resolve_page(
+                    arguments.get("cursor"), arguments.get("page_size"), scf_data.fingerprint, query
                 )
-            ]
+            except CursorError as e:
+                return [TextContent(type="text", text=f"Error: {e}")]
+            rows, total = scf_data.map_frameworks_page(
+                source_framework, targets, offset, page_size, source_control
+            )
+            if not total:
+                return [
+                    TextContent(
+                        type="text",
+                        text=f"No mappings found for {source_framework}"
+                        + (f" control {source_control}" if source_control else ""),
+                    )
+                ]
+
+            if len(targets) > 1:
+                text = f"**Mapping: {source_name} → {len(targets)} frameworks**\n"
+            else:
+                text = f"**Mapping: {source_name} → {scf_data.frameworks[targets[0]]['name']}**\n"
+            if source_control:
+                text += f"**Filtered to source control: {source_control}**\n"
+            if resolved_via:
+                text += (
+                    f"**Annex A control resolved via `{resolved_via}` "
+                    "(ISO 27001 Annex A = ISO 27002 controls)**\n"
+                )
+            text += f"**Found {total} SCF controls**\n\n"
+
+            for row in rows:
+                text += f"**{row['scf_id']}: {row['scf_name']}** (weight: {row['weight']})\n"
+                text += f"- Source ({source_framework}): {', '.join(row['source_controls'])}\n"
+                for fw_key in targets:
+                    target_ids = row["targets"][fw_key]
+                    if target_ids:
+                        text += f"- {fw_key}: {', '.join(target_ids)}\n"
+                    else:
+                        text += f"- {fw_key}: *No direct mapping*\n"
+                text += "\n"
+
+            cursor = next_cursor(scf_data.fingerprint, query, offset, page_size, total)
+            text += format_page_footer(offset, len(rows), total, cursor)
+            return [TextContent(type="text", text=text)]
+
+        if len(targets) > 1:
+            # One pass over the source framework's controls, one column per target
+            rows = list(scf_data.iter_mappings(source_framework, targets, source_control))
+            if not rows:
+                return [
+                    TextContent(
+                        type="text",
+                        text=f"No mappings found for {source_framework}"
+                        + (f" control {source_control}" if source_control else ""),
+                    )
+                ]
+
+            text = f"**Mapping: {source_name} → {len(targets)} frameworks**\n"
+            if source_control:
+                text += f"**Filtered to source control: {source_control}**\n"
+            if resolved_via:
+                text += (
+                    f"**Annex A control resolved via `{resolved_via}` "
+                    "(ISO 27001 Annex A = ISO 27002 controls)**\n"
+                )
+            text += f"**Found {len(rows)} SCF controls**\n\n"
+
+            text += "**Mapped per target:**\n"
+            for fw_key in targets:
+                mapped = sum(1 for row in rows if row["targets"][fw_key])
+                text += f"- `{fw_key}`: {mapped} of {len(rows)} SCF controls\n"
+            text += "\n"
+
+            for row in rows[:20]:  # Limit for readability
+                text += f"**{row['scf_id']}: {row['scf_name']}** (weight: {row['weight']})\n"
+                text += f"- Source ({source_framework}): {', '.join(row['source_controls'][:5])}\n"
+                for fw_key in targets:
+                    target_ids = row["targets"][fw_key]
+                    if target_ids:
+                        text += f"- {fw_key}: {', '.join(target_ids[:5])}\n"
+                    else:
+                        text += f"- {fw_key}: *No direct mapping*\n"
+                text += "\n"
+
+            if len(rows) > 20:
+                text += (
+                    f"\n*Showing first 20 of {len(rows)} mappings. "
+                    "Pass page_size to page through all of them.*\n"
+                )
+
+            return [TextContent(type="text", text=text)]
 
+        target_framework = targets[0]
         mappings = scf_data.map_frameworks(source_framework, target_framework, source_control)
 
         if not mappings:
             hint = ""
-            if (
-                source_control
-                and source_framework == "iso_27001_2022"
-                and str(source_control).strip().upper().startswith("A.")
-            ):
+            if resolved_via:
                 hint = (
-                    "\n\nTip: Annex A control IDs (e.g., A.5.15) are mapped under "
-                    "`iso_27002_2022` in SCF data. Try source_framework='iso_27002_2022'."
+                    f"\n\nNote: Annex A control IDs (e.g., A.5.15) are looked up under "
+                    f"`{resolved_via}` in SCF data, which has no control {source_control}."
                 )
             return [
                 TextContent(
@@ -1137,12 +1600,16 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 )
             ]
 
-        source_name = scf_data.frameworks[source_framework]["name"]
         target_name = scf_data.frameworks[target_framework]["name"]
 
         text = f"**Mapping: {source_name} → {target_name}**\n"
         if source_control:
             text += f"**Filtered to source control: {source_control}**\n"
+        if resolved_via:
+            text += (
+                f"**Annex A control resolved via `{resolved_via}` "
+                "(ISO 27001 Annex A = ISO 27002 controls)**\n"
+            )
         text += f"**Found {len(mappings)} SCF controls**\n\n"
 
         for mapping in mappings[:20]:  # Limit for readability
@@ -1159,7 +1626,10 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             text += "\n"
 
         if len(mappings) > 20:
-            text += f"\n*Showing first 20 of {len(mappings)} mappings*\n"
+            text += (
+                f"\n*Showing first 20 of {len(mappings)} mappings. "
+                "Pass page_size to page through all of them.*\n"
+            )
 
         return [TextContent(type="text", text=text)]
 
@@ -1213,46 +1683,68 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         }
 
         # Include paid standards count if available
-        if registry.has_paid_standards():
-            standards = registry.list_standards()
+        if active_registry.has_paid_standards():
+            standards = active_registry.list_standards()
             paid = [s for s in standards if s["type"] == "paid"]
             about_data["dataset"]["counts"]["paid_standards"] = len(paid)
 
         return [TextContent(type="text", text=json_module.dumps(about_data, indent=2))]
 
-    elif name == "list_available_standards":
-        standards = registry.list_standards()
+    elif name == "compare_frameworks":
+        source_framework = str(arguments.get("source_framework") or "").strip()
+        target_framework = str(arguments.get("target_framework") or "").strip()
+        if not source_framework:
+            return [
+                TextContent(
+                    type="text",
+                    text="Error: source_framework is required. "
+                    "Use list_frameworks to discover valid framework keys.",
+                )
+            ]
 
-        text = f"**Available Standards ({len(standards)} total)**\n\n"
+        for label, fw_key in (("Source", source_framework), ("Target", target_framework)):
+            if fw_key and fw_key not in scf_data.frameworks:
+                available = ", ".join(scf_data.frameworks.keys())
+                return [
+                    TextContent(
+                        type="text",
+                        text=f"{label} framework '{fw_key}' not found. Available: {available}",
+                    )
+                ]
 
-        for std in standards:
-            if std["type"] == "built-in":
-                text += f"### {std['title']} (Built-in)\n"
-                text += f"- **License:** {std['license']}\n"
-                text += f"- **Coverage:** {std['controls']}\n\n"
-            else:
-                text += f"### {std['title']} (Purchased)\n"
-                text += f"- **ID:** `{std['standard_id']}`\n"
-                text += f"- **Version:** {std['version']}\n"
-                text += f"- **License:** {std['license']}\n"
-                text += f"- **Purchased from:** {std['purchased_from']}\n"
-                text += f"- **Purchase date:** {std['purchase_date']}\n\n"
+        source_name = scf_data.frameworks[source_framework]["name"]
 
-        if not registry.has_paid_standards():
-            text += "\n*No purchased standards imported yet. Purchase a standard "
-            text += "(e.g., ISO 27001 from ISO.org) and use the import tool to add it.*\n"
+        if target_framework:
+            comparison = scf_data.compare_frameworks(source_framework, target_framework)
+            target_name = scf_data.frameworks[target_framework]["name"]
+            shared = comparison["shared_controls"]
 
-        return [TextContent(type="text", text=text)]
+            text = f"**Overlap: {source_name} → {target_name}**\n\n"
+            text += (
+                f"- **Coverage of {target_framework}:** {comparison['target_coverage']:.1%} "
+                f"({shared} of {comparison['target_controls']} SCF controls)\n"
+            )
+            text += (
+                f"- **Coverage of {source_framework}:** {comparison['source_coverage']:.1%} "
+                f"({shared} of {comparison['source_controls']} SCF controls)\n"
+            )
+            text += f"- **Similarity (Jaccard):** {comparison['jaccard']:.2f}\n"
+            text += (
+                f"- **Gap:** {comparison['target_controls'] - shared} SCF controls mapped to "
+                f"{target_framework} have no {source_framework} mapping\n"
+            )
+            text += (
+                "\n*Coverage counts SCF controls mapped by both frameworks. "
+                "Use map_frameworks for requirement-level detail.*\n"
+            )
+            return [TextContent(type="text", text=text)]
 
-    elif name == "query_standard":
-        standard = str(arguments.get("standard") or "").strip()
-        query = str(arguments.get("query") or "").strip()
-        if not standard or not query:
+        metric = str(arguments.get("metric") or "jaccard").strip()
+        if metric not in CLOSEST_METRICS:
             return [
                 TextContent(
                     type="text",
-                    text="Error: both standard and query are required and must not be empty. "
-                    "Use list_available_standards to see available standard IDs.",
+                    text=f"Error: metric must be one of: {', '.join(CLOSEST_METRICS)}",
                 )
             ]
         try:
@@ -1260,16 +1752,280 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         except (ValueError, TypeError):
             limit = 10
 
-        provider = registry.get_provider(standard)
-        if not provider:
-            available = [s["standard_id"] for s in registry.list_standards() if s["type"] == "paid"]
-            if available:
-                text = f"Standard '{standard}' not found. Available: {', '.join(available)}"
-            else:
-                text = "No purchased standards available. Import a standard first using the import tool."
-            return [TextContent(type="text", text=text)]
-
-        results = provider.search(query, limit=limit)
+        closest = scf_data.closest_frameworks(source_framework, limit, metric)
+        if not closest:
+            return [
+                TextContent(
+                    type="text",
+                    text=f"No frameworks share SCF controls with {source_framework}",
+                )
+            ]
+
+        text = f"**Frameworks closest to {source_name}** (by {metric})\n\n"
+        for rank, item in enumerate(closest, 1):
+            fw = scf_data.frameworks[item["target_framework"]]
+            text += (
+                f"{rank}. `{fw['key']}`: {fw['name']} — {item['target_coverage']:.1%} covered, "
+                f"Jaccard {item['jaccard']:.2f} ({item['shared_controls']} shared controls)\n"
+            )
+        text += (
+            "\n*Use compare_frameworks with target_framework for a pair, "
+            "or map_frameworks for requirement-level detail.*\n"
+        )
+        return [TextContent(type="text", text=text)]
+
+    elif name == "gap_analysis":
+        for key in ("target_frameworks", "implemented_controls", "implemented_requirements"):
+            value = arguments.get(key)
+            if value is not None and not (
+                isinstance(value, list) and all(isinstance(item, str) for item in value)
+            ):
+                return [TextContent(type="text", text=f"Error: {key} must be a list of strings.")]
+        target_frameworks = [
+            str(fw).strip() for fw in arguments.get("target_frameworks") or [] if str(fw).strip()
+        ]
+        implemented_controls = arguments.get("implemented_controls") or []
+        source_framework = str(arguments.get("source_framework") or "").strip() or None
+        implemented_requirements = arguments.get("implemented_requirements") or []
+        if not target_frameworks:
+            return [
+                TextContent(
+                    type="text",
+                    text="Error: target_frameworks is required and must not be empty. "
+                    "Use list_frameworks to discover valid framework keys.",
+                )
+            ]
+        if not implemented_controls and not implemented_requirements:
+            return [
+                TextContent(
+                    type="text",
+                    text="Error: provide implemented_controls (SCF IDs) or "
+                    "source_framework with implemented_requirements.",
+                )
+            ]
+
+        try:
+            analysis = scf_data.gap_analysis(
+                target_frameworks[:50],
+                implemented_controls,
+                source_framework,
+                implemented_requirements,
+            )
+        except ValueError as e:
+            available = ", ".join(scf_data.frameworks.keys())
+            return [TextContent(type="text", text=f"{e}. Available: {available}")]
+
+        text = f"**Gap Analysis: {analysis['implemented_controls']} SCF controls implemented**\n"
+        if analysis["unknown_ids"]:
+            text += f"*Ignored unknown IDs: {', '.join(map(str, analysis['unknown_ids'][:20]))}*\n"
+        text += "\n"
+
+        for target in analysis["targets"]:
+            text += f"### {target['name']} (`{target['framework']}`)\n"
+            text += (
+                f"- **Requirements met:** {target['requirements_met']} of "
+                f"{target['requirements_total']} ({target['coverage']:.1%}), "
+                f"partial: {target['requirements_partial']}, "
+                f"missing: {target['requirements_missing']}\n"
+            )
+            text += (
+                f"- **SCF controls:** {target['controls_implemented']} of "
+                f"{target['controls_total']} implemented, "
+                f"weighted score {target['weighted_score']:.1%}\n"
+            )
+            if target["missing_requirements"]:
+                missing = target["missing_requirements"]
+                text += f"- **Missing:** {', '.join(missing[:10])}"
+                if len(missing) > 10:
+                    text += f" *... and {len(missing) - 10} more*"
+                text += "\n"
+            text += "\n"
+
+        text += "*Use map_frameworks to see which SCF controls close a specific gap.*\n"
+        return [TextContent(type="text", text=text)]
+
+    elif name == "baseline_delta":
+        from_framework = str(arguments.get("from_framework") or "").strip()
+        to_framework = str(arguments.get("to_framework") or "").strip()
+        if not from_framework:
+            return [
+                TextContent(
+                    type="text",
+                    text="Error: from_framework is required. "
+                    "Use list_frameworks to discover valid framework keys.",
+                )
+            ]
+
+        for label, fw_key in (("From", from_framework), ("To", to_framework)):
+            if fw_key and fw_key not in scf_data.frameworks:
+                available = ", ".join(scf_data.frameworks.keys())
+                return [
+                    TextContent(
+                        type="text",
+                        text=f"{label} framework '{fw_key}' not found. Available: {available}",
+                    )
+                ]
+
+        if not to_framework:
+            family = scf_data.baseline_family(from_framework)
+            if family is None:
+                return [
+                    TextContent(
+                        type="text",
+                        text=f"{from_framework} is not part of a known baseline family. "
+                        "Pass to_framework to diff it against any other framework.",
+                    )
+                ]
+
+            text = f"**Baseline family: {family['family']}**\n\n"
+            for level in family["levels"]:
+                marker = " ← you are here" if level["framework"] == from_framework else ""
+                text += f"- `{level['framework']}`: {level['controls']} SCF controls{marker}\n"
+
+            contained_in = family["subset_of"][from_framework]
+            text += "\n**Contained in:** "
+            text += ", ".join(f"`{fw_key}`" for fw_key in contained_in) if contained_in else "none"
+            text += "\n"
+            for pair in family["equivalent"]:
+                if from_framework in pair:
+                    text += f"**Same SCF controls as:** `{pair[1 - pair.index(from_framework)]}`\n"
+
+            text += "\n**Upgrade steps:**\n"
+            for step in family["steps"]:
+                text += f"- `{step['from']}` → `{step['to']}`: +{step['added']} SCF controls\n"
+            text += "\n*Pass to_framework to list the controls a step adds.*\n"
+            return [TextContent(type="text", text=text)]
+
+        delta = scf_data.baseline_delta(from_framework, to_framework)
+        from_name = scf_data.frameworks[from_framework]["name"]
+        to_name = scf_data.frameworks[to_framework]["name"]
+
+        text = f"**Baseline delta: {from_name} → {to_name}**\n\n"
+        text += (
+            f"- **SCF controls:** {delta['from_controls']} → {delta['to_controls']}\n"
+            f"- **To add:** {len(delta['added'])}\n"
+        )
+        if delta["is_subset"]:
+            text += f"- {from_framework} is fully contained in {to_framework}\n"
+        else:
+            text += (
+                f"- **No longer required:** {len(delta['removed'])} "
+                f"({from_framework} is not a subset of {to_framework})\n"
+            )
+
+        if delta["added"]:
+            text += "\n**Controls to add:**\n"
+            for ctrl in delta["added"][:50]:
+                text += (
+                    f"- **{ctrl['scf_id']}**: {ctrl['scf_name']} "
+                    f"({', '.join(ctrl['framework_control_ids'][:5])})\n"
+                )
+            if len(delta["added"]) > 50:
+                text += f"\n*Showing first 50 of {len(delta['added'])} controls to add*\n"
+
+        if delta["removed"]:
+            text += "\n**No longer required:**\n"
+            for ctrl in delta["removed"][:20]:
+                text += f"- **{ctrl['scf_id']}**: {ctrl['scf_name']}\n"
+            if len(delta["removed"]) > 20:
+                text += f"\n*Showing first 20 of {len(delta['removed'])}*\n"
+
+        return [TextContent(type="text", text=text)]
+
+    elif name == "related_controls":
+        control_id = str(arguments.get("control_id") or "").strip()
+        if not control_id:
+            return [
+                TextContent(
+                    type="text",
+                    text="Error: control_id is required and must not be empty. "
+                    "Use search_controls to discover valid control IDs (e.g., GOV-01, IAC-05).",
+                )
+            ]
+        control = scf_data.get_control(control_id)
+        if not control:
+            return [
+                TextContent(
+                    type="text",
+                    text=f"Control {control_id} not found. Use search_controls to find controls.",
+                )
+            ]
+
+        try:
+            limit = min(max(int(arguments.get("limit", 10) or 10), 1), 20)
+        except (TypeError, ValueError):
+            limit = 10
+        metric = arguments.get("metric", "jaccard")
+        try:
+            related = scf_data.related_controls(control["id"], limit, metric)
+        except ValueError as e:
+            return [TextContent(type="text", text=f"Error: {e}")]
+
+        text = f"**Controls related to {control['id']}: {control['name']}**\n"
+        text += f"*Ranked by {metric} similarity of mapped framework requirements*\n\n"
+        if not related:
+            text += "No other control shares a framework requirement with this control.\n"
+            return [TextContent(type="text", text=text)]
+
+        for item in related:
+            text += (
+                f"- **{item['scf_id']}**: {item['scf_name']} ({item['domain']}) - "
+                f"{item['shared_requirements']} shared requirements, "
+                f"jaccard {item['jaccard']:.2f}, cosine {item['cosine']:.2f}\n"
+            )
+        text += "\n*Use get_control to see a control's full framework mappings.*\n"
+        return [TextContent(type="text", text=text)]
+
+    elif name == "list_available_standards":
+        standards = active_registry.list_standards()
+
+        text = f"**Available Standards ({len(standards)} total)**\n\n"
+
+        for std in standards:
+            if std["type"] == "built-in":
+                text += f"### {std['title']} (Built-in)\n"
+                text += f"- **License:** {std['license']}\n"
+                text += f"- **Coverage:** {std['controls']}\n\n"
+            else:
+                text += f"### {std['title']} (Purchased)\n"
+                text += f"- **ID:** `{std['standard_id']}`\n"
+                text += f"- **Version:** {std['version']}\n"
+                text += f"- **License:** {std['license']}\n"
+                text += f"- **Purchased from:** {std['purchased_from']}\n"
+                text += f"- **Purchase date:** {std['purchase_date']}\n\n"
+
+        if not active_registry.has_paid_standards():
+            text += "\n*No purchased standards imported yet. Purchase a standard "
+            text += "(e.g., ISO 27001 from ISO.org) and use the import tool to add it.*\n"
+
+        return [TextContent(type="text", text=text)]
+
+    elif name == "query_standard":
+        standard = str(arguments.get("standard") or "").strip()
+        query = str(arguments.get("query") or "").strip()
+        if not standard or not query:
+            return [
+                TextContent(
+                    type="text",
+                    text="Error: both standard and query are required and must not be empty. "
+                    "Use list_available_standards to see available standard IDs.",
+                )
+            ]
+        try:
+            limit = min(max(int(arguments.get("limit", 10) or 10), 1), 50)
+        except (ValueError, TypeError):
+            limit = 10
+
+        provider = active_registry.get_provider(standard)
+        if not provider:
+            available = [s["standard_id"] for s in active_registry.list_standards() if s["type"] == "paid"]
+            if available:
+                text = f"Standard '{standard}' not found. Available: {', '.join(available)}"
+            else:
+                text = "No purchased standards available. Import a standard first using the import tool."
+            return [TextContent(type="text", text=text)]
+
+        results = provider.search(query, limit=limit)
 
         if not results:
             return [TextContent(type="text", text=f"No results found for '{query}' in {standard}")]
@@ -1302,9 +2058,9 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 )
             ]
 
-        provider = registry.get_provider(standard)
+        provider = active_registry.get_provider(standard)
         if not provider:
-            available = [s["standard_id"] for s in registry.list_standards() if s["type"] == "paid"]
+            available = [s["standard_id"] for s in active_registry.list_standards() if s["type"] == "paid"]
             if available:
                 text = f"Standard '{standard}' not found. Available: {', '.join(available)}"
             else:
@@ -1355,20 +2111,124 @@ async def health_check(request):
     )
 
 
+def _readiness() -> bytes:
+    """Readiness body: the data is loaded once this module is, described by its sidecar."""
+    metadata = read_metadata()
+    if metadata is None or metadata.get("fingerprint") != scf_data.fingerprint:
+        logger.warning("Data metadata sidecar missing or stale, describing the loaded data")
+        metadata = build_metadata(scf_data, DATA_BUILT)
+    return readiness_body(metadata, loaded=True)
+
+
+READINESS_BODY = _readiness()
+
+
+async def liveness_probe(request):
+    """Liveness probe: the process is up."""
+    return Response(LIVENESS_BODY, media_type="application/json")
+
+
+async def readiness_probe(request):
+    """Readiness probe: data load state and metadata (see health)."""
+    return Response(READINESS_BODY, media_type="application/json")
+
+
+# ============== REQUEST COALESCING ==============
+
+SINGLE_FLIGHT = single_flight_from_env()
+SINGLE_FLIGHT_THREADS = single_flight_threads_from_env()
+tool_flight = SingleFlight("tools")
+rest_flight = SingleFlight("rest")
+
+# Event loop of each worker thread running tool calls (SINGLE_FLIGHT_THREADS)
+_thread_loops = threading.local()
+
+
+def _call_tool_in_thread(tool_name, arguments, request_registry):
+    loop = getattr(_thread_loops, "loop", None)
+    if loop is None:
+        loop = _thread_loops.loop = asyncio.new_event_loop()
+    with use_registry(request_registry):
+        return loop.run_until_complete(call_tool(tool_name, arguments))
+
+
+async def _call_tool_with_registry(tool_name, arguments, request_registry):
+    with use_registry(request_registry):
+        return await call_tool(tool_name, arguments)
+
+
+async def _call_tool_coalesced(tool_name, arguments, request_registry):
+    """Call a tool with the caller's registry, sharing identical concurrent calls.
+
+    The leader runs call_tool in a worker thread, so identical calls arriving
+    while it computes find it in flight and await its result. Without
+    SINGLE_FLIGHT_THREADS it is awaited on the event loop, where it finishes
+    before any follower can join.
+    """
+    if not SINGLE_FLIGHT:
+        return await _call_tool_with_registry(tool_name, arguments, request_registry)
+    key = request_key(tool_name, arguments, scf_data.fingerprint, id(request_registry))
+    if SINGLE_FLIGHT_THREADS:
+        return await tool_flight.do(
+            key,
+            lambda: anyio.to_thread.run_sync(
+                _call_tool_in_thread, tool_name, arguments, request_registry
+            ),
+        )
+    return await tool_flight.do(
+        key, lambda: _call_tool_with_registry(tool_name, arguments, request_registry)
+    )
+
+
+async def _query_coalesced(func, *args):
+    """Run an SCFData query in a worker thread, shared with identical concurrent requests."""
+    if not SINGLE_FLIGHT:
+        return func(*args)
+    key = request_key(func.__name__, args, scf_data.fingerprint)
+    return await rest_flight.do(key, lambda: anyio.to_thread.run_sync(func, *args))
+
+
+def _mapping_rows(source_framework, targets, source_control):
+    return list(scf_data.iter_mappings(source_framework, targets, source_control))
+
+
 # ============== REST API ENDPOINTS ==============
 
+@timed_phase("parse")
+async def _query_body(request, list_fields=()):
+    """JSON body of a POST, or the same fields from the query string of a GET.
+
+    GET equivalents of the query endpoints are cacheable (see _http_cache_rule).
+    List fields take repeated parameters or comma-separated values.
+    """
+    if request.method == "POST":
+        return await request.json()
+    body = {}
+    for key in request.query_params:
+        values = request.query_params.getlist(key)
+        if key in list_fields:
+            items = (item.strip() for value in values for item in value.split(","))
+            body[key] = [item for item in items if item]
+        else:
+            body[key] = values[-1]
+    return body
+
+
 async def api_search_controls(request):
-    """REST API: Search controls by keyword."""
+    """REST API: Search controls by keyword (POST body or GET ?query=&frameworks=a,b&limit=)."""
     try:
-        body = await request.json()
+        body = await _query_body(request, list_fields=("frameworks",))
         query = body.get("query", "")
         frameworks = body.get("frameworks")
-        limit = body.get("limit", 10)
+        try:
+            limit = int(body.get("limit", 10))
+        except (TypeError, ValueError):
+            return JSONResponse({"error": "Bad Request", "message": "limit must be an integer"}, status_code=400)
 
         if not query:
             return JSONResponse({"error": "Bad Request", "message": "Query is required"}, status_code=400)
 
-        results = scf_data.search_controls(query, frameworks, limit)
+        results = await _query_coalesced(scf_data.search_controls, query, frameworks, limit)
         return JSONResponse({
             "query": query,
             "count": len(results),
@@ -1403,6 +2263,30 @@ async def api_get_control(request):
     return JSONResponse(response)
 
 
+async def api_related_controls(request):
+    """REST API: Controls sharing the most framework requirements with a control."""
+    control_id = request.path_params["control_id"]
+    control = scf_data.get_control(control_id)
+    if not control:
+        return JSONResponse({"error": "Not Found", "message": f"Control {control_id} not found"}, status_code=404)
+
+    metric = request.query_params.get("metric", "jaccard")
+    if metric not in SIMILARITY_METRICS:
+        return JSONResponse({"error": "Bad Request", "message": f"metric must be one of: {', '.join(SIMILARITY_METRICS)}"}, status_code=400)
+    try:
+        limit = min(max(int(request.query_params.get("limit", 10)), 1), TOP_K)
+    except ValueError:
+        return JSONResponse({"error": "Bad Request", "message": "limit must be an integer"}, status_code=400)
+
+    related = scf_data.related_controls(control["id"], limit, metric)
+    return JSONResponse({
+        "control_id": control["id"],
+        "metric": metric,
+        "count": len(related),
+        "related": related
+    })
+
+
 async def api_list_frameworks(request):
     """REST API: List all frameworks."""
     frameworks = list(scf_data.frameworks.values())
@@ -1413,26 +2297,257 @@ async def api_list_frameworks(request):
     })
 
 
+async def api_compare_frameworks(request):
+    """REST API: Compare two frameworks by shared SCF controls."""
+    source_framework = request.path_params["source_framework"]
+    target_framework = request.path_params["target_framework"]
+
+    for fw_key in (source_framework, target_framework):
+        if fw_key not in scf_data.frameworks:
+            return JSONResponse({"error": "Not Found", "message": f"Framework {fw_key} not found"}, status_code=404)
+
+    return JSONResponse(scf_data.compare_frameworks(source_framework, target_framework))
+
+
+async def api_closest_frameworks(request):
+    """REST API: Rank frameworks by overlap with a framework."""
+    framework = request.path_params["framework"]
+    if framework not in scf_data.frameworks:
+        return JSONResponse({"error": "Not Found", "message": f"Framework {framework} not found"}, status_code=404)
+
+    metric = request.query_params.get("metric", "jaccard")
+    if metric not in CLOSEST_METRICS:
+        return JSONResponse({"error": "Bad Request", "message": f"metric must be one of: {', '.join(CLOSEST_METRICS)}"}, status_code=400)
+    try:
+        limit = min(max(int(request.query_params.get("limit", 10)), 1), len(scf_data.frameworks))
+    except ValueError:
+        return JSONResponse({"error": "Bad Request", "message": "limit must be an integer"}, status_code=400)
+
+    closest = scf_data.closest_frameworks(framework, limit, metric)
+    return JSONResponse({
+        "framework": framework,
+        "metric": metric,
+        "count": len(closest),
+        "frameworks": closest
+    })
+
+
+async def api_framework_controls(request):
+    """REST API: Page through the SCF controls mapped to a framework.
+
+    Controls come in domain order; pass page_size and the returned
+    next_cursor as cursor to get the following page.
+    """
+    framework = request.path_params["framework"]
+    if framework not in scf_data.frameworks:
+        return JSONResponse({"error": "Not Found", "message": f"Framework {framework} not found"}, status_code=404)
+
+    query = query_key("get_framework_controls", framework)
+    try:
+        offset, page_size = resolve_page(
+            request.query_params.get("cursor"), request.query_params.get("page_size"), scf_data.fingerprint, query
+        )
+    except CursorError as e:
+        return JSONResponse({"error": "Bad Request", "message": str(e)}, status_code=400)
+
+    include_descriptions = request.query_params.get("include_descriptions", "").lower() in ("1", "true", "yes")
+    controls, total = await _query_coalesced(
+        scf_data.get_framework_controls_page, framework, offset, page_size, include_descriptions
+    )
+    return JSONResponse({
+        "framework": framework,
+        "total": total,
+        "count": len(controls),
+        "controls": controls,
+        "next_cursor": next_cursor(scf_data.fingerprint, query, offset, page_size, total),
+    })
+
+
+async def api_framework_domains(request):
+    """REST API: A framework's controls grouped by domain.
+
+    Served from the domain views precomputed at load; per_domain caps the
+    controls returned for each domain (default: all).
+    """
+    framework = request.path_params["framework"]
+    if framework not in scf_data.frameworks:
+        return JSONResponse({"error": "Not Found", "message": f"Framework {framework} not found"}, status_code=404)
+
+    per_domain = request.query_params.get("per_domain")
+    try:
+        per_domain = max(int(per_domain), 0) if per_domain is not None else None
+    except ValueError:
+        return JSONResponse({"error": "Bad Request", "message": "per_domain must be an integer"}, status_code=400)
+
+    include_descriptions = request.query_params.get("include_descriptions", "").lower() in ("1", "true", "yes")
+    domains = scf_data.framework_domains(framework, per_domain, include_descriptions)
+    return JSONResponse({
+        "framework": framework,
+        "total": len(scf_data.framework_index(framework)),
+        "domains": domains,
+    })
+
+
+async def api_baselines(request):
+    """REST API: Containment lattices of the baseline families."""
+    return JSONResponse({
+        "count": len(scf_data.baseline_lattice),
+        "families": list(scf_data.baseline_lattice.values()),
+    })
+
+
+async def api_baseline_delta(request):
+    """REST API: SCF controls to add going from one baseline to another."""
+    from_framework = request.path_params["from_framework"]
+    to_framework = request.path_params["to_framework"]
+    for fw_key in (from_framework, to_framework):
+        if fw_key not in scf_data.frameworks:
+            return JSONResponse({"error": "Not Found", "message": f"Framework {fw_key} not found"}, status_code=404)
+    return JSONResponse(scf_data.baseline_delta(from_framework, to_framework))
+
+
+async def api_gap_analysis(request):
+    """REST API: Score implemented controls against target frameworks.
+
+    Also available as GET with the lists as comma-separated parameters.
+    """
+    try:
+        body = await _query_body(
+            request,
+            list_fields=("target_frameworks", "implemented_controls", "implemented_requirements"),
+        )
+        target_frameworks = body.get("target_frameworks") or []
+        implemented_controls = body.get("implemented_controls") or []
+        source_framework = body.get("source_framework")
+        implemented_requirements = body.get("implemented_requirements") or []
+
+        if not target_frameworks or not isinstance(target_frameworks, list):
+            return JSONResponse({"error": "Bad Request", "message": "target_frameworks must be a non-empty list"}, status_code=400)
+        for key, value in (
+            ("target_frameworks", target_frameworks),
+            ("implemented_controls", implemented_controls),
+            ("implemented_requirements", implemented_requirements),
+        ):
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                return JSONResponse({"error": "Bad Request", "message": f"{key} must be a list of strings"}, status_code=400)
+        if source_framework is not None and not isinstance(source_framework, str):
+            return JSONResponse({"error": "Bad Request", "message": "source_framework must be a string"}, status_code=400)
+        if not implemented_controls and not implemented_requirements:
+            return JSONResponse({"error": "Bad Request", "message": "implemented_controls or implemented_requirements required"}, status_code=400)
+
+        for fw_key in [*target_frameworks, *([source_framework] if source_framework else [])]:
+            if fw_key not in scf_data.frameworks:
+                return JSONResponse({"error": "Not Found", "message": f"Framework {fw_key} not found"}, status_code=404)
+
+        try:
+            analysis = await _query_coalesced(
+                scf_data.gap_analysis,
+                target_frameworks,
+                implemented_controls,
+                source_framework,
+                implemented_requirements,
+            )
+        except ValueError as e:
+            return JSONResponse({"error": "Bad Request", "message": str(e)}, status_code=400)
+        return JSONResponse(analysis)
+    except Exception as e:
+        logger.error(f"Error in api_gap_analysis: {e}", exc_info=True)
+        return JSONResponse({"error": "Internal Server Error", "message": "An error occurred while running the gap analysis"}, status_code=500)
+
+
 async def api_map_frameworks(request):
-    """REST API: Map controls between frameworks."""
+    """REST API: Map controls from one framework to one or more target frameworks.
+
+    Accepts target_framework, targets (a list), or both. When targets is
+    given, each mapping carries a "targets" object with one column per
+    target instead of "target_controls". Send "stream": true (or Accept:
+    application/x-ndjson) to receive mappings in that shape as NDJSON, one
+    per line, as they are produced.
+
+    Send page_size (and then the returned next_cursor as cursor) to walk
+    the mappings page by page; each page carries total and next_cursor.
+
+    Also available as GET with the same fields as query parameters
+    (targets comma-separated, stream=true).
+    """
     try:
-        body = await request.json()
+        body = await _query_body(request, list_fields=("targets",))
         source_framework = body.get("source_framework")
         target_framework = body.get("target_framework")
+        targets = body.get("targets") or []
         source_control = body.get("source_control")
 
-        if not source_framework or not target_framework:
-            return JSONResponse({"error": "Bad Request", "message": "source_framework and target_framework required"}, status_code=400)
+        if not isinstance(targets, list) or not all(isinstance(fw, str) for fw in targets):
+            return JSONResponse({"error": "Bad Request", "message": "targets must be a list of strings"}, status_code=400)
+        if not source_framework or not (target_framework or targets):
+            return JSONResponse({"error": "Bad Request", "message": "source_framework and target_framework (or targets) required"}, status_code=400)
+
+        if target_framework and target_framework not in targets:
+            targets = [target_framework, *targets]
 
         if source_framework not in scf_data.frameworks:
             return JSONResponse({"error": "Not Found", "message": f"Framework {source_framework} not found"}, status_code=404)
-        if target_framework not in scf_data.frameworks:
-            return JSONResponse({"error": "Not Found", "message": f"Framework {target_framework} not found"}, status_code=404)
+        for fw_key in targets:
+            if fw_key not in scf_data.frameworks:
+                return JSONResponse({"error": "Not Found", "message": f"Framework {fw_key} not found"}, status_code=404)
+
+        stream = str(body.get("stream")).lower() in ("true", "1")
+        stream = stream or "application/x-ndjson" in request.headers.get("accept", "")
+        if stream:
+            rows = scf_data.iter_mappings(source_framework, targets, source_control)
+            return StreamingResponse(
+                (dumps(row) + b"\n" for row in rows),
+                media_type="application/x-ndjson",
+            )
 
-        mappings = scf_data.map_frameworks(source_framework, target_framework, source_control)
+        if "page_size" in body or body.get("cursor"):
+            query = query_key("map_frameworks", source_framework, targets, source_control)
+            try:
+                offset, page_size = resolve_page(body.get("cursor"), body.get("page_size"), scf_data.fingerprint, query)
+            except CursorError as e:
+                return JSONResponse({"error": "Bad Request", "message": str(e)}, status_code=400)
+            rows, total = await _query_coalesced(
+                scf_data.map_frameworks_page, source_framework, targets, offset, page_size, source_control
+            )
+            payload = {"source_framework": source_framework}
+            if "targets" not in body:
+                # Single-target shape, as returned without paging
+                rows = [
+                    {
+                        "scf_id": row["scf_id"],
+                        "scf_name": row["scf_name"],
+                        "source_controls": row["source_controls"],
+                        "target_controls": row["targets"][target_framework],
+                        "weight": row["weight"],
+                    }
+                    for row in rows
+                ]
+                payload["target_framework"] = target_framework
+            else:
+                payload["targets"] = targets
+            payload.update({
+                "total": total,
+                "count": len(rows),
+                "mappings": rows,
+                "next_cursor": next_cursor(scf_data.fingerprint, query, offset, page_size, total),
+            })
+            return JSONResponse(payload)
+
+        if "targets" not in body:
+            mappings = await _query_coalesced(
+                scf_data.map_frameworks, source_framework, target_framework, source_control
+            )
+            return JSONResponse({
+                "source_framework": source_framework,
+                "target_framework": target_framework,
+                "count": len(mappings),
+                "mappings": mappings
+            })
+
+        mappings = await _query_coalesced(_mapping_rows, source_framework, targets, source_control)
         return JSONResponse({
             "source_framework": source_framework,
-            "target_framework": target_framework,
+            "targets": targets,
             "count": len(mappings),
             "mappings": mappings
         })
@@ -1441,6 +2556,78 @@ async def api_map_frameworks(request):
         return JSONResponse({"error": "Internal Server Error", "message": "An error occurred while mapping frameworks"}, status_code=500)
 
 
+async def api_crosswalk(request):
+    """REST API: Full source -> target crosswalk as a static response.
+
+    Served from build-time artifacts where available (computed once per data
+    version otherwise), gzip-encoded for clients that accept it. The ETag
+    only depends on the data fingerprint, the pair and the content coding,
+    so a revalidation is answered with 304 before any work is done.
+    """
+    source_framework = request.path_params["source_framework"]
+    target_framework = request.path_params["target_framework"]
+    for fw_key in (source_framework, target_framework):
+        if fw_key not in scf_data.frameworks:
+            return JSONResponse({"error": "Not Found", "message": f"Framework {fw_key} not found"}, status_code=404)
+
+    use_gzip = "gzip" in request.headers.get("accept-encoding", "")
+    etag = crosswalk_etag(scf_data.fingerprint, source_framework, target_framework)
+    headers = {
+        "ETag": representation_etag(etag, "gzip" if use_gzip else None),
+        "Cache-Control": "public, no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and matching_etag(if_none_match, etag) is not None:
+        return Response(status_code=304, headers=headers)
+
+    body = crosswalks.get(source_framework, target_framework)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+    else:
+        body = gzip.decompress(body)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def _export_response(request, rows, available_fields, filename):
+    """Stream rows as NDJSON (default) or CSV, with ?fields= selecting columns."""
+    fmt = request.query_params.get("format", "ndjson").lower()
+    try:
+        fields = select_fields(request.query_params.get("fields"), available_fields)
+        chunks = encode_rows(rows, fields, fmt)
+    except ExportError as e:
+        return JSONResponse({"error": "Bad Request", "message": str(e)}, status_code=400)
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
+
+
+async def api_export_framework(request):
+    """REST API: Stream every SCF control mapped to a framework."""
+    framework = request.path_params["framework"]
+    if framework not in scf_data.frameworks:
+        return JSONResponse({"error": "Not Found", "message": f"Framework {framework} not found"}, status_code=404)
+    return _export_response(request, iter_framework_rows(scf_data, framework), FRAMEWORK_FIELDS, framework)
+
+
+async def api_export_crosswalk(request):
+    """REST API: Stream the full source -> target crosswalk."""
+    source_framework = request.path_params["source_framework"]
+    target_framework = request.path_params["target_framework"]
+    for fw_key in (source_framework, target_framework):
+        if fw_key not in scf_data.frameworks:
+            return JSONResponse({"error": "Not Found", "message": f"Framework {fw_key} not found"}, status_code=404)
+    rows = iter_crosswalk_rows(scf_data, source_framework, target_framework)
+    return _export_response(request, rows, CROSSWALK_FIELDS, f"{source_framework}-{target_framework}")
+
+
+async def api_export_catalog(request):
+    """REST API: Stream the entire SCF catalog with framework mappings."""
+    return _export_response(request, iter_catalog_rows(scf_data), CATALOG_FIELDS, "scf-catalog")
+
+
 async def api_root(request):
     """REST API: Root endpoint."""
     return JSONResponse({
@@ -1449,10 +2636,25 @@ async def api_root(request):
         "database": "SCF 2025.4",
         "endpoints": {
             "health": "/health",
-            "search": "POST /api/search",
+            "liveness": "/livez",
+            "readiness": "/readyz",
+            "metrics": "/metrics",
+            "search": "GET or POST /api/search",
             "control": "GET /api/controls/{control_id}",
+            "related_controls": "GET /api/controls/{control_id}/related",
             "frameworks": "GET /api/frameworks",
-            "map": "POST /api/map",
+            "framework_controls": "GET /api/frameworks/{framework}/controls",
+            "framework_domains": "GET /api/frameworks/{framework}/domains",
+            "map": "GET or POST /api/map",
+            "compare": "GET /api/frameworks/{source}/compare/{target}",
+            "closest": "GET /api/frameworks/{framework}/closest",
+            "gap_analysis": "GET or POST /api/gap-analysis",
+            "baselines": "GET /api/baselines",
+            "baseline_delta": "GET /api/baselines/{from}/delta/{to}",
+            "crosswalk": "GET /api/crosswalks/{source}/{target}",
+            "export_framework": "GET /api/export/frameworks/{framework}",
+            "export_crosswalk": "GET /api/export/crosswalk/{source}/{target}",
+            "export_catalog": "GET /api/export/catalog",
             "extract": "POST /api/standards/extract",
             "upload": "GET /standards/upload"
         }
@@ -1542,7 +2744,8 @@ async def api_standards_extract(request: Request):
 
             # Create extractor instance and extract
             extractor = extractor_class()
-            result = extractor.extract(pdf_bytes)
+            with EXTRACTION_DURATION.time(extractor=extractor_class.__name__):
+                result = extractor.extract(pdf_bytes)
 
             # Convert ExtractionResult to dict for JSON serialization
             result_dict = {
@@ -1599,15 +2802,37 @@ async def api_standards_extract(request: Request):
         )
 
 
+def _request_registry(request: Request) -> StandardRegistry:
+    """Get the registry for a request: its tenant's, or the global one.
+
+    Raises:
+        TenantAuthError: If the request carries an unknown API key or tenant
+    """
+    if tenants is None:
+        return registry
+    return tenants.registry_for(tenants.resolve(request.headers))
+
+
 async def mcp_endpoint(request):
     """MCP endpoint - accepts JSON-RPC requests."""
     try:
         # Parse JSON-RPC request
-        body = await request.json()
+        with phase("parse"):
+            body = await request.json()
         method = body.get("method")
         params = body.get("params", {})
         request_id = body.get("id", 1)
 
+        try:
+            request_registry = _request_registry(request)
+        except TenantAuthError as e:
+            response = {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "error": {"code": -32001, "message": f"Unauthorized: {e}"},
+            }
+            return _sse_response(response, status_code=401)
+
         # Handle initialize
         if method == "initialize":
             response = {
@@ -1619,25 +2844,16 @@ async def mcp_endpoint(request):
                     "serverInfo": {"name": "security-controls-mcp", "version": SERVER_VERSION},
                 },
             }
-            return StreamingResponse(
-                iter([f"event: message\ndata: {json.dumps(response)}\n\n"]),
-                media_type="text/event-stream",
-            )
+            return _sse_response(response)
 
         # Handle notifications (no response needed per JSON-RPC)
         elif method == "notifications/initialized":
             response = {"jsonrpc": "2.0", "id": request_id, "result": {}}
-            return StreamingResponse(
-                iter([f"event: message\ndata: {json.dumps(response)}\n\n"]),
-                media_type="text/event-stream",
-            )
+            return _sse_response(response)
 
         # Handle ping
         elif method == "ping":
-            return StreamingResponse(
-                iter([f"event: message\ndata: {json.dumps({'jsonrpc': '2.0', 'id': request_id, 'result': {}})}\n\n"]),
-                media_type="text/event-stream",
-            )
+            return _sse_response({'jsonrpc': '2.0', 'id': request_id, 'result': {}})
 
         # Handle list tools
         elif method == "tools/list":
@@ -1656,28 +2872,23 @@ async def mcp_endpoint(request):
                     ]
                 },
             }
-            return StreamingResponse(
-                iter([f"event: message\ndata: {json.dumps(response)}\n\n"]),
-                media_type="text/event-stream",
-            )
+            return _sse_response(response)
 
         # Handle tool call
         elif method == "tools/call":
             tool_name = params.get("name")
             arguments = params.get("arguments", {})
+            annotate(tool=tool_name)
 
-            # Call the tool
-            result = await call_tool(tool_name, arguments)
+            # Call the tool with the caller's paid standards only
+            result = await _call_tool_coalesced(tool_name, arguments, request_registry)
 
             response = {
                 "jsonrpc": "2.0",
                 "id": request_id,
                 "result": {"content": [{"type": "text", "text": item.text} for item in result]},
             }
-            return StreamingResponse(
-                iter([f"event: message\ndata: {json.dumps(response)}\n\n"]),
-                media_type="text/event-stream",
-            )
+            return _sse_response(response)
 
         else:
             # Unknown method
@@ -1686,10 +2897,7 @@ async def mcp_endpoint(request):
                 "id": request_id,
                 "error": {"code": -32601, "message": f"Method not found: {method}"},
             }
-            return StreamingResponse(
-                iter([f"event: message\ndata: {json.dumps(response)}\n\n"]),
-                media_type="text/event-stream",
-            )
+            return _sse_response(response)
 
     except Exception as e:
         # Error response
@@ -1699,26 +2907,154 @@ async def mcp_endpoint(request):
             "id": 1,
             "error": {"code": -32603, "message": "Internal server error"},
         }
-        return StreamingResponse(
-            iter([f"event: message\ndata: {json.dumps(response)}\n\n"]),
-            media_type="text/event-stream",
-            status_code=500,
-        )
+        return _sse_response(response, status_code=500)
+
+
+async def metrics_endpoint(request):
+    """Prometheus metrics of this process."""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+# Per-client rate limits and the global concurrency cap (see admission)
+rate_limiter, concurrency_limiter = limiters_from_env()
+REGISTRY.add_collector(lambda: admission_families(rate_limiter, concurrency_limiter))
+
+register_cache("compression", compression_cache.stats)
+register_cache("crosswalks", crosswalks.stats)
+if tenants is not None:
+    register_cache("providers", tenants.provider_cache.stats)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Watch for imported standards while the server is running."""
+    if tenants is not None:
+        tenants.start()
+        try:
+            yield
+        finally:
+            await tenants.stop()
+        return
+
+    watcher = StandardsWatcher(registry)
+    watcher.start()
+    try:
+        yield
+    finally:
+        await watcher.stop()
+
+
+# Health checks: never rate-limited or queued behind other requests
+PROBE_PATHS = ("/health", "/livez", "/readyz")
+
+# Cache-Control of responses that only change with the SCF data
+CACHE_CONTROL = cache_control(max_age_from_env())
+
+
+def _depends_only_on_data(path: str) -> bool:
+    """Whether GET responses for a path depend only on the SCF data and the URL.
+
+    True for the API root and REST endpoints; standards endpoints depend on
+    the caller.
+    """
+    return path == "/" or (path.startswith("/api/") and not path.startswith("/api/standards/"))
+
+
+def _compression_cache_key(scope):
+    """Cache key for complete GET responses that depend only on the SCF data and URL."""
+    path = scope["path"]
+    # Exports are streamed, so there is no complete body to keep
+    if scope["method"] != "GET" or not _depends_only_on_data(path):
+        return None
+    if path.startswith("/api/export/"):
+        return None
+    key = f"{scf_data.fingerprint}:{path}?{scope['query_string'].decode('latin-1')}"
+    variant = _accept_variant(scope)
+    return f"{key}#{variant}" if variant else key
+
+
+def _accept_variant(scope):
+    """Representation negotiated from the Accept header, "" where there is no choice.
+
+    /api/map answers Accept: application/x-ndjson with NDJSON instead of JSON.
+    """
+    if scope["path"] != "/api/map":
+        return ""
+    accept = Headers(scope=scope).get("accept", "")
+    return "ndjson" if "application/x-ndjson" in accept else ""
+
+
+def _http_vary(scope):
+    """Request headers, besides Accept-Encoding, that select the representation."""
+    return ("accept",) if scope["path"] == "/api/map" else ()
+
+
+def _http_cache_rule(scope):
+    """(ETag, Cache-Control) for GET requests served from the SCF data alone."""
+    path = scope["path"]
+    if path in ("/livez", "/readyz"):
+        return None
+    if path == "/health":
+        # The body carries a timestamp, so only a weak validator
+        return f'W/"{DATA_FINGERPRINT}-health"', "no-cache"
+    # Crosswalks set their own ETag
+    if not _depends_only_on_data(path) or path.startswith("/api/crosswalks/"):
+        return None
+    etag = request_etag(scf_data.fingerprint, path, scope["query_string"], _accept_variant(scope))
+    return etag, CACHE_CONTROL
+
+
+def _timing_middleware():
+    """Server-Timing middleware, only installed when enabled (see timing)."""
+    header, log = server_timing_from_env(), timing_log_from_env()
+    if not (header or log):
+        return []
+    return [Middleware(ServerTimingMiddleware, header=header, log=log)]
 
 
 # Starlette app - serves both MCP and REST API
 app = Starlette(
+    lifespan=lifespan,
+    middleware=[
+        Middleware(MetricsMiddleware),
+        Middleware(
+            AdmissionMiddleware,
+            rate_limiter=rate_limiter,
+            concurrency=concurrency_limiter,
+            exempt_paths=PROBE_PATHS + ("/metrics",),
+        ),
+        *_timing_middleware(),
+        Middleware(ConditionalGetMiddleware, cache_rule=_http_cache_rule, vary=_http_vary),
+        Middleware(
+            CompressionMiddleware, cache_key=_compression_cache_key, cache=compression_cache
+        ),
+    ],
     routes=[
         # Health & root
         Route("/health", health_check),
+        Route("/livez", liveness_probe),
+        Route("/readyz", readiness_probe),
         Route("/", api_root),
+        Route("/metrics", metrics_endpoint),
         # MCP protocol endpoint
         Route("/mcp", mcp_endpoint, methods=["POST"]),
         # REST API endpoints
-        Route("/api/search", api_search_controls, methods=["POST"]),
+        Route("/api/search", api_search_controls, methods=["GET", "POST"]),
         Route("/api/controls/{control_id}", api_get_control),
+        Route("/api/controls/{control_id}/related", api_related_controls),
         Route("/api/frameworks", api_list_frameworks),
-        Route("/api/map", api_map_frameworks, methods=["POST"]),
+        Route("/api/frameworks/{framework}/controls", api_framework_controls),
+        Route("/api/frameworks/{framework}/domains", api_framework_domains),
+        Route("/api/frameworks/{framework}/closest", api_closest_frameworks),
+        Route("/api/frameworks/{source_framework}/compare/{target_framework}", api_compare_frameworks),
+        Route("/api/map", api_map_frameworks, methods=["GET", "POST"]),
+        Route("/api/gap-analysis", api_gap_analysis, methods=["GET", "POST"]),
+        Route("/api/baselines", api_baselines),
+        Route("/api/baselines/{from_framework}/delta/{to_framework}", api_baseline_delta),
+        Route("/api/crosswalks/{source_framework}/{target_framework}", api_crosswalk),
+        Route("/api/export/frameworks/{framework}", api_export_framework),
+        Route("/api/export/crosswalk/{source_framework}/{target_framework}", api_export_crosswalk),
+        Route("/api/export/catalog", api_export_catalog),
         # Standards import web UI
         Route("/standards/upload", standards_upload_page),
         Route("/api/standards/extract", api_standards_extract, methods=["POST"]),
@@ -1726,26 +3062,85 @@ app = Starlette(
 )
 
 
-def main():
+def _serve_worker(sock, limit_max_requests):
+    """Run uvicorn in a forked worker on the supervisor's socket."""
+    config = uvicorn.Config(app, log_level="info", limit_max_requests=limit_max_requests)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def main(argv=None):
     """Start HTTP server."""
+    parser = argparse.ArgumentParser(description="Security Controls MCP HTTP server")
+    parser.add_argument("--host", default="0.0.0.0", help="Interface to bind (default 0.0.0.0)")
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=int(os.getenv("PORT", "3000")),
+        help="Port (default: $PORT, 3000)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=workers_from_env(),
+        help="Worker processes forked after the data is loaded "
+        "(default: $SECURITY_CONTROLS_MCP_WORKERS, 1)",
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=max_requests_from_env(),
+        help="Recycle a worker after this many requests, 0 = never "
+        "(default: $SECURITY_CONTROLS_MCP_MAX_REQUESTS, 0)",
+    )
+    parser.add_argument(
+        "--max-requests-jitter",
+        type=int,
+        default=max_requests_jitter_from_env(),
+        help="Random extra requests per worker before recycling "
+        "(default: $SECURITY_CONTROLS_MCP_MAX_REQUESTS_JITTER, 0)",
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=float,
+        default=graceful_timeout_from_env(),
+        help="Seconds stopping workers get to finish requests "
+        "(default: $SECURITY_CONTROLS_MCP_GRACEFUL_TIMEOUT, 30)",
+    )
+    args = parser.parse_args(argv)
+
     # Display legal notice on startup
     print_legal_notice()
 
-    # Get port from environment
-    port = int(os.getenv("PORT", "3000"))
-
-    print(f"\n✓ Security Controls MCP HTTP server starting on port {port}")
+    prefork = (args.workers > 1 or args.max_requests > 0) and hasattr(os, "fork")
+    workers = args.workers if prefork else 1
+    print(f"\n✓ Security Controls MCP HTTP server starting on port {args.port}")
+    print(f"✓ Workers: {workers}")
     print(
         f"✓ Loaded {len(scf_data.controls)} controls across {len(scf_data.frameworks)} frameworks\n"
     )
 
-    # Run server
-    uvicorn.run(
-        app,
-        host="0.0.0.0",
-        port=port,
-        log_level="info",
+    if not prefork:
+        if args.workers > 1:
+            logger.warning("os.fork is not available, running a single worker")
+        uvicorn.run(
+            app,
+            host=args.host,
+            port=args.port,
+            log_level="info",
+        )
+        return
+
+    # Load everything the workers share before forking them
+    scf_data.preload_indexes()
+    sock = uvicorn.Config(app, host=args.host, port=args.port).bind_socket()
+    supervisor = PreforkSupervisor(
+        _serve_worker,
+        workers,
+        max_requests=args.max_requests,
+        max_requests_jitter=args.max_requests_jitter,
+        graceful_timeout=args.graceful_timeout,
     )
+    sys.exit(supervisor.run(sock))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,74 @@
+"""Fast JSON encoding for HTTP and MCP responses.
+
+Uses orjson or msgspec when installed and falls back to the standard
+library. Every backend produces compact UTF-8 JSON, like Starlette's
+JSONResponse. SECURITY_CONTROLS_MCP_JSON_BACKEND=orjson|msgspec|json forces a
+backend; one that is not installed falls back to the next available.
+"""
+
+import json
+import logging
+import os
+from functools import partial
+from typing import Any, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# In order of preference
+BACKENDS = ("orjson", "msgspec", "json")
+
+Backend = Tuple[str, Callable[[Any], bytes], Callable[[Any], Any]]
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _load_backend(name: str) -> Optional[Backend]:
+    """(name, dumps, loads) for a backend, or None if it is not installed."""
+    if name == "orjson":
+        try:
+            import orjson
+        except ImportError:
+            return None
+        return name, partial(orjson.dumps, option=orjson.OPT_NON_STR_KEYS), orjson.loads
+    if name == "msgspec":
+        try:
+            import msgspec.json
+        except ImportError:
+            return None
+        return name, msgspec.json.Encoder().encode, msgspec.json.decode
+    if name == "json":
+        return name, _stdlib_dumps, json.loads
+    raise ValueError(f"Unknown JSON backend '{name}'. Use one of: {', '.join(BACKENDS)}")
+
+
+def select_backend(preferred: Optional[str] = None) -> Backend:
+    """The preferred backend if installed, else the first available one."""
+    if preferred:
+        try:
+            backend = _load_backend(preferred)
+        except ValueError as e:
+            logger.warning(f"{e}, using default")
+        else:
+            if backend is not None:
+                return backend
+            logger.warning(f"JSON backend '{preferred}' is not installed, using default")
+    for name in BACKENDS:
+        backend = _load_backend(name)
+        if backend is not None:
+            return backend
+    raise AssertionError("the json backend is always available")
+
+
+BACKEND, dumps, loads = select_backend(os.getenv("SECURITY_CONTROLS_MCP_JSON_BACKEND"))
+
+
+def dumps_text(obj: Any) -> str:
+    """dumps() as str, for callers that build text (e.g. CSV/NDJSON exports)."""
+    return dumps(obj).decode("utf-8")
+
+
+def sse_message(obj: Any) -> bytes:
+    """One Server-Sent Events "message" event carrying obj as JSON."""
+    return b"event: message\ndata: " + dumps(obj) + b"\n\n"
@@ -0,0 +1,439 @@
+"""In-process metrics in the Prometheus text exposition format.
+
+A small registry of counters and histograms, plus collectors read at
+scrape time (cache hit ratios, executor queue depth). The HTTP server
+serves it at /metrics; the stdio server writes it to stderr (or
+SECURITY_CONTROLS_MCP_METRICS_FILE) on SIGUSR1. No client library or agent
+is needed.
+
+Each process keeps its own registry: with --workers N, a scrape of
+/metrics reports the worker that served it.
+"""
+
+import logging
+import math
+import os
+import signal
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "security_controls_mcp_"
+
+# Seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+# Seconds, for slow jobs (PDF extraction, standards reload)
+JOB_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+# (name, type, help, [(labels, value)]) of one metric family
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """A metric family with a fixed set of label names."""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} takes labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _labels(self, key: LabelValues) -> Dict[str, str]:
+        return dict(zip(self.label_names, key))
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Label values -> [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of a block, in seconds (also when it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted(
+                (key, (list(counts), total[0])) for key, (counts, total) in self._series.items()
+            )
+        lines = []
+        for key, (counts, total) in series:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Metrics of one process, rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], List[Family]]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(PREFIX + name, documentation, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(PREFIX + name, documentation, label_names, buckets))
+
+    def add_collector(self, collector: Callable[[], List[Family]]) -> None:
+        """Add a function returning metric families read at scrape time."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                logger.warning(f"Metrics collector failed: {e}")
+                continue
+            for name, kind, documentation, samples in families:
+                lines.append(f"# HELP {PREFIX}{name} {documentation}")
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+                lines.extend(
+                    f"{PREFIX}{name}{_format_labels(labels)} {_format_value(value)}"
+                    for labels, value in samples
+                )
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+TOOL_CALLS = REGISTRY.counter("tool_calls_total", "MCP tool calls.", ("tool", "status"))
+TOOL_DURATION = REGISTRY.histogram(
+    "tool_duration_seconds", "MCP tool call latency in seconds.", ("tool",)
+)
+TOOL_RESPONSE_BYTES = REGISTRY.histogram(
+    "tool_response_bytes", "UTF-8 size of MCP tool results.", ("tool",), SIZE_BUCKETS
+)
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "HTTP requests by route template.", ("method", "route", "status")
+)
+HTTP_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency in seconds, until the last body byte is sent.",
+    ("method", "route"),
+)
+HTTP_RESPONSE_BYTES = REGISTRY.histogram(
+    "http_response_bytes", "HTTP response body size as sent.", ("route",), SIZE_BUCKETS
+)
+EXTRACTION_DURATION = REGISTRY.histogram(
+    "extraction_duration_seconds",
+    "Duration of PDF standard extraction jobs in seconds.",
+    ("extractor",),
+    JOB_BUCKETS,
+)
+SINGLE_FLIGHT_REQUESTS = REGISTRY.counter(
+    "single_flight_requests_total",
+    "Coalescable requests: leaders computed, followers awaited a leader's result.",
+    ("flight", "role"),
+)
+STANDARDS_RELOAD_DURATION = REGISTRY.histogram(
+    "standards_reload_duration_seconds",
+    "Duration of loading new or changed paid standards in seconds.",
+    (),
+    JOB_BUCKETS,
+)
+
+# Name -> stats() of caches with hits and misses counts
+_caches: Dict[str, Callable[[], Dict[str, int]]] = {}
+
+
+def register_cache(name: str, stats: Callable[[], Dict[str, int]]) -> None:
+    """Report a cache's hits, misses and hit ratio from its stats() dict."""
+    _caches[name] = stats
+
+
+def _cache_families() -> List[Family]:
+    hits, misses, ratios = [], [], []
+    for name, stats in sorted(_caches.items()):
+        values = stats()
+        labels = {"cache": name}
+        hits.append((labels, values["hits"]))
+        misses.append((labels, values["misses"]))
+        lookups = values["hits"] + values["misses"]
+        ratios.append((labels, values["hits"] / lookups if lookups else 0.0))
+    return [
+        ("cache_hits_total", "counter", "Cache lookups served from the cache.", hits),
+        ("cache_misses_total", "counter", "Cache lookups that missed.", misses),
+        ("cache_hit_ratio", "gauge", "Cache hits / lookups since start.", ratios),
+    ]
+
+
+def _executor_families() -> List[Family]:
+    """Worker thread pool used for blocking work (sync iterators, large compressions)."""
+    import anyio.to_thread
+
+    try:
+        statistics = anyio.to_thread.current_default_thread_limiter().statistics()
+    except RuntimeError:
+        # Not called from an event loop
+        return []
+    return [
+        (
+            "executor_threads_busy",
+            "gauge",
+            "Worker threads running blocking calls.",
+            [({}, statistics.borrowed_tokens)],
+        ),
+        (
+            "executor_threads_max",
+            "gauge",
+            "Worker thread limit.",
+            [({}, statistics.total_tokens)],
+        ),
+        (
+            "executor_queue_depth",
+            "gauge",
+            "Blocking calls waiting for a worker thread.",
+            [({}, statistics.tasks_waiting)],
+        ),
+    ]
+
+
+REGISTRY.add_collector(_cache_families)
+REGISTRY.add_collector(_executor_families)
+
+
+def _result_bytes(result) -> int:
+    return sum(len(getattr(item, "text", "").encode("utf-8")) for item in result or ())
+
+
+def instrument_tool(func):
+    """Count, time and size the results of an MCP call_tool handler."""
+
+    @wraps(func)
+    async def wrapper(name: str, arguments: dict):
+        start = time.perf_counter()
+        try:
+            result = await func(name, arguments)
+        except Exception as e:
+            # Keep client-supplied names of unknown tools out of the labels
+            tool = "unknown" if str(e).startswith("Unknown tool") else name
+            TOOL_CALLS.inc(tool=tool, status="error")
+            TOOL_DURATION.observe(time.perf_counter() - start, tool=tool)
+            raise
+        TOOL_CALLS.inc(tool=name, status="ok")
+        TOOL_DURATION.observe(time.perf_counter() - start, tool=name)
+        TOOL_RESPONSE_BYTES.observe(_result_bytes(result), tool=name)
+        return result
+
+    return wrapper
+
+
+def _route_template(scope: Scope) -> str:
+    """Path template of the route serving a request, or "unmatched"."""
+    route = scope.get("route")
+    if route is None:
+        # Answered by a middleware (304, cached body) before routing
+        for candidate in getattr(scope.get("app"), "routes", ()):
+            if candidate.matches(scope)[0] == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", "unmatched")
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route request counts, latency and body bytes.
+
+    Routes are labelled by their template (e.g. /api/controls/{control_id}),
+    so the label set stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_and_measure(message: Message) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_measure)
+        finally:
+            route = _route_template(scope)
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method=method, route=route, status=str(status))
+            HTTP_DURATION.observe(time.perf_counter() - start, method=method, route=route)
+            HTTP_RESPONSE_BYTES.observe(size, route=route)
+
+
+def dump_metrics(path: Optional[str] = None) -> None:
+    """Write the metrics to a file (replacing it) or, without a path, to stderr."""
+    text = REGISTRY.render()
+    if path:
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    else:
+        sys.stderr.write(text)
+        sys.stderr.flush()
+
+
+def install_dump_handler(loop) -> bool:
+    """Dump the metrics on SIGUSR1 (to SECURITY_CONTROLS_MCP_METRICS_FILE or stderr).
+
+    Returns:
+        False where SIGUSR1 is not available (Windows)
+    """
+    if not hasattr(signal, "SIGUSR1"):
+        return False
+    path = os.getenv("SECURITY_CONTROLS_MCP_METRICS_FILE")
+
+    async def dump():
+        # Runs as a task so the executor collector sees the event loop
+        try:
+            dump_metrics(path)
+        except OSError as e:
+            logger.error(f"Could not write metrics: {e}")
+
+    loop.add_signal_handler(signal.SIGUSR1, lambda: loop.create_task(dump()))
+    return True
@@ -0,0 +1,92 @@
+"""Opaque cursors for paging through large tool and REST results.
+
+A cursor encodes the data fingerprint, a hash of the query it belongs to and
+the offset of the next page. Cursors from another query, or issued before the
+data changed, are rejected rather than silently returning shifted pages.
+"""
+
+import base64
+import hashlib
+import json
+from typing import Any, Optional, Tuple
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class CursorError(ValueError):
+    """Raised when a cursor is malformed, stale or belongs to another query."""
+
+
+def query_key(*parts: Any) -> str:
+    """Stable short hash identifying a query (tool name and its arguments)."""
+    raw = json.dumps(parts, separators=(",", ":"), sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(fingerprint: str, query: str, offset: int) -> str:
+    """Encode a cursor pointing at offset within a query's ordered results."""
+    raw = json.dumps([fingerprint, query, offset], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, fingerprint: str, query: str) -> int:
+    """Decode a cursor into an offset.
+
+    Raises:
+        CursorError: If the cursor is malformed, was issued for different data,
+            or belongs to a different query
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_fingerprint, cursor_query, offset = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise CursorError("Invalid cursor") from None
+
+    if cursor_fingerprint != fingerprint:
+        raise CursorError("Cursor expired: the data has changed, start again from the first page")
+    if cursor_query != query:
+        raise CursorError("Cursor belongs to a different query")
+    if not isinstance(offset, int) or offset < 0:
+        raise CursorError("Invalid cursor")
+    return offset
+
+
+def parse_page_size(value: Any, default: int = DEFAULT_PAGE_SIZE) -> int:
+    """Clamp a requested page size to 1..MAX_PAGE_SIZE."""
+    try:
+        return min(max(int(value), 1), MAX_PAGE_SIZE)
+    except (ValueError, TypeError):
+        return default
+
+
+def resolve_page(
+    cursor: Optional[str], page_size: Any, fingerprint: str, query: str
+) -> Tuple[int, int]:
+    """Get (offset, page size) for a request.
+
+    Raises:
+        CursorError: If the cursor is not valid for this query and data
+    """
+    offset = decode_cursor(cursor, fingerprint, query) if cursor else 0
+    size = DEFAULT_PAGE_SIZE if page_size is None else parse_page_size(page_size)
+    return offset, size
+
+
+def next_cursor(
+    fingerprint: str, query: str, offset: int, page_size: int, total: int
+) -> Optional[str]:
+    """Cursor for the page after [offset, offset + page_size), or None at the end."""
+    end = offset + page_size
+    return encode_cursor(fingerprint, query, end) if end < total else None
+
+
+def format_page_footer(offset: int, count: int, total: int, cursor: Optional[str]) -> str:
+    """Markdown footer for a paged tool response."""
+    if count:
+        text = f"\n*Showing {offset + 1}-{offset + count} of {total}*\n"
+    else:
+        text = f"\n*No more results ({total} in total)*\n"
+    if cursor:
+        text += f"**Next cursor:** `{cursor}`\n"
+    return text
@@ -0,0 +1,239 @@
+"""Pre-fork multi-worker serving for the HTTP server.
+
+The parent process loads SCFData, the standards registries and every lazy
+index once, binds the listening socket, freezes the garbage collector and
+then forks the workers. Workers inherit the loaded data as copy-on-write
+pages; gc.freeze() moves the preloaded objects out of the collector's
+generations so collections in a worker do not write to (and so copy) them.
+
+The parent only supervises:
+- a worker that exits (crash, or recycling after max_requests) is replaced;
+  one that fails right after starting is replaced after a short backoff,
+  scheduled so the supervisor loop never blocks
+- SIGHUP replaces every worker, one replacement forked before each old
+  worker is asked to stop, so the socket keeps being served
+- SIGTERM / SIGINT stop the workers gracefully, then kill any still running
+  after the graceful timeout
+"""
+
+import gc
+import logging
+import os
+import random
+import signal
+import socket
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GRACEFUL_TIMEOUT = 30.0
+
+# Seconds a worker must stay up before a failed exit is respawned immediately;
+# otherwise its replacement is forked this long after the exit
+MIN_WORKER_UPTIME = 1.0
+
+# Serves requests on the socket until told to stop; the second argument is
+# the number of requests after which the worker should exit (None: never)
+ServeFunc = Callable[[socket.socket, Optional[int]], None]
+
+
+def _number_from_env(name: str, default: float, parse: Callable[[str], float]) -> float:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return max(parse(value), 0)
+    except ValueError:
+        logger.warning(f"Invalid {name} '{value}', using default")
+        return default
+
+
+def workers_from_env() -> int:
+    """Number of workers from SECURITY_CONTROLS_MCP_WORKERS ("auto" = CPU count)."""
+    if os.getenv("SECURITY_CONTROLS_MCP_WORKERS", "").strip().lower() == "auto":
+        return os.cpu_count() or 1
+    return max(int(_number_from_env("SECURITY_CONTROLS_MCP_WORKERS", 1, int)), 1)
+
+
+def max_requests_from_env() -> int:
+    """Requests per worker before it is recycled (0 = never)."""
+    return int(_number_from_env("SECURITY_CONTROLS_MCP_MAX_REQUESTS", 0, int))
+
+
+def max_requests_jitter_from_env() -> int:
+    """Random extra requests per worker, so workers do not all recycle at once."""
+    return int(_number_from_env("SECURITY_CONTROLS_MCP_MAX_REQUESTS_JITTER", 0, int))
+
+
+def graceful_timeout_from_env() -> float:
+    """Seconds a stopping worker gets to finish in-flight requests."""
+    return _number_from_env(
+        "SECURITY_CONTROLS_MCP_GRACEFUL_TIMEOUT", DEFAULT_GRACEFUL_TIMEOUT, float
+    )
+
+
+class PreforkSupervisor:
+    """Forks and supervises workers serving a shared listening socket."""
+
+    def __init__(
+        self,
+        serve: ServeFunc,
+        workers: int,
+        max_requests: int = 0,
+        max_requests_jitter: int = 0,
+        graceful_timeout: float = DEFAULT_GRACEFUL_TIMEOUT,
+    ):
+        """Initialize the supervisor.
+
+        Args:
+            serve: Runs a worker's server on the socket (called in the worker)
+            workers: Number of worker processes
+            max_requests: Requests after which a worker is recycled (0 = never)
+            max_requests_jitter: Random extra requests added to max_requests
+                per worker
+            graceful_timeout: Seconds stopping workers get before SIGKILL
+        """
+        self.serve = serve
+        self.workers = max(workers, 1)
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        # Worker PID -> start time (monotonic)
+        self._workers: Dict[int, float] = {}
+        # PIDs asked to stop during a rolling restart, not to be replaced
+        self._retiring: Set[int] = set()
+        # Monotonic times at which replacements for failed workers are due
+        self._respawns: List[float] = []
+        self._signals: List[int] = []
+
+    def _on_signal(self, signum, frame):
+        self._signals.append(signum)
+
+    def _worker_limit(self) -> Optional[int]:
+        if not self.max_requests:
+            return None
+        return self.max_requests + random.randint(0, self.max_requests_jitter)
+
+    def _spawn(self, sock: socket.socket) -> int:
+        limit = self._worker_limit()
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+                    signal.signal(signum, signal.SIG_DFL)
+                self.serve(sock, limit)
+            except BaseException:
+                logger.exception("Worker failed")
+                code = 1
+            finally:
+                # Never return into the parent's code (or run its atexit hooks)
+                os._exit(code)
+
+        self._workers[pid] = time.monotonic()
+        logger.info(f"Started worker {pid}")
+        return pid
+
+    def _reap(self, sock: Optional[socket.socket]) -> None:
+        """Collect exited workers and, if sock is given, replace them."""
+        while self._workers or self._retiring:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            if pid in self._retiring:
+                self._retiring.discard(pid)
+                continue
+            started = self._workers.pop(pid, None)
+            if started is None:
+                continue
+
+            code = os.waitstatus_to_exitcode(status)
+            if code == 0:
+                logger.info(f"Worker {pid} exited")
+            else:
+                logger.warning(f"Worker {pid} exited with status {code}")
+            if sock is None:
+                continue
+            now = time.monotonic()
+            if code != 0 and now - started < MIN_WORKER_UPTIME:
+                # Back off so a worker failing at startup does not spin, without
+                # blocking the loop that handles signals and other workers
+                self._respawns.append(now + MIN_WORKER_UPTIME)
+            else:
+                self._spawn(sock)
+
+    def _spawn_due(self, sock: socket.socket) -> None:
+        """Fork the replacements whose backoff has elapsed."""
+        now = time.monotonic()
+        due = [at for at in self._respawns if at <= now]
+        if due:
+            self._respawns = [at for at in self._respawns if at > now]
+            for _ in due:
+                self._spawn(sock)
+
+    def _rolling_restart(self, sock: socket.socket) -> None:
+        logger.info("Restarting workers")
+        for pid in list(self._workers):
+            self._spawn(sock)
+            self._stop_worker(pid)
+
+    def _stop_worker(self, pid: int) -> None:
+        self._workers.pop(pid, None)
+        self._retiring.add(pid)
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            self._retiring.discard(pid)
+
+    def _shutdown(self) -> None:
+        self._respawns.clear()
+        for pid in list(self._workers):
+            self._stop_worker(pid)
+
+        deadline = time.monotonic() + self.graceful_timeout
+        while self._retiring and time.monotonic() < deadline:
+            self._reap(None)
+            time.sleep(0.05)
+
+        for pid in list(self._retiring):
+            logger.warning(f"Killing worker {pid} after graceful timeout")
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+        self._retiring.clear()
+
+    def run(self, sock: socket.socket) -> int:
+        """Fork the workers and supervise them until SIGTERM or SIGINT.
+
+        Call after everything the workers should share has been loaded.
+
+        Returns:
+            Exit code for the parent process
+        """
+        gc.collect()
+        gc.freeze()
+
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(signum, self._on_signal)
+        logger.info(f"Supervisor {os.getpid()} starting {self.workers} workers")
+        for _ in range(self.workers):
+            self._spawn(sock)
+
+        while True:
+            self._reap(sock)
+            self._spawn_due(sock)
+            while self._signals:
+                signum = self._signals.pop(0)
+                if signum == signal.SIGHUP:
+                    self._rolling_restart(sock)
+                else:
+                    logger.info("Stopping workers")
+                    self._shutdown()
+                    return 0
+            time.sleep(0.1)
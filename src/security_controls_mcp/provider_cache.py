@@ -0,0 +1,240 @@
+"""Shared, memory-bounded cache of paid standard providers.
+
+Several registries (one per tenant in HTTP mode) can share one cache.
+Providers are keyed by a hash of the standard's file contents, so the same
+licensed file imported by two tenants is loaded once. Registries hold
+lightweight proxies that only keep metadata and clause IDs; the loaded
+provider behind a proxy can be evicted and is reloaded on next use, which
+keeps resident memory under the configured budget.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .providers import PaidStandardProvider, SearchResult, StandardMetadata, StandardProvider
+from .storage import COMPACT_BLOB_SUFFIX
+from .timing import timed_phase
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+
+
+def cache_bytes_from_env() -> int:
+    """Get the provider cache budget in bytes from the environment."""
+    value = os.getenv("SECURITY_CONTROLS_MCP_PROVIDER_CACHE_BYTES")
+    if value is None:
+        return DEFAULT_CACHE_BYTES
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        logger.warning(
+            f"Invalid SECURITY_CONTROLS_MCP_PROVIDER_CACHE_BYTES '{value}', using default"
+        )
+        return DEFAULT_CACHE_BYTES
+
+
+def _standard_files(standard_path: Path) -> List[Path]:
+    return sorted(p for p in standard_path.iterdir() if p.is_file() and not p.name.startswith("."))
+
+
+def estimate_resident_bytes(standard_path: Path) -> int:
+    """Estimate the memory a loaded provider holds.
+
+    Counts the files parsed into memory. The compact content blob is
+    memory-mapped (reclaimable page cache), so it is not counted.
+    """
+    return sum(
+        path.stat().st_size
+        for path in _standard_files(standard_path)
+        if path.suffix != COMPACT_BLOB_SUFFIX
+    )
+
+
+class _Entry:
+    """A loaded provider and its estimated size."""
+
+    def __init__(self, provider: PaidStandardProvider, size: int):
+        self.provider = provider
+        self.size = size
+
+
+class ProviderCache:
+    """LRU cache of loaded providers bounded by estimated resident bytes."""
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget in bytes. If None, read from environment.
+                The most recently used provider is always kept, even if it
+                alone exceeds the budget.
+        """
+        self.max_bytes = cache_bytes_from_env() if max_bytes is None else max_bytes
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # Content key -> (metadata, clause IDs), kept after eviction so proxies stay cheap
+        self._catalog: Dict[str, Tuple[StandardMetadata, List[str]]] = {}
+        # File signature -> content key, so unchanged files are not re-hashed.
+        # Pruned to resident providers on eviction.
+        self._keys: Dict[Tuple, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(standard_path: Path) -> Tuple:
+        signature = [str(standard_path.resolve())]
+        for path in _standard_files(standard_path):
+            stat = path.stat()
+            signature.append((path.name, stat.st_size, stat.st_mtime_ns))
+        return tuple(signature)
+
+    def content_key(self, standard_path: Path) -> str:
+        """SHA-256 over a standard's file names and contents.
+
+        Identical imports in different directories get the same key.
+        """
+        signature = self._signature(standard_path)
+        key = self._keys.get(signature)
+        if key is not None:
+            return key
+
+        digest = hashlib.sha256()
+        for path in _standard_files(standard_path):
+            digest.update(path.name.encode("utf-8") + b"\0")
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            digest.update(b"\0")
+        key = digest.hexdigest()
+
+        with self._lock:
+            self._keys[signature] = key
+        return key
+
+    def provider(self, standard_path: Path) -> "CachedStandardProvider":
+        """Get a proxy for the standard at standard_path, loading it if needed.
+
+        Raises:
+            FileNotFoundError, ValueError: If the standard cannot be loaded
+        """
+        key = self.content_key(standard_path)
+        provider = self.get(key, standard_path)
+        if self.content_key(standard_path) != key:
+            raise ValueError(f"Standard files changed while loading: {standard_path}")
+        with self._lock:
+            if key not in self._catalog:
+                self._catalog[key] = (provider.get_metadata(), provider.list_clause_ids())
+            metadata, clause_ids = self._catalog[key]
+        return CachedStandardProvider(self, key, standard_path, metadata, clause_ids)
+
+    def get(self, key: str, standard_path: Path) -> PaidStandardProvider:
+        """Get the loaded provider for a content key, loading from standard_path on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.provider
+            self.misses += 1
+
+        # Load outside the lock; a concurrent load of the same key is harmless.
+        # The files may have changed since the key was computed (a re-import
+        # not yet picked up by hot reload). Never cache them under the old
+        # key, which other registries may share.
+        provider = PaidStandardProvider(standard_path)
+        size = estimate_resident_bytes(standard_path)
+        if self.content_key(standard_path) != key:
+            return provider
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry(provider, size)
+                self._entries[key] = entry
+                self.resident_bytes += size
+            self._entries.move_to_end(key)
+            self._evict()
+            return entry.provider
+
+    def _evict(self) -> None:
+        """Drop least recently used providers until within budget (lock held)."""
+        evicted = False
+        while self.resident_bytes > self.max_bytes and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            self.resident_bytes -= entry.size
+            self.evictions += 1
+            evicted = True
+        if evicted:
+            self._keys = {sig: key for sig, key in self._keys.items() if key in self._entries}
+
+    def stats(self) -> Dict[str, int]:
+        """Cache statistics."""
+        with self._lock:
+            return {
+                "providers": len(self._entries),
+                "resident_bytes": self.resident_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class CachedStandardProvider(StandardProvider):
+    """Proxy that resolves its provider through a ProviderCache on each call."""
+
+    def __init__(
+        self,
+        cache: ProviderCache,
+        key: str,
+        standard_path: Path,
+        metadata: StandardMetadata,
+        clause_ids: List[str],
+    ):
+        """Initialize the proxy.
+
+        Args:
+            cache: The shared cache
+            key: Content key of the standard
+            standard_path: Directory to reload from after eviction
+            metadata: Metadata of the standard
+            clause_ids: Clause IDs of the standard
+        """
+        self.cache = cache
+        self.key = key
+        self.standard_path = standard_path
+        self.metadata = metadata
+        self._clause_ids = clause_ids
+
+    def _provider(self) -> PaidStandardProvider:
+        return self.cache.get(self.key, self.standard_path)
+
+    def get_metadata(self) -> StandardMetadata:
+        """Get metadata about this standard."""
+        return self.metadata
+
+    def list_clause_ids(self) -> List[str]:
+        """List clause IDs without loading the provider."""
+        return list(self._clause_ids)
+
+    @timed_phase("enrichment")
+    def search(self, query: str, limit: int = 10) -> List[SearchResult]:
+        """Search for content within the standard."""
+        return self._provider().search(query, limit)
+
+    @timed_phase("enrichment")
+    def get_clause(self, clause_id: str) -> Optional[SearchResult]:
+        """Get a specific clause by ID."""
+        return self._provider().get_clause(clause_id)
+
+    def get_all_clauses(self) -> List[SearchResult]:
+        """Get all clauses in the standard."""
+        return self._provider().get_all_clauses()
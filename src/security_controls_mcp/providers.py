@@ -5,6 +5,14 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from .storage import (
+    FULL_TEXT_FILE,
+    CompactClauseStore,
+    flatten_clauses,
+    has_compact_format,
+)
+from .timing import timed_phase
+
 
 class StandardMetadata:
     """Metadata about a security standard."""
@@ -85,160 +93,140 @@ class StandardProvider(ABC):
         """
         pass
 
+    def list_clause_ids(self) -> List[str]:
+        """List the IDs of all clauses in the standard.
+
+        Providers with an internal index should override this to avoid
+        building full SearchResult objects.
+
+        Returns:
+            List of clause identifiers
+        """
+        return [clause.clause_id for clause in self.get_all_clauses()]
+
 
 class PaidStandardProvider(StandardProvider):
-    """Provider for paid standards loaded from JSON files."""
+    """Provider for paid standards loaded from the standards directory.
+
+    Reads either the JSON format (full_text.json) or the compact format
+    (compressed clause blob plus offset and token indexes), preferring the
+    compact format when both are present.
+    """
 
     def __init__(self, standard_path: Path):
         """Initialize provider from standard data directory.
 
         Args:
             standard_path: Path to standard data directory containing
-                          metadata.json and full_text.json
+                          metadata.json and either full_text.json or the
+                          compact clause files
         """
         self.standard_path = standard_path
         self.metadata_file = standard_path / "metadata.json"
-        self.full_text_file = standard_path / "full_text.json"
+        self.full_text_file = standard_path / FULL_TEXT_FILE
+        self._store: Optional[CompactClauseStore] = None
 
         # Load data
         self._load_data()
 
     def _load_data(self) -> None:
-        """Load metadata and full text data."""
+        """Load metadata and the clause index."""
         if not self.metadata_file.exists():
             raise FileNotFoundError(f"Metadata file not found: {self.metadata_file}")
 
-        if not self.full_text_file.exists():
+        compact = has_compact_format(self.standard_path)
+        if not compact and not self.full_text_file.exists():
             raise FileNotFoundError(f"Full text file not found: {self.full_text_file}")
 
         with open(self.metadata_file, "r") as f:
             self.metadata = StandardMetadata(json.load(f))
 
-        with open(self.full_text_file, "r") as f:
-            self.data = json.load(f)
+        if compact:
+            # Content stays compressed on disk and is decompressed per clause
+            self._store = CompactClauseStore(self.standard_path)
+            self._clauses: List[Dict[str, Any]] = self._store.clauses
+        else:
+            with open(self.full_text_file, "r") as f:
+                self.data = json.load(f)
+            self._clauses = flatten_clauses(self.data)
+
+        self._build_clause_index()
+
+    def _build_clause_index(self) -> None:
+        """Index clause IDs to their position in the ordered clause list.
+
+        Sections come first (depth-first), then annex controls, which is the
+        order search and get_clause have always used. The first occurrence of
+        a clause ID wins, matching the previous linear-scan behaviour.
+        """
+        self._clause_positions: Dict[str, int] = {}
+        for position, clause in enumerate(self._clauses):
+            self._clause_positions.setdefault(clause["id"], position)
+
+    def _content(self, position: int) -> str:
+        """Get the full content of the clause at a position."""
+        if self._store is not None:
+            return self._store.content(position)
+        return self._clauses[position]["content"]
+
+    def _to_result(
+        self, position: int, max_content: Optional[int] = None, listing: bool = False
+    ) -> SearchResult:
+        """Build a SearchResult from the clause record at a position."""
+        clause = self._clauses[position]
+        content = self._content(position)
+        if max_content is not None:
+            content = content[:max_content]
+        return SearchResult(
+            standard_id=self.metadata.standard_id,
+            clause_id=clause["id"],
+            title=clause["title"],
+            content=content,
+            page=clause["page"],
+            section_type=clause["listing_type"] if listing else clause["section_type"],
+        )
 
     def get_metadata(self) -> StandardMetadata:
         """Get metadata about this standard."""
         return self.metadata
 
+    def list_clause_ids(self) -> List[str]:
+        """List clause IDs without materializing clause content."""
+        return list(self._clause_positions)
+
+    @timed_phase("enrichment")
     def search(self, query: str, limit: int = 10) -> List[SearchResult]:
         """Search for content within the standard."""
         query_lower = query.lower()
         results = []
 
-        # Search in sections
-        for section in self._iterate_sections(self.data.get("structure", {}).get("sections", [])):
+        positions = self._store.candidates(query) if self._store is not None else None
+        if positions is None:
+            positions = range(len(self._clauses))
+
+        for position in positions:
             if (
-                query_lower in section.get("content", "").lower()
-                or query_lower in section.get("title", "").lower()
+                query_lower in self._content(position).lower()
+                or query_lower in self._clauses[position]["title"].lower()
             ):
-                results.append(
-                    SearchResult(
-                        standard_id=self.metadata.standard_id,
-                        clause_id=section["id"],
-                        title=section["title"],
-                        content=section.get("content", "")[:500],  # Truncate for preview
-                        page=section.get("page"),
-                        section_type="section",
-                    )
-                )
+                results.append(self._to_result(position, max_content=500))  # Truncate for preview
                 if len(results) >= limit:
-                    return results
-
-        # Search in annexes
-        for annex in self.data.get("structure", {}).get("annexes", []):
-            for control in annex.get("controls", []):
-                if (
-                    query_lower in control.get("content", "").lower()
-                    or query_lower in control.get("title", "").lower()
-                ):
-                    results.append(
-                        SearchResult(
-                            standard_id=self.metadata.standard_id,
-                            clause_id=control["id"],
-                            title=control["title"],
-                            content=control.get("content", "")[:500],
-                            page=control.get("page"),
-                            section_type=f"Annex {annex['id']} - {control.get('category', 'control')}",
-                        )
-                    )
-                    if len(results) >= limit:
-                        return results
+                    break
 
         return results
 
-    def _iterate_sections(self, sections: List[Dict], _depth: int = 0) -> List[Dict]:
-        """Recursively iterate through sections and subsections.
-
-        Depth is capped at 20 levels to prevent stack overflow from
-        adversarially nested imported JSON files.
-        """
-        if _depth > 20:
-            return
-        for section in sections:
-            yield section
-            # Recursively iterate subsections
-            if "subsections" in section:
-                yield from self._iterate_sections(section["subsections"], _depth + 1)
-
+    @timed_phase("enrichment")
     def get_clause(self, clause_id: str) -> Optional[SearchResult]:
         """Get a specific clause by ID."""
-        # Search in sections
-        for section in self._iterate_sections(self.data.get("structure", {}).get("sections", [])):
-            if section["id"] == clause_id:
-                return SearchResult(
-                    standard_id=self.metadata.standard_id,
-                    clause_id=section["id"],
-                    title=section["title"],
-                    content=section.get("content", ""),
-                    page=section.get("page"),
-                    section_type="section",
-                )
-
-        # Search in annexes
-        for annex in self.data.get("structure", {}).get("annexes", []):
-            for control in annex.get("controls", []):
-                if control["id"] == clause_id:
-                    return SearchResult(
-                        standard_id=self.metadata.standard_id,
-                        clause_id=control["id"],
-                        title=control["title"],
-                        content=control.get("content", ""),
-                        page=control.get("page"),
-                        section_type=f"Annex {annex['id']} - {control.get('category', 'control')}",
-                    )
-
-        return None
+        position = self._clause_positions.get(clause_id)
+        if position is None:
+            return None
+        return self._to_result(position)
 
     def get_all_clauses(self) -> List[SearchResult]:
         """Get all clauses in the standard."""
-        results = []
-
-        # Get all sections
-        for section in self._iterate_sections(self.data.get("structure", {}).get("sections", [])):
-            results.append(
-                SearchResult(
-                    standard_id=self.metadata.standard_id,
-                    clause_id=section["id"],
-                    title=section["title"],
-                    content=section.get("content", "")[:200],  # Brief preview
-                    page=section.get("page"),
-                    section_type="section",
-                )
-            )
-
-        # Get all annex controls
-        for annex in self.data.get("structure", {}).get("annexes", []):
-            for control in annex.get("controls", []):
-                results.append(
-                    SearchResult(
-                        standard_id=self.metadata.standard_id,
-                        clause_id=control["id"],
-                        title=control["title"],
-                        content=control.get("content", "")[:200],
-                        page=control.get("page"),
-                        section_type=f"Annex {annex['id']}",
-                    )
-                )
-
-        return results
+        # Brief preview only
+        return [
+            self._to_result(position, max_content=200, listing=True)
+            for position in range(len(self._clauses))
+        ]
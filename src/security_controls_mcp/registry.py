@@ -1,43 +1,324 @@
 """Registry for managing all standard providers."""
 
 import logging
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 from .config import Config
-from .providers import PaidStandardProvider, SearchResult, StandardProvider
+from .providers import PaidStandardProvider, SearchResult, StandardMetadata, StandardProvider
+from .timing import timed_phase
+
+if TYPE_CHECKING:
+    from .provider_cache import ProviderCache
 
 logger = logging.getLogger(__name__)
 
 
+def normalize_clause_id(clause_id: str) -> str:
+    """Normalize a clause ID for index lookups ("  a.8.24 " -> "A.8.24")."""
+    return "".join(str(clause_id or "").split()).upper()
+
+
+class OfficialClause:
+    """Official text from a paid standard that an SCF control maps to."""
+
+    def __init__(
+        self,
+        standard_id: str,
+        control_id: str,
+        clause: SearchResult,
+        metadata: StandardMetadata,
+    ):
+        """Initialize official clause entry."""
+        self.standard_id = standard_id
+        self.control_id = control_id
+        self.clause = clause
+        self.metadata = metadata
+
+
+class RegistryState(NamedTuple):
+    """Loaded standards and the indexes built from them.
+
+    Never mutated once published: the registry replaces the whole state with
+    one assignment, so a reader that takes `registry.state` once sees
+    providers, clause index and join from the same load. Updates copy the
+    containers and share the entries of unchanged standards (see _update_state).
+    """
+
+    providers: Dict[str, StandardProvider]
+    # Normalized clause ID -> [(standard_id, clause_id as stored by the provider)]
+    clause_index: Dict[str, List[Tuple[str, str]]]
+    # SCF control ID -> {standard_id: mapped clause IDs the standard defines, in
+    # mapping order}; clause text is only read when a query renders it
+    control_clauses: Dict[str, Dict[str, List[str]]]
+    # standard_id -> file signature at load time, used to detect changes on reload
+    signatures: Dict[str, Tuple]
+
+
+EMPTY_STATE = RegistryState({}, {}, {}, {})
+
+
 class StandardRegistry:
     """Registry for all available standards (SCF + paid)."""
 
-    def __init__(self, config: Optional[Config] = None):
+    def __init__(
+        self,
+        config: Optional[Config] = None,
+        controls: Optional[List[Dict[str, Any]]] = None,
+        provider_cache: Optional["ProviderCache"] = None,
+    ):
         """Initialize the registry.
 
         Args:
             config: Configuration instance. If None, creates default config.
+            controls: Optional SCF controls used to precompute the join between
+                SCF control IDs and official clauses (see bind_controls).
+            provider_cache: Optional shared cache. Providers are then loaded
+                through it and deduplicated with other registries using it.
         """
         self.config = config or Config()
-        self.providers: Dict[str, StandardProvider] = {}
+        self.provider_cache = provider_cache
+        self._controls: List[Dict[str, Any]] = controls or []
+        self.state = EMPTY_STATE
 
         # Load all enabled paid standards
         self._load_paid_standards()
 
+    @property
+    def providers(self) -> Dict[str, StandardProvider]:
+        """Loaded providers by standard ID (read-only)."""
+        return self.state.providers
+
+    def _update_state(
+        self,
+        state: RegistryState,
+        loaded: Dict[str, StandardProvider],
+        removed: Iterable[str],
+        signatures: Dict[str, Tuple],
+    ) -> RegistryState:
+        """Copy-on-write update of a state with added, replaced or removed standards.
+
+        Only the changed standards are dropped from or added to copies of the
+        clause index and control join; entries of other standards are shared
+        with `state`, which is left untouched.
+
+        Args:
+            state: The state to update
+            loaded: Providers to add, replacing any registered under the same ID
+            removed: IDs of standards to drop
+            signatures: File signatures of the new state
+        """
+        providers = dict(state.providers)
+        clause_index = dict(state.clause_index)
+        control_clauses = dict(state.control_clauses)
+        for standard_id in [*removed, *loaded]:
+            old = providers.pop(standard_id, None)
+            if old is not None:
+                self._unindex_clauses(clause_index, standard_id, old)
+                self._unjoin_controls(control_clauses, standard_id)
+        for standard_id, provider in loaded.items():
+            providers[standard_id] = provider
+            self._index_clauses(clause_index, standard_id, provider)
+            self._join_controls(control_clauses, standard_id, provider)
+        return RegistryState(providers, clause_index, control_clauses, signatures)
+
     def _load_paid_standards(self) -> None:
         """Load all enabled paid standards from config."""
         enabled_standards = self.config.get_enabled_standards()
+        providers: Dict[str, StandardProvider] = {}
+        signatures: Dict[str, Tuple] = {}
 
-        for standard_id, standard_config in enabled_standards.items():
+        for standard_id in enabled_standards:
             try:
                 standard_path = self.config.get_standard_path(standard_id)
                 if standard_path and standard_path.exists():
-                    provider = PaidStandardProvider(standard_path)
-                    self.providers[standard_id] = provider
+                    signature = self._standard_signature(standard_path)
+                    providers[standard_id] = self._load_provider(standard_path)
+                    signatures[standard_id] = signature
             except Exception as e:
                 # Log error but don't fail - just skip this standard
                 logger.error(f"Could not load standard '{standard_id}': {e}")
 
+        self.state = self._update_state(EMPTY_STATE, providers, (), signatures)
+
+    def _load_provider(self, standard_path: Path) -> StandardProvider:
+        """Load a provider directly or through the shared provider cache."""
+        if self.provider_cache is not None:
+            return self.provider_cache.provider(standard_path)
+        return PaidStandardProvider(standard_path)
+
+    def add_standard(self, standard_id: str, provider: StandardProvider) -> None:
+        """Register a provider and index its clauses.
+
+        Replaces any provider already registered under the same ID.
+
+        Args:
+            standard_id: The standard identifier
+            provider: The loaded provider
+        """
+        state = self.state
+        signatures = {sid: sig for sid, sig in state.signatures.items() if sid != standard_id}
+        self.state = self._update_state(state, {standard_id: provider}, (), signatures)
+
+    @staticmethod
+    def _index_clauses(
+        clause_index: Dict[str, List[Tuple[str, str]]],
+        standard_id: str,
+        provider: StandardProvider,
+    ) -> None:
+        """Add one provider's clause IDs to a clause index (entry lists are copied)."""
+        for clause_id in provider.list_clause_ids():
+            key = normalize_clause_id(clause_id)
+            entries = clause_index.get(key, [])
+            if not any(sid == standard_id for sid, _ in entries):
+                clause_index[key] = [*entries, (standard_id, clause_id)]
+
+    @staticmethod
+    def _unindex_clauses(
+        clause_index: Dict[str, List[Tuple[str, str]]],
+        standard_id: str,
+        provider: StandardProvider,
+    ) -> None:
+        """Drop one provider's clause IDs from a clause index (entry lists are copied)."""
+        for clause_id in provider.list_clause_ids():
+            key = normalize_clause_id(clause_id)
+            if key not in clause_index:
+                continue
+            entries = [entry for entry in clause_index[key] if entry[0] != standard_id]
+            if entries:
+                clause_index[key] = entries
+            else:
+                del clause_index[key]
+
+    def remove_standard(self, standard_id: str) -> None:
+        """Unregister a provider and drop its clauses from the index.
+
+        Args:
+            standard_id: The standard identifier
+        """
+        state = self.state
+        if standard_id not in state.providers:
+            return
+        signatures = {sid: sig for sid, sig in state.signatures.items() if sid != standard_id}
+        self.state = self._update_state(state, {}, (standard_id,), signatures)
+
+    def bind_controls(self, controls: List[Dict[str, Any]]) -> None:
+        """Set the SCF controls and rebuild the control-to-clause join.
+
+        Args:
+            controls: SCF controls with their framework_mappings
+        """
+        self._controls = controls
+        state = self.state
+        control_clauses: Dict[str, Dict[str, List[str]]] = {}
+        for standard_id, provider in state.providers.items():
+            self._join_controls(control_clauses, standard_id, provider)
+        self.state = state._replace(control_clauses=control_clauses)
+
+    def _join_controls(
+        self,
+        control_clauses: Dict[str, Dict[str, List[str]]],
+        standard_id: str,
+        provider: StandardProvider,
+    ) -> None:
+        """Record the clauses of one standard that every SCF control maps to.
+
+        Every mapped ID the standard defines is joined, in mapping order. Only
+        clause IDs are stored, so no clause text is read or decompressed here.
+        Per-control dicts are copied, never changed in place.
+        """
+        defined = set(provider.list_clause_ids())
+        for ctrl in self._controls:
+            mapped_ids = ctrl["framework_mappings"].get(standard_id) or []
+            clause_ids = [mapped_id for mapped_id in mapped_ids if mapped_id in defined]
+            if clause_ids:
+                control_clauses[ctrl["id"]] = {
+                    **control_clauses.get(ctrl["id"], {}),
+                    standard_id: clause_ids,
+                }
+
+    @staticmethod
+    def _unjoin_controls(
+        control_clauses: Dict[str, Dict[str, List[str]]], standard_id: str
+    ) -> None:
+        """Drop one standard from the control join (per-control dicts are copied)."""
+        for scf_id, joined in list(control_clauses.items()):
+            if standard_id not in joined:
+                continue
+            rest = {sid: clause_ids for sid, clause_ids in joined.items() if sid != standard_id}
+            if rest:
+                control_clauses[scf_id] = rest
+            else:
+                del control_clauses[scf_id]
+
+    @timed_phase("enrichment")
+    def get_official_clauses(self, scf_id: str) -> Dict[str, OfficialClause]:
+        """Get official clauses for an SCF control, keyed by standard ID.
+
+        Args:
+            scf_id: The SCF control ID (e.g., "CRY-01")
+
+        Returns:
+            Dictionary mapping standard_id to the OfficialClause of the first
+            mapped ID the standard defines (empty if none)
+        """
+        state = self.state
+        official_clauses = {}
+        for standard_id, clause_ids in state.control_clauses.get(scf_id, {}).items():
+            official = self._official_clause(state, standard_id, clause_ids[0])
+            if official:
+                official_clauses[standard_id] = official
+        return official_clauses
+
+    @timed_phase("enrichment")
+    def get_official_clause(
+        self, scf_id: str, standard_id: str, requirement_id: Optional[str] = None
+    ) -> Optional[OfficialClause]:
+        """Get the official clause of one standard for an SCF control.
+
+        Args:
+            scf_id: The SCF control ID
+            standard_id: The standard identifier
+            requirement_id: Optional requirement ID of the standard to show,
+                e.g. the resolved source control of map_frameworks. It may
+                come from a different mapping key (ISO 27001 Annex A IDs are
+                mapped under ISO 27002), so it is looked up in the standard
+                if the control's own mappings do not include it.
+                Defaults to the first mapped ID the standard defines.
+
+        Returns:
+            The OfficialClause, or None if the standard is not loaded or has no match
+        """
+        state = self.state
+        clause_ids = state.control_clauses.get(scf_id, {}).get(standard_id, [])
+        if requirement_id is None:
+            return self._official_clause(state, standard_id, clause_ids[0]) if clause_ids else None
+
+        key = normalize_clause_id(requirement_id)
+        for clause_id in clause_ids:
+            if normalize_clause_id(clause_id) == key:
+                return self._official_clause(state, standard_id, clause_id)
+        for indexed_standard, stored_id in state.clause_index.get(key, []):
+            if indexed_standard == standard_id:
+                return self._official_clause(state, standard_id, stored_id)
+        return None
+
+    @staticmethod
+    def _official_clause(
+        state: RegistryState, standard_id: str, clause_id: str
+    ) -> Optional[OfficialClause]:
+        """Read one joined clause from its provider (None if it is gone)."""
+        provider = state.providers.get(standard_id)
+        clause = provider.get_clause(clause_id) if provider else None
+        if not clause:
+            return None
+        return OfficialClause(
+            standard_id=standard_id,
+            control_id=clause_id,
+            clause=clause,
+            metadata=provider.get_metadata(),
+        )
+
     def get_provider(self, standard_id: str) -> Optional[StandardProvider]:
         """Get a provider by standard ID.
 
@@ -85,6 +366,7 @@ class StandardRegistry:
 
         return standards
 
+    @timed_phase("enrichment")
     def search_all(self, query: str, limit: int = 20) -> Dict[str, List[SearchResult]]:
         """Search across all available paid standards.
 
@@ -96,15 +378,41 @@ class StandardRegistry:
             Dictionary mapping standard_id to list of search results
         """
         all_results = {}
-        results_per_standard = max(5, limit // max(1, len(self.providers)))
+        providers = self.state.providers
+        results_per_standard = max(5, limit // max(1, len(providers)))
 
-        for standard_id, provider in self.providers.items():
+        for standard_id, provider in providers.items():
             results = provider.search(query, limit=results_per_standard)
             if results:
                 all_results[standard_id] = results
 
         return all_results
 
+    @timed_phase("enrichment")
+    def find_clause(self, clause_id: str) -> List[Tuple[str, SearchResult]]:
+        """Find a clause in every standard that defines it.
+
+        Lookups go through the merged clause index, so "a.8.24" and
+        " A.8.24" resolve the same way as "A.8.24".
+
+        Args:
+            clause_id: The clause identifier to look up
+
+        Returns:
+            List of (standard_id, SearchResult) tuples, in load order
+        """
+        matches = []
+        state = self.state
+        for standard_id, stored_id in state.clause_index.get(normalize_clause_id(clause_id), []):
+            provider = state.providers.get(standard_id)
+            if not provider:
+                continue
+            result = provider.get_clause(stored_id)
+            if result:
+                matches.append((standard_id, result))
+        return matches
+
+    @timed_phase("enrichment")
     def get_clause_from_any_standard(self, clause_id: str) -> Optional[tuple[str, SearchResult]]:
         """Search for a clause across all standards.
 
@@ -114,12 +422,8 @@ class StandardRegistry:
         Returns:
             Tuple of (standard_id, SearchResult) if found, None otherwise
         """
-        for standard_id, provider in self.providers.items():
-            result = provider.get_clause(clause_id)
-            if result:
-                return (standard_id, result)
-
-        return None
+        matches = self.find_clause(clause_id)
+        return matches[0] if matches else None
 
     def has_paid_standards(self) -> bool:
         """Check if any paid standards are loaded.
@@ -131,5 +435,90 @@ class StandardRegistry:
 
     def reload(self) -> None:
         """Reload all standards from config."""
-        self.providers.clear()
         self._load_paid_standards()
+
+    @staticmethod
+    def _standard_signature(standard_path: Path) -> Tuple:
+        """Signature of a standard's files (name, size, mtime) for change detection."""
+        try:
+            entries = sorted(p for p in standard_path.iterdir() if p.is_file())
+        except OSError:
+            return (str(standard_path),)
+        signature = [str(standard_path)]
+        for entry in entries:
+            stat = entry.stat()
+            signature.append((entry.name, stat.st_size, stat.st_mtime_ns))
+        return tuple(signature)
+
+    def prepare_reload(self) -> Optional[RegistryState]:
+        """Re-read config and load new or changed standards without touching live state.
+
+        This does the expensive work (JSON parsing, index and join building)
+        and is safe to run in a worker thread while queries are being served.
+        Unchanged standards keep their existing provider instance. A standard
+        that fails to load keeps its previous provider, if any.
+
+        Returns:
+            A prepared update for apply_reload(), or None if nothing changed
+        """
+        self.config.reload()
+        enabled_standards = self.config.get_enabled_standards()
+        state = self.state
+
+        providers: Dict[str, StandardProvider] = {}
+        signatures: Dict[str, Tuple] = {}
+        loaded: Dict[str, StandardProvider] = {}
+
+        for standard_id in enabled_standards:
+            standard_path = self.config.get_standard_path(standard_id)
+            if not standard_path or not standard_path.exists():
+                continue
+
+            signature = self._standard_signature(standard_path)
+            current = state.providers.get(standard_id)
+            if current is not None and state.signatures.get(standard_id) == signature:
+                providers[standard_id] = current
+                signatures[standard_id] = signature
+                continue
+
+            try:
+                providers[standard_id] = loaded[standard_id] = self._load_provider(standard_path)
+                signatures[standard_id] = signature
+                logger.info(f"Loaded standard '{standard_id}' from {standard_path}")
+            except Exception as e:
+                logger.error(f"Could not load standard '{standard_id}': {e}")
+                if current is not None:
+                    providers[standard_id] = current
+                    signatures[standard_id] = state.signatures.get(standard_id, ())
+
+        removed = [standard_id for standard_id in state.providers if standard_id not in providers]
+        if not loaded and not removed:
+            return None
+
+        # Only the loaded and removed standards are re-indexed and re-joined
+        return self._update_state(state, loaded, removed, signatures)
+
+    def apply_reload(self, prepared: RegistryState) -> None:
+        """Swap in state built by prepare_reload().
+
+        The whole state is replaced in one assignment, so a query running
+        concurrently (on the event loop or in a worker thread) that reads
+        `state` once sees either the old or the new providers, index and join,
+        never a mix.
+
+        Args:
+            prepared: The value returned by prepare_reload()
+        """
+        self.state = prepared
+
+    def refresh(self) -> bool:
+        """Load new or changed standards from config and swap them in.
+
+        Returns:
+            True if the set of loaded standards changed
+        """
+        prepared = self.prepare_reload()
+        if prepared is None:
+            return False
+        self.apply_reload(prepared)
+        return True
@@ -11,16 +11,26 @@ from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
 
 from .config import Config
-from .data_loader import SCFData
+from .data_loader import CLOSEST_METRICS, SCFData
 from .legal_notice import print_legal_notice
+from .metrics import install_dump_handler, instrument_tool
+from .pagination import (
+    MAX_PAGE_SIZE,
+    CursorError,
+    format_page_footer,
+    next_cursor,
+    query_key,
+    resolve_page,
+)
 from .registry import StandardRegistry
+from .watcher import StandardsWatcher
 
 # Initialize data loader
 scf_data = SCFData()
 
 # Initialize configuration and registry for paid standards
 config = Config()
-registry = StandardRegistry(config)
+registry = StandardRegistry(config, controls=scf_data.controls)
 
 # Create server instance
 app = Server("security-controls-mcp")
@@ -233,7 +243,8 @@ async def list_tools() -> list[Tool]:
                 "domain. WARNING: Large frameworks like NIST 800-53 can return 700+ "
                 "controls (~5000 tokens with descriptions, ~2000 without). "
                 "Set include_descriptions=false (default) to reduce token usage. "
-                "Controls are capped at 10 per domain with overflow indicated. "
+                "Controls are capped at 10 per domain with overflow indicated; "
+                "pass page_size (and then cursor) to page through every control. "
                 "Returns 'not found' with a list of valid framework keys if the "
                 "framework doesn't exist. Use list_frameworks to discover valid keys."
             ),
@@ -256,6 +267,23 @@ async def list_tools() -> list[Tool]:
                         ),
                         "default": False,
                     },
+                    "page_size": {
+                        "type": "integer",
+                        "description": (
+                            f"Optional: return one page of this many rows (max {MAX_PAGE_SIZE}) "
+                            "instead of the capped summary. The response ends with a "
+                            "cursor for the next page."
+                        ),
+                        "minimum": 1,
+                        "maximum": MAX_PAGE_SIZE,
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": (
+                            "Optional: cursor from a previous page, to get the next page. "
+                            "Cursors expire when the SCF data changes."
+                        ),
+                    },
                 },
                 "required": ["framework"],
                 "additionalProperties": False,
@@ -268,8 +296,10 @@ async def list_tools() -> list[Tool]:
                 "Shows which target framework requirements are satisfied by source "
                 "framework controls, and identifies gaps where no mapping exists. "
                 "Useful for gap analysis and compliance mapping. "
+                "Pass targets to map one source to several frameworks at once. "
                 "Results are capped at 20 mappings; use source_control to filter "
-                "to a specific control for detailed mapping. "
+                "to a specific control for detailed mapping, or pass page_size "
+                "(and then cursor) to page through every mapping. "
                 "Returns 'not found' if either framework key is invalid. "
                 "Typical response: ~1500-3000 tokens."
             ),
@@ -299,8 +329,207 @@ async def list_tools() -> list[Tool]:
                             "discover keys."
                         ),
                     },
+                    "targets": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": (
+                            "Optional: several target framework keys to map to in one "
+                            "pass (e.g., ['dora', 'nis2', 'nist_csf_2.0']), one column "
+                            "per target. Use instead of or together with target_framework."
+                        ),
+                        "maxItems": 50,
+                    },
+                    "page_size": {
+                        "type": "integer",
+                        "description": (
+                            f"Optional: return one page of this many rows (max {MAX_PAGE_SIZE}) "
+                            "instead of the capped summary. The response ends with a "
+                            "cursor for the next page."
+                        ),
+                        "minimum": 1,
+                        "maximum": MAX_PAGE_SIZE,
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": (
+                            "Optional: cursor from a previous page, to get the next page. "
+                            "Cursors expire when the SCF data changes."
+                        ),
+                    },
+                },
+                "required": ["source_framework"],
+                "additionalProperties": False,
+            },
+        ),
+        Tool(
+            name="compare_frameworks",
+            description=(
+                "Compare frameworks by the SCF controls they share, using a precomputed "
+                "overlap matrix (instant for any pair). With target_framework: shows how "
+                "much of the target an implementation of the source covers, and the "
+                "reverse. Without target_framework: lists the frameworks closest to the "
+                "source. Coverage is measured in SCF controls, not individual "
+                "requirements; use map_frameworks for requirement-level detail. "
+                "Returns 'not found' if a framework key is invalid. "
+                "Typical response: ~200-800 tokens."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "source_framework": {
+                        "type": "string",
+                        "description": (
+                            "Framework key you HAVE implemented (e.g., 'iso_27002_2022'). "
+                            "Use list_frameworks to discover keys."
+                        ),
+                    },
+                    "target_framework": {
+                        "type": "string",
+                        "description": (
+                            "Optional: framework key to compare against (e.g., 'dora'). "
+                            "Omit to list the closest frameworks instead."
+                        ),
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Number of closest frameworks to list (default: 10, max: 50)",
+                        "default": 10,
+                        "minimum": 1,
+                        "maximum": 50,
+                    },
+                    "metric": {
+                        "type": "string",
+                        "enum": ["jaccard", "coverage"],
+                        "description": (
+                            "Ranking for closest frameworks: 'jaccard' (overall similarity, "
+                            "default) or 'coverage' (share of each other framework the "
+                            "source covers)."
+                        ),
+                        "default": "jaccard",
+                    },
+                },
+                "required": ["source_framework"],
+                "additionalProperties": False,
+            },
+        ),
+        Tool(
+            name="gap_analysis",
+            description=(
+                "Score an implementation against several target frameworks at once. "
+                "Give the implemented SCF control IDs, or requirement IDs of a framework "
+                "you have implemented (source_framework + implemented_requirements). "
+                "For each target: requirements met (all mapped SCF controls implemented), "
+                "partial and missing, weight-weighted score, and the first missing "
+                "requirements. Returns 'not found' if a framework key is invalid. "
+                "Typical response: ~300 tokens per target."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "target_frameworks": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": (
+                            "Framework keys to score against (e.g., ['dora', 'nis2', "
+                            "'iso_27002_2022']). Use list_frameworks to discover keys."
+                        ),
+                        "minItems": 1,
+                        "maxItems": 50,
+                    },
+                    "implemented_controls": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "SCF control IDs already implemented (e.g., ['GOV-01', 'IAC-01'])",
+                    },
+                    "source_framework": {
+                        "type": "string",
+                        "description": (
+                            "Framework of implemented_requirements (e.g., 'iso_27002_2022')"
+                        ),
+                    },
+                    "implemented_requirements": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": (
+                            "Requirement IDs of source_framework already implemented "
+                            "(e.g., ['5.1', '5.15']). Resolved to their SCF controls."
+                        ),
+                    },
+                },
+                "required": ["target_frameworks"],
+                "additionalProperties": False,
+            },
+        ),
+        Tool(
+            name="baseline_delta",
+            description=(
+                "Answer 'what do I need to add to go from one baseline to the next', "
+                "e.g. NIST 800-53B Moderate -> High, FedRAMP Low -> Moderate, CIS IG1 -> IG2 "
+                "or CMMC Level 1 -> Level 2, from a containment lattice of nested "
+                "baselines precomputed at load (instant). With to_framework: lists the "
+                "SCF controls to add, and any no longer required if the baselines are "
+                "not nested. Without to_framework: shows the baseline family of "
+                "from_framework, which levels contain it and the upgrade steps. "
+                "Returns 'not found' if a framework key is invalid. "
+                "Typical response: ~300-2500 tokens."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "from_framework": {
+                        "type": "string",
+                        "description": (
+                            "Framework key of the baseline you HAVE "
+                            "(e.g., 'nist_800_53b_r5_moderate', 'cis_csc_8.1_ig1')."
+                        ),
+                    },
+                    "to_framework": {
+                        "type": "string",
+                        "description": (
+                            "Optional: framework key of the baseline you want to reach "
+                            "(e.g., 'nist_800_53b_r5_high'). Omit to show the baseline family."
+                        ),
+                    },
+                },
+                "required": ["from_framework"],
+                "additionalProperties": False,
+            },
+        ),
+        Tool(
+            name="related_controls",
+            description=(
+                "Find SCF controls related to a control because they map to the same "
+                "framework requirements (e.g., controls that usually get implemented or "
+                "audited together). Scored by Jaccard or cosine similarity over the "
+                "controls' requirement sets, from a table precomputed at build time "
+                "(instant). Returns 'not found' if the control ID is invalid. "
+                "Typical response: ~200-600 tokens."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "control_id": {
+                        "type": "string",
+                        "description": "SCF control ID (e.g., GOV-01, IAC-05)",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of related controls (default 10, max 20)",
+                        "default": 10,
+                        "minimum": 1,
+                        "maximum": 20,
+                    },
+                    "metric": {
+                        "type": "string",
+                        "enum": ["jaccard", "cosine"],
+                        "description": (
+                            "Similarity metric: 'jaccard' (default, penalizes controls with "
+                            "many unrelated mappings) or 'cosine' (favours broad controls)."
+                        ),
+                        "default": "jaccard",
+                    },
                 },
-                "required": ["source_framework", "target_framework"],
+                "required": ["control_id"],
                 "additionalProperties": False,
             },
         ),
@@ -398,6 +627,7 @@ async def list_tools() -> list[Tool]:
 
 
 @app.call_tool()
+@instrument_tool
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Handle tool calls."""
 
@@ -540,33 +770,23 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         # Check if user has paid standards with official text for mapped frameworks
         if include_mappings and registry.has_paid_standards():
             official_texts = []
+            official_clauses = registry.get_official_clauses(control["id"])
 
             for fw_key, control_ids in response["framework_mappings"].items():
-                if not control_ids:
-                    continue
-
-                # Check if we have a paid standard for this framework
-                provider = registry.get_provider(fw_key)
-                if not provider:
-                    continue
-
-                # Try to get official text for the first mapped control ID
-                for control_id in control_ids[:1]:  # Just show first mapping to avoid clutter
-                    clause = provider.get_clause(control_id)
-                    if clause:
-                        metadata = provider.get_metadata()
-                        official_texts.append(
-                            {
-                                "framework": fw_key,
-                                "framework_name": scf_data.frameworks.get(fw_key, {}).get(
-                                    "name", fw_key
-                                ),
-                                "control_id": control_id,
-                                "clause": clause,
-                                "metadata": metadata,
-                            }
-                        )
-                        break
+                # Precomputed join holds the first mapped clause per loaded standard
+                official = official_clauses.get(fw_key) if control_ids else None
+                if official:
+                    official_texts.append(
+                        {
+                            "framework": fw_key,
+                            "framework_name": scf_data.frameworks.get(fw_key, {}).get(
+                                "name", fw_key
+                            ),
+                            "control_id": official.control_id,
+                            "clause": official.clause,
+                            "metadata": official.metadata,
+                        }
+                    )
 
             # Display official texts if we found any
             if official_texts:
@@ -684,44 +904,76 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 )
             ]
 
-        controls = scf_data.get_framework_controls(framework, include_descriptions)
-
         fw_info = scf_data.frameworks[framework]
+
+        if "page_size" in arguments or arguments.get("cursor"):
+            # Slice one page from the framework's precomputed domain-ordered index
+            query = query_key("get_framework_controls", framework)
+            try:
+                offset, page_size = resolve_page(
+                    arguments.get("cursor"), arguments.get("page_size"), scf_data.fingerprint, query
+                )
+            except CursorError as e:
+                return [TextContent(type="text", text=f"Error: {e}")]
+            rows, total = scf_data.get_framework_controls_page(
+                framework, offset, page_size, include_descriptions
+            )
+
+            text = f"**{fw_info['name']}**\n"
+            text += f"**Total Controls:** {total}\n"
+            current_domain = None
+            for ctrl in rows:
+                if ctrl["domain"] != current_domain:
+                    current_domain = ctrl["domain"]
+                    text += f"\n**{current_domain}**\n"
+                text += f"- **{ctrl['scf_id']}**: {ctrl['scf_name']}\n"
+                text += f"  Maps to: {', '.join(ctrl['framework_control_ids'])}\n"
+                if include_descriptions:
+                    text += f"  {ctrl['description']}\n"
+
+            cursor = next_cursor(scf_data.fingerprint, query, offset, page_size, total)
+            text += format_page_footer(offset, len(rows), total, cursor)
+            return [TextContent(type="text", text=text)]
+
+        # Domain groups are precomputed at load; take up to 10 controls per domain
+        domains = scf_data.framework_domains(framework, 10, include_descriptions)
+
         text = f"**{fw_info['name']}**\n"
-        text += f"**Total Controls:** {len(controls)}\n\n"
-
-        # Group by domain for readability
-        by_domain: dict[str, list] = {}
-        for ctrl in controls:
-            # Get full control to get domain
-            full_ctrl = scf_data.get_control(ctrl["scf_id"])
-            if full_ctrl:
-                domain = full_ctrl["domain"]
-                if domain not in by_domain:
-                    by_domain[domain] = []
-                by_domain[domain].append(ctrl)
-
-        for domain, domain_ctrls in sorted(by_domain.items()):
-            text += f"\n**{domain}**\n"
-            for ctrl in domain_ctrls[:10]:  # Limit per domain for readability
+        text += f"**Total Controls:** {len(scf_data.framework_index(framework))}\n\n"
+
+        for group in domains:
+            text += f"\n**{group['domain']}**\n"
+            for ctrl in group["controls"]:
                 text += f"- **{ctrl['scf_id']}**: {ctrl['scf_name']}\n"
                 text += f"  Maps to: {', '.join(ctrl['framework_control_ids'][:5])}\n"
                 if include_descriptions:
                     text += f"  {ctrl['description'][:100]}...\n"
 
-            if len(domain_ctrls) > 10:
-                text += f"  *... and {len(domain_ctrls) - 10} more controls*\n"
+            if group["total"] > 10:
+                text += f"  *... and {group['total'] - 10} more controls*\n"
+
+        if any(group["total"] > 10 for group in domains):
+            text += "\n*Pass page_size to page through every control.*\n"
 
         return [TextContent(type="text", text=text)]
 
     elif name == "map_frameworks":
         source_framework = str(arguments.get("source_framework") or "").strip()
         target_framework = str(arguments.get("target_framework") or "").strip()
-        if not source_framework or not target_framework:
+        targets = arguments.get("targets") or []
+        if not isinstance(targets, list):
             return [
                 TextContent(
                     type="text",
-                    text="Error: both source_framework and target_framework are required. "
+                    text="Error: targets must be a list of framework keys.",
+                )
+            ]
+        targets = [str(fw).strip() for fw in targets if str(fw).strip()]
+        if not source_framework or not (target_framework or targets):
+            return [
+                TextContent(
+                    type="text",
+                    text="Error: source_framework and target_framework (or targets) are required. "
                     "Use list_frameworks to discover valid framework keys.",
                 )
             ]
@@ -737,27 +989,132 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 )
             ]
 
-        if target_framework not in scf_data.frameworks:
-            available = ", ".join(scf_data.frameworks.keys())
-            return [
-                TextContent(
-                    type="text",
-                    text=f"Target framework '{target_framework}' not found. Available: {available}",
+        if target_framework and target_framework not in targets:
+            targets.insert(0, target_framework)
+        for fw_key in targets:
+            if fw_key not in scf_data.frameworks:
+                available = ", ".join(scf_data.frameworks.keys())
+                return [
+                    TextContent(
+                        type="text",
+                        text=f"Target framework '{fw_key}' not found. Available: {available}",
+                    )
+                ]
+
+        # Annex A IDs of ISO 27001 are looked up under the ISO 27002 key
+        resolved_via = None
+        if source_control:
+            lookup_framework, _ = scf_data.lookup_requirement(source_framework, source_control)
+            if lookup_framework != source_framework:
+                resolved_via = lookup_framework
+
+        source_name = scf_data.frameworks[source_framework]["name"]
+
+        if "page_size" in arguments or arguments.get("cursor"):
+            # Slice one page from the source framework's precomputed ordered index
+            query = query_key("map_frameworks", source_framework, targets, source_control)
+            try:
+                offset, page_size = resolve_page(
+                    arguments.get("cursor"), arguments.get("page_size"), scf_data.fingerprint, query
                 )
-            ]
+            except CursorError as e:
+                return [TextContent(type="text", text=f"Error: {e}")]
+            rows, total = scf_data.map_frameworks_page(
+                source_framework, targets, offset, page_size, source_control
+            )
+            if not total:
+                return [
+                    TextContent(
+                        type="text",
+                        text=f"No mappings found for {source_framework}"
+                        + (f" control {source_control}" if source_control else ""),
+                    )
+                ]
+
+            if len(targets) > 1:
+                text = f"**Mapping: {source_name} → {len(targets)} frameworks**\n"
+            else:
+                text = f"**Mapping: {source_name} → {scf_data.frameworks[targets[0]]['name']}**\n"
+            if source_control:
+                text += f"**Filtered to source control: {source_control}**\n"
+            if resolved_via:
+                text += (
+                    f"**Annex A control resolved via `{resolved_via}` "
+                    "(ISO 27001 Annex A = ISO 27002 controls)**\n"
+                )
+            text += f"**Found {total} SCF controls**\n\n"
+
+            for row in rows:
+                text += f"**{row['scf_id']}: {row['scf_name']}** (weight: {row['weight']})\n"
+                text += f"- Source ({source_framework}): {', '.join(row['source_controls'])}\n"
+                for fw_key in targets:
+                    target_ids = row["targets"][fw_key]
+                    if target_ids:
+                        text += f"- {fw_key}: {', '.join(target_ids)}\n"
+                    else:
+                        text += f"- {fw_key}: *No direct mapping*\n"
+                text += "\n"
+
+            cursor = next_cursor(scf_data.fingerprint, query, offset, page_size, total)
+            text += format_page_footer(offset, len(rows), total, cursor)
+            return [TextContent(type="text", text=text)]
 
+        if len(targets) > 1:
+            # One pass over the source framework's controls, one column per target
+            rows = list(scf_data.iter_mappings(source_framework, targets, source_control))
+            if not rows:
+                return [
+                    TextContent(
+                        type="text",
+                        text=f"No mappings found for {source_framework}"
+                        + (f" control {source_control}" if source_control else ""),
+                    )
+                ]
+
+            text = f"**Mapping: {source_name} → {len(targets)} frameworks**\n"
+            if source_control:
+                text += f"**Filtered to source control: {source_control}**\n"
+            if resolved_via:
+                text += (
+                    f"**Annex A control resolved via `{resolved_via}` "
+                    "(ISO 27001 Annex A = ISO 27002 controls)**\n"
+                )
+            text += f"**Found {len(rows)} SCF controls**\n\n"
+
+            text += "**Mapped per target:**\n"
+            for fw_key in targets:
+                mapped = sum(1 for row in rows if row["targets"][fw_key])
+                text += f"- `{fw_key}`: {mapped} of {len(rows)} SCF controls\n"
+            text += "\n"
+
+            for row in rows[:20]:  # Limit for readability
+                text += f"**{row['scf_id']}: {row['scf_name']}** (weight: {row['weight']})\n"
+                text += f"- Source ({source_framework}): {', '.join(row['source_controls'][:5])}\n"
+                for fw_key in targets:
+                    target_ids = row["targets"][fw_key]
+                    if target_ids:
+                        text += f"- {fw_key}: {', '.join(target_ids[:5])}\n"
+                    else:
+                        text += f"- {fw_key}: *No direct mapping*\n"
+                text += "\n"
+
+            if len(rows) > 20:
+                text += (
+                    f"\n*Showing first 20 of {len(rows)} mappings. "
+                    "Pass page_size to page through all of them.*\n"
+                )
+
+            return [TextContent(type="text", text=text)]
+
+        target_framework = targets[0]
         mappings = scf_data.map_frameworks(source_framework, target_framework, source_control)
 
         if not mappings:
             hint = ""
-            if (
-                source_control
-                and source_framework == "iso_27001_2022"
-                and str(source_control).strip().upper().startswith("A.")
-            ):
+            if resolved_via:
                 hint = (
-                    "\n\nTip: Annex A control IDs (e.g., A.5.15) are mapped under "
-                    "`iso_27002_2022` in SCF data. Try source_framework='iso_27002_2022'."
+                    f"\n\nNote: Annex A control IDs (e.g., A.5.15) are looked up under "
+                    f"`{resolved_via}` in SCF data, which has no control {source_control}."
                 )
             return [
                 TextContent(
@@ -766,12 +1123,16 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 )
             ]
 
-        source_name = scf_data.frameworks[source_framework]["name"]
         target_name = scf_data.frameworks[target_framework]["name"]
 
         text = f"**Mapping: {source_name} → {target_name}**\n"
         if source_control:
             text += f"**Filtered to source control: {source_control}**\n"
+        if resolved_via:
+            text += (
+                f"**Annex A control resolved via `{resolved_via}` "
+                "(ISO 27001 Annex A = ISO 27002 controls)**\n"
+            )
         text += f"**Found {len(mappings)} SCF controls**\n\n"
 
         for mapping in mappings[:20]:  # Limit for readability
@@ -788,7 +1149,10 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             text += "\n"
 
         if len(mappings) > 20:
-            text += f"\n*Showing first 20 of {len(mappings)} mappings*\n"
+            text += (
+                f"\n*Showing first 20 of {len(mappings)} mappings. "
+                "Pass page_size to page through all of them.*\n"
+            )
 
         # Check if user has paid standards for source or target frameworks
         if registry.has_paid_standards():
@@ -804,41 +1168,32 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                 if mappings:
                     example_mapping = mappings[0]
 
-                    # Show source framework official text
-                    if source_provider and example_mapping["source_controls"]:
-                        for control_id in example_mapping["source_controls"][:1]:
-                            clause = source_provider.get_clause(control_id)
-                            if clause:
-                                metadata = source_provider.get_metadata()
-                                text += f"### {source_name} - {control_id}\n\n"
-                                text += f"**{clause.title}**\n\n"
-
-                                content = clause.content
-                                if len(content) > 800:
-                                    content = content[:800] + "...\n\n*[Truncated]*"
-                                text += f"{content}\n\n"
-
-                                if clause.page:
-                                    text += f"📄 Page {clause.page} | "
-                                text += f"**Source:** {metadata.title}\n\n"
-
-                    # Show target framework official text
-                    if target_provider and example_mapping["target_controls"]:
-                        for control_id in example_mapping["target_controls"][:1]:
-                            clause = target_provider.get_clause(control_id)
-                            if clause:
-                                metadata = target_provider.get_metadata()
-                                text += f"### {target_name} - {control_id}\n\n"
-                                text += f"**{clause.title}**\n\n"
-
-                                content = clause.content
-                                if len(content) > 800:
-                                    content = content[:800] + "...\n\n*[Truncated]*"
-                                text += f"{content}\n\n"
-
-                                if clause.page:
-                                    text += f"📄 Page {clause.page} | "
-                                text += f"**Source:** {metadata.title}\n\n"
+                    # Show the official text of the IDs the mapping lists: the
+                    # resolved source control when filtered (possibly an Annex A
+                    # ID mapped under another key), otherwise the first mapped ID
+                    source_id = source_control or example_mapping["source_controls"][0]
+                    target_ids = example_mapping["target_controls"]
+                    for fw_key, fw_name, requirement_id in (
+                        (source_framework, source_name, source_id),
+                        (target_framework, target_name, target_ids[0] if target_ids else None),
+                    ):
+                        official = registry.get_official_clause(
+                            example_mapping["scf_id"], fw_key, requirement_id
+                        )
+                        if not official:
+                            continue
+                        clause = official.clause
+                        text += f"### {fw_name} - {official.control_id}\n\n"
+                        text += f"**{clause.title}**\n\n"
+
+                        content = clause.content
+                        if len(content) > 800:
+                            content = content[:800] + "...\n\n*[Truncated]*"
+                        text += f"{content}\n\n"
+
+                        if clause.page:
+                            text += f"📄 Page {clause.page} | "
+                        text += f"**Source:** {official.metadata.title}\n\n"
 
                 text += "⚠️ Licensed content - do not redistribute\n"
                 text += (
@@ -847,6 +1202,292 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
 
         return [TextContent(type="text", text=text)]
 
+    elif name == "compare_frameworks":
+        source_framework = str(arguments.get("source_framework") or "").strip()
+        target_framework = str(arguments.get("target_framework") or "").strip()
+        if not source_framework:
+            return [
+                TextContent(
+                    type="text",
+                    text="Error: source_framework is required. "
+                    "Use list_frameworks to discover valid framework keys.",
+                )
+            ]
+
+        for label, fw_key in (("Source", source_framework), ("Target", target_framework)):
+            if fw_key and fw_key not in scf_data.frameworks:
+                available = ", ".join(scf_data.frameworks.keys())
+                return [
+                    TextContent(
+                        type="text",
+                        text=f"{label} framework '{fw_key}' not found. Available: {available}",
+                    )
+                ]
+
+        source_name = scf_data.frameworks[source_framework]["name"]
+
+        if target_framework:
+            comparison = scf_data.compare_frameworks(source_framework, target_framework)
+            target_name = scf_data.frameworks[target_framework]["name"]
+            shared = comparison["shared_controls"]
+
+            text = f"**Overlap: {source_name} → {target_name}**\n\n"
+            text += (
+                f"- **Coverage of {target_framework}:** {comparison['target_coverage']:.1%} "
+                f"({shared} of {comparison['target_controls']} SCF controls)\n"
+            )
+            text += (
+                f"- **Coverage of {source_framework}:** {comparison['source_coverage']:.1%} "
+                f"({shared} of {comparison['source_controls']} SCF controls)\n"
+            )
+            text += f"- **Similarity (Jaccard):** {comparison['jaccard']:.2f}\n"
+            text += (
+                f"- **Gap:** {comparison['target_controls'] - shared} SCF controls mapped to "
+                f"{target_framework} have no {source_framework} mapping\n"
+            )
+            text += (
+                "\n*Coverage counts SCF controls mapped by both frameworks. "
+                "Use map_frameworks for requirement-level detail.*\n"
+            )
+            return [TextContent(type="text", text=text)]
+
+        metric = str(arguments.get("metric") or "jaccard").strip()
+        if metric not in CLOSEST_METRICS:
+            return [
+                TextContent(
+                    type="text",
+                    text=f"Error: metric must be one of: {', '.join(CLOSEST_METRICS)}",
+                )
+            ]
+        try:
+            limit = min(max(int(arguments.get("limit", 10) or 10), 1), 50)
+        except (ValueError, TypeError):
+            limit = 10
+
+        closest = scf_data.closest_frameworks(source_framework, limit, metric)
+        if not closest:
+            return [
+                TextContent(
+                    type="text",
+                    text=f"No frameworks share SCF controls with {source_framework}",
+                )
+            ]
+
+        text = f"**Frameworks closest to {source_name}** (by {metric})\n\n"
+        for rank, item in enumerate(closest, 1):
+            fw = scf_data.frameworks[item["target_framework"]]
+            text += (
+                f"{rank}. `{fw['key']}`: {fw['name']} — {item['target_coverage']:.1%} covered, "
+                f"Jaccard {item['jaccard']:.2f} ({item['shared_controls']} shared controls)\n"
+            )
+        text += (
+            "\n*Use compare_frameworks with target_framework for a pair, "
+            "or map_frameworks for requirement-level detail.*\n"
+        )
+        return [TextContent(type="text", text=text)]
+
+    elif name == "gap_analysis":
+        for key in ("target_frameworks", "implemented_controls", "implemented_requirements"):
+            value = arguments.get(key)
+            if value is not None and not (
+                isinstance(value, list) and all(isinstance(item, str) for item in value)
+            ):
+                return [TextContent(type="text", text=f"Error: {key} must be a list of strings.")]
+        target_frameworks = [
+            str(fw).strip() for fw in arguments.get("target_frameworks") or [] if str(fw).strip()
+        ]
+        implemented_controls = arguments.get("implemented_controls") or []
+        source_framework = str(arguments.get("source_framework") or "").strip() or None
+        implemented_requirements = arguments.get("implemented_requirements") or []
+        if not target_frameworks:
+            return [
+                TextContent(
+                    type="text",
+                    text="Error: target_frameworks is required and must not be empty. "
+                    "Use list_frameworks to discover valid framework keys.",
+                )
+            ]
+        if not implemented_controls and not implemented_requirements:
+            return [
+                TextContent(
+                    type="text",
+                    text="Error: provide implemented_controls (SCF IDs) or "
+                    "source_framework with implemented_requirements.",
+                )
+            ]
+
+        try:
+            analysis = scf_data.gap_analysis(
+                target_frameworks[:50],
+                implemented_controls,
+                source_framework,
+                implemented_requirements,
+            )
+        except ValueError as e:
+            available = ", ".join(scf_data.frameworks.keys())
+            return [TextContent(type="text", text=f"{e}. Available: {available}")]
+
+        text = f"**Gap Analysis: {analysis['implemented_controls']} SCF controls implemented**\n"
+        if analysis["unknown_ids"]:
+            text += f"*Ignored unknown IDs: {', '.join(map(str, analysis['unknown_ids'][:20]))}*\n"
+        text += "\n"
+
+        for target in analysis["targets"]:
+            text += f"### {target['name']} (`{target['framework']}`)\n"
+            text += (
+                f"- **Requirements met:** {target['requirements_met']} of "
+                f"{target['requirements_total']} ({target['coverage']:.1%}), "
+                f"partial: {target['requirements_partial']}, "
+                f"missing: {target['requirements_missing']}\n"
+            )
+            text += (
+                f"- **SCF controls:** {target['controls_implemented']} of "
+                f"{target['controls_total']} implemented, "
+                f"weighted score {target['weighted_score']:.1%}\n"
+            )
+            if target["missing_requirements"]:
+                missing = target["missing_requirements"]
+                text += f"- **Missing:** {', '.join(missing[:10])}"
+                if len(missing) > 10:
+                    text += f" *... and {len(missing) - 10} more*"
+                text += "\n"
+            text += "\n"
+
+        text += "*Use map_frameworks to see which SCF controls close a specific gap.*\n"
+        return [TextContent(type="text", text=text)]
+
+    elif name == "baseline_delta":
+        from_framework = str(arguments.get("from_framework") or "").strip()
+        to_framework = str(arguments.get("to_framework") or "").strip()
+        if not from_framework:
+            return [
+                TextContent(
+                    type="text",
+                    text="Error: from_framework is required. "
+                    "Use list_frameworks to discover valid framework keys.",
+                )
+            ]
+
+        for label, fw_key in (("From", from_framework), ("To", to_framework)):
+            if fw_key and fw_key not in scf_data.frameworks:
+                available = ", ".join(scf_data.frameworks.keys())
+                return [
+                    TextContent(
+                        type="text",
+                        text=f"{label} framework '{fw_key}' not found. Available: {available}",
+                    )
+                ]
+
+        if not to_framework:
+            family = scf_data.baseline_family(from_framework)
+            if family is None:
+                return [
+                    TextContent(
+                        type="text",
+                        text=f"{from_framework} is not part of a known baseline family. "
+                        "Pass to_framework to diff it against any other framework.",
+                    )
+                ]
+
+            text = f"**Baseline family: {family['family']}**\n\n"
+            for level in family["levels"]:
+                marker = " ← you are here" if level["framework"] == from_framework else ""
+                text += f"- `{level['framework']}`: {level['controls']} SCF controls{marker}\n"
+
+            contained_in = family["subset_of"][from_framework]
+            text += "\n**Contained in:** "
+            text += ", ".join(f"`{fw_key}`" for fw_key in contained_in) if contained_in else "none"
+            text += "\n"
+            for pair in family["equivalent"]:
+                if from_framework in pair:
+                    text += f"**Same SCF controls as:** `{pair[1 - pair.index(from_framework)]}`\n"
+
+            text += "\n**Upgrade steps:**\n"
+            for step in family["steps"]:
+                text += f"- `{step['from']}` → `{step['to']}`: +{step['added']} SCF controls\n"
+            text += "\n*Pass to_framework to list the controls a step adds.*\n"
+            return [TextContent(type="text", text=text)]
+
+        delta = scf_data.baseline_delta(from_framework, to_framework)
+        from_name = scf_data.frameworks[from_framework]["name"]
+        to_name = scf_data.frameworks[to_framework]["name"]
+
+        text = f"**Baseline delta: {from_name} → {to_name}**\n\n"
+        text += (
+            f"- **SCF controls:** {delta['from_controls']} → {delta['to_controls']}\n"
+            f"- **To add:** {len(delta['added'])}\n"
+        )
+        if delta["is_subset"]:
+            text += f"- {from_framework} is fully contained in {to_framework}\n"
+        else:
+            text += (
+                f"- **No longer required:** {len(delta['removed'])} "
+                f"({from_framework} is not a subset of {to_framework})\n"
+            )
+
+        if delta["added"]:
+            text += "\n**Controls to add:**\n"
+            for ctrl in delta["added"][:50]:
+                text += (
+                    f"- **{ctrl['scf_id']}**: {ctrl['scf_name']} "
+                    f"({', '.join(ctrl['framework_control_ids'][:5])})\n"
+                )
+            if len(delta["added"]) > 50:
+                text += f"\n*Showing first 50 of {len(delta['added'])} controls to add*\n"
+
+        if delta["removed"]:
+            text += "\n**No longer required:**\n"
+            for ctrl in delta["removed"][:20]:
+                text += f"- **{ctrl['scf_id']}**: {ctrl['scf_name']}\n"
+            if len(delta["removed"]) > 20:
+                text += f"\n*Showing first 20 of {len(delta['removed'])}*\n"
+
+        return [TextContent(type="text", text=text)]
+
+    elif name == "related_controls":
+        control_id = str(arguments.get("control_id") or "").strip()
+        if not control_id:
+            return [
+                TextContent(
+                    type="text",
+                    text="Error: control_id is required and must not be empty. "
+                    "Use search_controls to discover valid control IDs (e.g., GOV-01, IAC-05).",
+                )
+            ]
+        control = scf_data.get_control(control_id)
+        if not control:
+            return [
+                TextContent(
+                    type="text",
+                    text=f"Control {control_id} not found. Use search_controls to find controls.",
+                )
+            ]
+
+        try:
+            limit = min(max(int(arguments.get("limit", 10) or 10), 1), 20)
+        except (TypeError, ValueError):
+            limit = 10
+        metric = arguments.get("metric", "jaccard")
+        try:
+            related = scf_data.related_controls(control["id"], limit, metric)
+        except ValueError as e:
+            return [TextContent(type="text", text=f"Error: {e}")]
+
+        text = f"**Controls related to {control['id']}: {control['name']}**\n"
+        text += f"*Ranked by {metric} similarity of mapped framework requirements*\n\n"
+        if not related:
+            text += "No other control shares a framework requirement with this control.\n"
+            return [TextContent(type="text", text=text)]
+
+        for item in related:
+            text += (
+                f"- **{item['scf_id']}**: {item['scf_name']} ({item['domain']}) - "
+                f"{item['shared_requirements']} shared requirements, "
+                f"jaccard {item['jaccard']:.2f}, cosine {item['cosine']:.2f}\n"
+            )
+        text += "\n*Use get_control to see a control's full framework mappings.*\n"
+        return [TextContent(type="text", text=text)]
+
     elif name == "list_available_standards":
         standards = registry.list_standards()
 
@@ -966,8 +1607,18 @@ async def main():
     # Display legal notice on startup
     print_legal_notice(registry)
 
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(read_stream, write_stream, app.create_initialization_options())
+    # Pick up standards imported while the server is running
+    watcher = StandardsWatcher(registry)
+    watcher.start()
+
+    # kill -USR1 <pid> writes the metrics to stderr (stdout carries the protocol)
+    install_dump_handler(asyncio.get_running_loop())
+
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(read_stream, write_stream, app.create_initialization_options())
+    finally:
+        await watcher.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,95 @@
+"""JSON-RPC dispatch for the serverless (Vercel) handler.
+
+Built for warm reuse of a function instance:
+
+- One event loop per instance, kept open across invocations instead of an
+  asyncio.run() (new loop) per request.
+- Only the tool engine and the data are imported: the stdio server module,
+  which holds call_tool/list_tools over SCFData, and none of the HTTP
+  server (Starlette app, upload page, middleware).
+- Responses that never change for a deployment (initialize, tools/list,
+  the GET info document) are encoded once; a request only splices in its
+  JSON-RPC id.
+
+scripts/benchmark_serverless.py measures cold and warm invocations of the
+handler locally.
+"""
+
+import asyncio
+from typing import Any, Dict, Optional
+
+from .json_codec import dumps, loads
+from .server import SERVER_VERSION, call_tool, list_tools
+
+PROTOCOL_VERSION = "2025-03-26"
+
+# One loop for the life of the instance
+_loop = asyncio.new_event_loop()
+
+
+def run(coro):
+    """Run a coroutine on the instance's event loop."""
+    return _loop.run_until_complete(coro)
+
+
+INFO = dumps(
+    {"name": "security-controls-mcp", "version": SERVER_VERSION, "protocol": "mcp-streamable-http"}
+)
+
+# Encoded "result" members of the static methods
+STATIC_RESULTS: Dict[str, bytes] = {
+    "initialize": dumps(
+        {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {"tools": {}},
+            "serverInfo": {"name": "security-controls-mcp", "version": SERVER_VERSION},
+        }
+    ),
+    "notifications/initialized": b"{}",
+    "ping": b"{}",
+    "tools/list": dumps(
+        {
+            "tools": [
+                {"name": t.name, "description": t.description, "inputSchema": t.inputSchema}
+                for t in run(list_tools())
+            ]
+        }
+    ),
+}
+
+
+def _response(request_id: Any, result: bytes) -> bytes:
+    return b'{"jsonrpc":"2.0","id":' + dumps(request_id) + b',"result":' + result + b"}"
+
+
+def _error(request_id: Any, code: int, message: str) -> bytes:
+    return dumps({"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}})
+
+
+def handle(raw: Optional[bytes]) -> bytes:
+    """Encoded JSON-RPC response to a raw request body."""
+    request_id = 1
+    if not raw:
+        return _error(request_id, -32700, "Parse error: empty request body")
+    try:
+        body = loads(raw)
+    except Exception:
+        return _error(request_id, -32700, "Parse error: invalid JSON")
+
+    try:
+        method = body.get("method")
+        params = body.get("params", {})
+        request_id = body.get("id", 1)
+
+        static = STATIC_RESULTS.get(method)
+        if static is not None:
+            return _response(request_id, static)
+
+        if method == "tools/call":
+            result = run(call_tool(params.get("name"), params.get("arguments", {})))
+            content = [{"type": "text", "text": item.text} for item in result]
+            return _response(request_id, dumps({"content": content}))
+
+        return _error(request_id, -32601, f"Method not found: {method}")
+    except Exception as e:
+        return _error(request_id, -32603, str(e))
@@ -0,0 +1,108 @@
+"""Control similarity from shared framework requirements.
+
+Each SCF control is a sparse row over (framework, requirement ID) columns.
+Two controls are related when they map to the same requirements; the
+overlap is scored with Jaccard and cosine similarity. Only the top-k
+neighbours of every control are kept, so lookups are O(k).
+
+The table is built by scripts/extract_scf_frameworks.py and shipped as a
+gzip-compressed snapshot next to scf-controls.json. SCFData builds it on
+first use when no snapshot matching the data fingerprint is available.
+"""
+
+import gzip
+import heapq
+import json
+import math
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SIMILARITY_FILE = "control-similarity.json.gz"
+
+# Ranking metrics accepted by SCFData.related_controls
+SIMILARITY_METRICS = ("jaccard", "cosine")
+
+# Neighbours kept per control and metric
+TOP_K = 20
+
+# Snapshot rows: [related SCF ID, shared requirements, jaccard, cosine]
+SimilarityTable = Dict[str, List[List[Any]]]
+
+
+def build_similarity(controls: List[Dict[str, Any]], top_k: int = TOP_K) -> SimilarityTable:
+    """Top-k related controls of every control by Jaccard and by cosine.
+
+    Computes one row of the sparse product A·Aᵀ at a time through an
+    inverted index (requirement -> controls), so only control pairs that
+    share at least one requirement are ever touched.
+    """
+    features = [
+        {
+            (fw_key, requirement_id)
+            for fw_key, mapped_ids in ctrl["framework_mappings"].items()
+            if mapped_ids
+            for requirement_id in mapped_ids
+        }
+        for ctrl in controls
+    ]
+    postings: Dict[tuple, List[int]] = {}
+    for position, row in enumerate(features):
+        for feature in row:
+            postings.setdefault(feature, []).append(position)
+
+    table: SimilarityTable = {}
+    for i, row in enumerate(features):
+        if not row:
+            continue
+        shared_counts = Counter(j for feature in row for j in postings[feature])
+        del shared_counts[i]
+
+        size = len(row)
+        scored = []
+        for j, shared in shared_counts.items():
+            other = len(features[j])
+            scored.append(
+                (j, shared, shared / (size + other - shared), shared / math.sqrt(size * other))
+            )
+
+        # Keep the top-k by each metric; ties go to more shared requirements,
+        # then catalog order
+        best = heapq.nlargest(top_k, scored, key=lambda r: (r[2], r[1], -r[0]))
+        best += heapq.nlargest(top_k, scored, key=lambda r: (r[3], r[1], -r[0]))
+        seen = set()
+        entries = []
+        for j, shared, jaccard, cosine in best:
+            if j not in seen:
+                seen.add(j)
+                entries.append([controls[j]["id"], shared, round(jaccard, 4), round(cosine, 4)])
+        table[controls[i]["id"]] = entries
+    return table
+
+
+def write_similarity_snapshot(
+    controls: List[Dict[str, Any]], fingerprint: str, output_dir: Path
+) -> Path:
+    """Build the similarity table and write it to output_dir."""
+    snapshot = {
+        "fingerprint": fingerprint,
+        "top_k": TOP_K,
+        "related": build_similarity(controls),
+    }
+    raw = json.dumps(snapshot, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    path = Path(output_dir) / SIMILARITY_FILE
+    path.write_bytes(gzip.compress(raw, compresslevel=9, mtime=0))
+    return path
+
+
+def load_similarity_snapshot(path: Path, fingerprint: str) -> Optional[SimilarityTable]:
+    """Load a snapshot, or None if it is missing or built from other data."""
+    if not path.is_file():
+        return None
+    try:
+        snapshot = json.loads(gzip.decompress(path.read_bytes()))
+    except (OSError, ValueError):
+        return None
+    if snapshot.get("fingerprint") != fingerprint:
+        return None
+    return snapshot["related"]
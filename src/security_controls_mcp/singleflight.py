@@ -0,0 +1,112 @@
+"""Single-flight coalescing of identical concurrent requests.
+
+When a workflow fans out, many agents send the same map_frameworks or
+get_framework_controls call within milliseconds. SingleFlight lets the
+first caller for a key (the leader) run the computation while identical
+calls that arrive before it finishes (followers) await the same result
+instead of recomputing it. Nothing is kept once the leader finishes: this
+is not a cache, only deduplication of work in progress.
+
+Keys are canonical JSON of (tool, arguments, data fingerprint, registry
+identity), so argument order does not matter and callers with different
+paid standards never share results. SECURITY_CONTROLS_MCP_SINGLE_FLIGHT=0
+disables it.
+
+Followers can only join while the leader is suspended. The HTTP server runs
+REST queries (pure SCFData computation) and tool calls in worker threads, so
+the event loop keeps accepting followers meanwhile. Tool calls never await,
+so awaited on the event loop they would finish before any follower could
+join; SECURITY_CONTROLS_MCP_SINGLE_FLIGHT_THREADS=0 does that anyway,
+saving the thread hop per call at the cost of coalescing tool calls.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from .metrics import SINGLE_FLIGHT_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def single_flight_from_env() -> bool:
+    """Whether to coalesce identical concurrent requests (default on)."""
+    value = os.getenv("SECURITY_CONTROLS_MCP_SINGLE_FLIGHT", "1").strip().lower()
+    return value not in ("0", "false", "no", "off")
+
+
+def single_flight_threads_from_env() -> bool:
+    """Whether to run coalesced tool calls in worker threads (default on)."""
+    value = os.getenv("SECURITY_CONTROLS_MCP_SINGLE_FLIGHT_THREADS", "1").strip().lower()
+    return value not in ("0", "false", "no", "off")
+
+
+def request_key(*parts: Any) -> str:
+    """Canonical key for a request: JSON of its parts with sorted object keys."""
+    return json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class SingleFlight:
+    """Shares the result of an in-flight computation with identical callers."""
+
+    def __init__(self, name: str):
+        """Initialize the group.
+
+        Args:
+            name: Label of the group in the metrics (e.g. "tools")
+        """
+        self.name = name
+        self.leaders = 0
+        self.coalesced = 0
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Await func() for key, or the result of the identical call in flight.
+
+        Exceptions of the leader are raised to every caller. If the leader
+        is cancelled, a waiting follower takes over as the new leader.
+        """
+        while True:
+            future = self._in_flight.get(key)
+            if future is None:
+                break
+            self.coalesced += 1
+            SINGLE_FLIGHT_REQUESTS.inc(flight=self.name, role="follower")
+            try:
+                # Shielded: a cancelled follower must not cancel the leader's result
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        self.leaders += 1
+        SINGLE_FLIGHT_REQUESTS.inc(flight=self.name, role="leader")
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieved here, so an error without followers is not logged as unhandled
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Group statistics."""
+        return {
+            "in_flight": len(self._in_flight),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
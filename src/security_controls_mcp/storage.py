@@ -0,0 +1,288 @@
+"""On-disk storage formats for imported standards.
+
+Two formats are supported:
+
+- JSON: ``full_text.json`` holding the extracted structure (sections with
+  nested subsections, annexes with controls). Simple, but the whole file has
+  to be parsed and kept in memory.
+- Compact: ``clauses-<hash>.bin`` holds each clause's content
+  zlib-compressed (identical content stored once), ``clauses.idx.json``
+  holds clause IDs, titles, pages and blob offsets, and
+  ``tokens-<hash>.json`` maps lowercase word tokens to clause positions for
+  search. Only the index is loaded up front; content is decompressed per
+  clause on demand.
+
+The blob and token files are named after their content and the index names
+them, so rewriting a standard never changes a file an existing index points
+into: the new files are written first and the index is replaced last, in
+one rename. Indexes written before content-named files (plain
+``clauses.bin`` / ``tokens.json``) are still read.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+FULL_TEXT_FILE = "full_text.json"
+COMPACT_INDEX_FILE = "clauses.idx.json"
+COMPACT_BLOB_FILE = "clauses.bin"
+TOKEN_INDEX_FILE = "tokens.json"
+COMPACT_BLOB_SUFFIX = ".bin"
+
+COMPACT_FORMAT = "compact-v1"
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Depth cap for nested subsections, guarding against adversarial imports
+MAX_SECTION_DEPTH = 20
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _iterate_sections(sections: List[Dict], _depth: int = 0) -> Iterator[Dict]:
+    """Recursively iterate through sections and subsections (depth-first)."""
+    if _depth > MAX_SECTION_DEPTH:
+        return
+    for section in sections:
+        yield section
+        if "subsections" in section:
+            yield from _iterate_sections(section["subsections"], _depth + 1)
+
+
+def flatten_clauses(full_text: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flatten an extracted structure into an ordered list of clause records.
+
+    Sections come first (depth-first), then annex controls. Accepts both the
+    ``{"structure": {...}}`` wrapper and a bare structure dict.
+
+    Args:
+        full_text: Parsed full_text.json content
+
+    Returns:
+        List of dicts with id, title, content, page, section_type and
+        listing_type (the shorter type shown by get_all_clauses)
+    """
+    structure = full_text.get("structure", full_text)
+    clauses = []
+
+    for section in _iterate_sections(structure.get("sections", [])):
+        clauses.append(
+            {
+                "id": section["id"],
+                "title": section["title"],
+                "content": section.get("content", ""),
+                "page": section.get("page"),
+                "section_type": "section",
+                "listing_type": "section",
+            }
+        )
+
+    for annex in structure.get("annexes", []):
+        for control in annex.get("controls", []):
+            clauses.append(
+                {
+                    "id": control["id"],
+                    "title": control["title"],
+                    "content": control.get("content", ""),
+                    "page": control.get("page"),
+                    "section_type": f"Annex {annex['id']} - {control.get('category', 'control')}",
+                    "listing_type": f"Annex {annex['id']}",
+                }
+            )
+
+    return clauses
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write bytes to a temp file next to path, then rename it into place."""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _content_name(name: str, data: bytes) -> str:
+    """File name with a hash of its content: clauses.bin -> clauses-<hash>.bin."""
+    stem, suffix = os.path.splitext(name)
+    return f"{stem}-{hashlib.sha256(data).hexdigest()[:16]}{suffix}"
+
+
+def _data_files(index: Dict[str, Any]) -> List[str]:
+    """Blob and token file names an index points to."""
+    return [index.get("blob", COMPACT_BLOB_FILE), index.get("tokens", TOKEN_INDEX_FILE)]
+
+
+def _data_file(standard_path: Path, name: str) -> Path:
+    # Names come from the index; never let one point outside the directory
+    if Path(name).name != name:
+        raise ValueError(f"Invalid file name in clause index: {name}")
+    return standard_path / name
+
+
+def _remove_stale_files(output_dir: Path, keep: Set[str]) -> None:
+    """Remove blob and token files no longer referenced by the current or previous index."""
+    for path in output_dir.iterdir():
+        is_blob = path.name.startswith("clauses") and path.suffix == COMPACT_BLOB_SUFFIX
+        is_tokens = path.name.startswith("tokens") and path.suffix == ".json"
+        if (is_blob or is_tokens) and path.name not in keep:
+            path.unlink(missing_ok=True)
+
+
+def write_compact_standard(full_text: Dict[str, Any], output_dir: Path) -> Dict[str, int]:
+    """Write a standard's structure in the compact format.
+
+    The content-named blob and token files are written first and the index
+    last, so a reader always sees an index together with the files it
+    points into. Files of the previous index are kept for readers that
+    loaded it just before the swap; older ones are removed.
+
+    Args:
+        full_text: Extracted structure (same shape as full_text.json)
+        output_dir: Standard directory to write into
+
+    Returns:
+        Stats with clause count, unique content blocks and blob size in bytes
+    """
+    clauses = flatten_clauses(full_text)
+
+    blob = bytearray()
+    offsets: Dict[str, List[int]] = {}
+    entries = []
+    tokens: Dict[str, Set[int]] = {}
+
+    for position, clause in enumerate(clauses):
+        content = clause["content"] or ""
+        if content not in offsets:
+            compressed = zlib.compress(content.encode("utf-8"), 9)
+            offsets[content] = [len(blob), len(compressed)]
+            blob.extend(compressed)
+        offset, length = offsets[content]
+        entries.append(
+            [
+                clause["id"],
+                clause["title"],
+                clause["page"],
+                clause["section_type"],
+                clause["listing_type"],
+                offset,
+                length,
+            ]
+        )
+        for token in set(tokenize(f"{clause['title']} {content}")):
+            tokens.setdefault(token, set()).add(position)
+
+    token_index = {token: sorted(positions) for token, positions in sorted(tokens.items())}
+    token_bytes = json.dumps(token_index, separators=(",", ":")).encode()
+    blob_name = _content_name(COMPACT_BLOB_FILE, bytes(blob))
+    token_name = _content_name(TOKEN_INDEX_FILE, token_bytes)
+    index = {
+        "format": COMPACT_FORMAT,
+        "codec": "zlib",
+        "blob": blob_name,
+        "tokens": token_name,
+        "clauses": entries,
+    }
+
+    keep = {blob_name, token_name}
+    try:
+        with open(output_dir / COMPACT_INDEX_FILE, "r", encoding="utf-8") as f:
+            keep.update(_data_files(json.load(f)))
+    except (OSError, ValueError):
+        pass
+
+    _write_atomic(output_dir / blob_name, bytes(blob))
+    _write_atomic(output_dir / token_name, token_bytes)
+    _write_atomic(
+        output_dir / COMPACT_INDEX_FILE,
+        json.dumps(index, separators=(",", ":"), ensure_ascii=False).encode("utf-8"),
+    )
+    _remove_stale_files(output_dir, keep)
+
+    return {"clauses": len(entries), "content_blocks": len(offsets), "blob_bytes": len(blob)}
+
+
+def has_compact_format(standard_path: Path) -> bool:
+    """Check whether a standard directory holds the compact format."""
+    return (standard_path / COMPACT_INDEX_FILE).exists()
+
+
+class CompactClauseStore:
+    """Read-only access to a standard stored in the compact format."""
+
+    def __init__(self, standard_path: Path):
+        """Load the clause index and map the content blob.
+
+        Args:
+            standard_path: Standard directory containing the compact files
+        """
+        with open(standard_path / COMPACT_INDEX_FILE, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("format") != COMPACT_FORMAT:
+            raise ValueError(f"Unsupported standard format: {index.get('format')}")
+
+        self.clauses: List[Dict[str, Any]] = []
+        self._spans: List[tuple] = []
+        for clause_id, title, page, section_type, listing_type, offset, length in index["clauses"]:
+            self.clauses.append(
+                {
+                    "id": clause_id,
+                    "title": title,
+                    "page": page,
+                    "section_type": section_type,
+                    "listing_type": listing_type,
+                }
+            )
+            self._spans.append((offset, length))
+
+        blob_name, token_name = _data_files(index)
+        token_file = _data_file(standard_path, token_name)
+        self._tokens: Optional[Dict[str, List[int]]] = None
+        if token_file.exists():
+            with open(token_file, "r", encoding="utf-8") as f:
+                self._tokens = json.load(f)
+
+        blob_file = _data_file(standard_path, blob_name)
+        self.blob_size = blob_file.stat().st_size
+        self._blob: Any = b""
+        if self.blob_size:
+            with open(blob_file, "rb") as f:
+                self._blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def content(self, position: int) -> str:
+        """Decompress the content of the clause at the given position."""
+        offset, length = self._spans[position]
+        if not length:
+            return ""
+        return zlib.decompress(self._blob[offset : offset + length]).decode("utf-8")
+
+    def candidates(self, query: str) -> Optional[List[int]]:
+        """Positions of clauses that may contain the query, in clause order.
+
+        Each query token must appear inside some token of the clause, so the
+        result is a superset of substring matches and callers must verify.
+
+        Returns:
+            Sorted positions, or None if the token index cannot narrow the search
+        """
+        query_tokens = set(tokenize(query))
+        if self._tokens is None or not query_tokens:
+            return None
+
+        result: Optional[Set[int]] = None
+        for query_token in query_tokens:
+            matches: Set[int] = set()
+            for token, positions in self._tokens.items():
+                if query_token in token:
+                    matches.update(positions)
+            result = matches if result is None else result & matches
+            if not result:
+                return []
+        return sorted(result)
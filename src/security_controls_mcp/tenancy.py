@@ -0,0 +1,215 @@
+"""Tenant-scoped paid standards for the HTTP server.
+
+By default the HTTP server has one registry and every caller sees the same
+paid standards. When SECURITY_CONTROLS_MCP_TENANTS_FILE points to a tenants
+file, each tenant gets its own config directory and registry, and a request
+only ever sees the standards of the tenant its API key belongs to:
+
+    {
+      "tenants": {
+        "team-a": {
+          "config_dir": "/srv/scf/team-a",
+          "api_key_sha256": ["<sha256 hex digest of the API key>"]
+        }
+      }
+    }
+
+The API key is read from ``X-API-Key`` or ``Authorization: Bearer``. Behind a
+gateway that authenticates callers itself, set
+SECURITY_CONTROLS_MCP_TRUST_TENANT_HEADER=1 to select tenants with
+``X-Tenant-ID``. Requests without credentials get no paid standards.
+
+All tenant registries load providers through one shared ProviderCache, so
+memory stays bounded and identical standard files are loaded once.
+"""
+
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+from .config import Config
+from .provider_cache import ProviderCache
+from .registry import StandardRegistry
+from .watcher import StandardsWatcher
+
+logger = logging.getLogger(__name__)
+
+TENANT_HEADER = "x-tenant-id"
+API_KEY_HEADER = "x-api-key"
+
+_current_registry: contextvars.ContextVar[Optional[StandardRegistry]] = contextvars.ContextVar(
+    "current_registry", default=None
+)
+
+
+class TenantAuthError(Exception):
+    """Raised when a request presents an unknown API key or tenant."""
+
+
+def hash_api_key(api_key: str) -> str:
+    """SHA-256 hex digest of an API key, as stored in the tenants file."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+def current_registry(default: StandardRegistry) -> StandardRegistry:
+    """Get the registry selected for the current request, or default."""
+    registry = _current_registry.get()
+    return default if registry is None else registry
+
+
+@contextmanager
+def use_registry(registry: StandardRegistry) -> Iterator[StandardRegistry]:
+    """Select the registry for the current request."""
+    token = _current_registry.set(registry)
+    try:
+        yield registry
+    finally:
+        _current_registry.reset(token)
+
+
+def _api_key_from_headers(headers: Mapping[str, str]) -> Optional[str]:
+    api_key = headers.get(API_KEY_HEADER)
+    if api_key:
+        return api_key
+    authorization = headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token.strip():
+        return token.strip()
+    return None
+
+
+class TenantRegistries:
+    """Per-tenant standard registries sharing one provider cache."""
+
+    def __init__(
+        self,
+        tenants: Dict[str, Dict[str, Any]],
+        provider_cache: Optional[ProviderCache] = None,
+        trust_tenant_header: bool = False,
+    ):
+        """Load a registry for every tenant.
+
+        Args:
+            tenants: Tenant ID -> {"config_dir": ..., "api_key_sha256": [...]}
+            provider_cache: Shared provider cache. If None, creates one with
+                the budget from the environment.
+            trust_tenant_header: Select tenants by X-Tenant-ID without an API key
+
+        Raises:
+            ValueError: If the tenant definitions are invalid
+        """
+        self.provider_cache = provider_cache or ProviderCache()
+        self.trust_tenant_header = trust_tenant_header
+        self.registries: Dict[str, StandardRegistry] = {}
+        self._key_to_tenant: Dict[str, str] = {}
+        self._watchers: Dict[str, StandardsWatcher] = {}
+
+        for tenant_id, tenant in tenants.items():
+            for key_hash in tenant.get("api_key_sha256", []):
+                key_hash = key_hash.lower()
+                if key_hash in self._key_to_tenant:
+                    raise ValueError(f"API key of tenant '{tenant_id}' is already in use")
+                self._key_to_tenant[key_hash] = tenant_id
+            self.registries[tenant_id] = self._load_registry(tenant_id, tenant)
+
+        # Callers without credentials: an empty config dir, so no paid standards
+        anonymous_dir = Path(tempfile.mkdtemp(prefix="security-controls-mcp-anonymous-"))
+        self.anonymous = StandardRegistry(Config(anonymous_dir), provider_cache=self.provider_cache)
+
+    def _load_registry(self, tenant_id: str, tenant: Dict[str, Any]) -> StandardRegistry:
+        if "config_dir" not in tenant:
+            raise ValueError(f"Tenant '{tenant_id}' has no config_dir")
+        config_dir = Path(tenant["config_dir"]).expanduser()
+        config = Config(config_dir)
+        # Config falls back to a shared temp directory when config_dir is not
+        # writable, which would expose one tenant's standards to another
+        if config.config_dir != config_dir:
+            raise ValueError(
+                f"Config directory of tenant '{tenant_id}' is not usable: {config_dir}"
+            )
+        return StandardRegistry(config, provider_cache=self.provider_cache)
+
+    def resolve(self, headers: Mapping[str, str]) -> Optional[str]:
+        """Get the tenant ID for a request from its headers.
+
+        Args:
+            headers: Request headers (lowercase names)
+
+        Returns:
+            The tenant ID, or None for requests without credentials
+
+        Raises:
+            TenantAuthError: If the API key or tenant is unknown
+        """
+        header_tenant = headers.get(TENANT_HEADER)
+        api_key = _api_key_from_headers(headers)
+
+        if api_key:
+            tenant_id = self._key_to_tenant.get(hash_api_key(api_key))
+            if tenant_id is None:
+                raise TenantAuthError("Invalid API key")
+            if header_tenant and header_tenant != tenant_id:
+                raise TenantAuthError("API key does not belong to the requested tenant")
+            return tenant_id
+
+        if header_tenant and self.trust_tenant_header:
+            if header_tenant not in self.registries:
+                raise TenantAuthError(f"Unknown tenant: {header_tenant}")
+            return header_tenant
+
+        return None
+
+    def registry_for(self, tenant_id: Optional[str]) -> StandardRegistry:
+        """Get the registry of a tenant (the anonymous registry for None)."""
+        if tenant_id is None:
+            return self.anonymous
+        return self.registries[tenant_id]
+
+    def start(self) -> None:
+        """Start hot reload for every tenant registry."""
+        for tenant_id, registry in self.registries.items():
+            if tenant_id not in self._watchers:
+                watcher = StandardsWatcher(registry)
+                watcher.start()
+                self._watchers[tenant_id] = watcher
+
+    async def stop(self) -> None:
+        """Stop hot reload."""
+        for watcher in self._watchers.values():
+            await watcher.stop()
+        self._watchers.clear()
+
+
+def load_tenant_registries() -> Optional[TenantRegistries]:
+    """Create tenant registries from SECURITY_CONTROLS_MCP_TENANTS_FILE.
+
+    Returns:
+        TenantRegistries, or None if no tenants file is configured
+    """
+    tenants_file = os.getenv("SECURITY_CONTROLS_MCP_TENANTS_FILE")
+    if not tenants_file:
+        return None
+
+    path = Path(tenants_file).expanduser()
+    with open(path, "r") as f:
+        tenants = json.load(f).get("tenants", {})
+
+    # Relative config directories are relative to the tenants file
+    for tenant in tenants.values():
+        if "config_dir" in tenant and not Path(tenant["config_dir"]).expanduser().is_absolute():
+            tenant["config_dir"] = str(path.parent / tenant["config_dir"])
+
+    trust_header = os.getenv("SECURITY_CONTROLS_MCP_TRUST_TENANT_HEADER", "").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    registries = TenantRegistries(tenants, trust_tenant_header=trust_header)
+    logger.info(f"Loaded {len(registries.registries)} tenant(s) from {path}")
+    return registries
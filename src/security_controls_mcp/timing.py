@@ -0,0 +1,207 @@
+"""Per-request phase timers reported as Server-Timing.
+
+ServerTimingMiddleware starts a PhaseTimer for each HTTP request. Code on
+the dispatch path marks its phases with `phase()` or `@timed_phase`:
+
+- parse: reading and decoding the request body
+- search: SCFData queries (search, mapping, framework and gap lookups)
+- enrichment: paid-standard provider and registry calls
+- render: building tool results (time in call_tool not spent in the above)
+- encode: JSON / SSE serialization
+
+Times are exclusive: a nested phase pauses the one around it, so the
+phases add up to (at most) the request's total. The breakdown is sent as a
+Server-Timing header and, optionally, logged as one JSON line per request.
+
+Enabled with SECURITY_CONTROLS_MCP_SERVER_TIMING=1 (header) and/or
+SECURITY_CONTROLS_MCP_TIMING_LOG=1 (log line). When both are off the
+middleware is not installed and each marked call costs one ContextVar
+lookup. This module does not import Starlette, so the data layer can use
+it without pulling in the web stack.
+"""
+
+import inspect
+import logging
+import os
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Dict, List, Optional
+
+from .json_codec import dumps_text
+
+logger = logging.getLogger(__name__)
+
+PHASES = ("parse", "search", "enrichment", "render", "encode")
+
+_current: ContextVar[Optional["PhaseTimer"]] = ContextVar("phase_timer", default=None)
+
+
+def _flag_from_env(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def server_timing_from_env() -> bool:
+    """Whether to send Server-Timing headers."""
+    return _flag_from_env("SECURITY_CONTROLS_MCP_SERVER_TIMING")
+
+
+def timing_log_from_env() -> bool:
+    """Whether to log a structured timing line per request."""
+    return _flag_from_env("SECURITY_CONTROLS_MCP_TIMING_LOG")
+
+
+class PhaseTimer:
+    """Exclusive time per phase for one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        # Extra fields for the log line (e.g. the MCP tool name)
+        self.labels: Dict[str, Any] = {}
+        # [phase, start of its current slice]
+        self._stack: List[list] = []
+
+    def enter(self, name: str) -> None:
+        now = time.perf_counter()
+        if self._stack:
+            outer = self._stack[-1]
+            self.phases[outer[0]] = self.phases.get(outer[0], 0.0) + now - outer[1]
+        self._stack.append([name, now])
+
+    def exit(self) -> None:
+        now = time.perf_counter()
+        name, started = self._stack.pop()
+        self.phases[name] = self.phases.get(name, 0.0) + now - started
+        if self._stack:
+            self._stack[-1][1] = now
+
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def header(self) -> str:
+        """Server-Timing header value, durations in milliseconds."""
+        entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.phases.items()]
+        entries.append(f"total;dur={self.total() * 1000:.2f}")
+        return ", ".join(entries)
+
+
+class _Phase:
+    __slots__ = ("timer", "name")
+
+    def __init__(self, timer: PhaseTimer, name: str):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.timer.enter(self.name)
+
+    def __exit__(self, *exc_info):
+        self.timer.exit()
+
+
+class _NoPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NO_PHASE = _NoPhase()
+
+
+def phase(name: str):
+    """Context manager timing a block as `name` if a request is being timed."""
+    timer = _current.get()
+    return _NO_PHASE if timer is None else _Phase(timer, name)
+
+
+def annotate(**labels: Any) -> None:
+    """Add fields to the timing log line of the current request, if timed."""
+    timer = _current.get()
+    if timer is not None:
+        timer.labels.update(labels)
+
+
+def timed_phase(name: str):
+    """Decorator timing calls of a function (sync or async) as `name`."""
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                timer = _current.get()
+                if timer is None:
+                    return await func(*args, **kwargs)
+                with _Phase(timer, name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            timer = _current.get()
+            if timer is None:
+                return func(*args, **kwargs)
+            with _Phase(timer, name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware timing request phases (see module docstring)."""
+
+    def __init__(self, app, header: bool = True, log: bool = False):
+        """Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI app
+            header: Send the breakdown as a Server-Timing response header
+            log: Log one JSON line per request with the breakdown
+        """
+        self.app = app
+        self.header = header
+        self.log = log
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timer = PhaseTimer()
+        status = None
+
+        async def send_with_timing(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.header:
+                    headers = [*message["headers"], (b"server-timing", timer.header().encode())]
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        token = _current.set(timer)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if self.log:
+                record = {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status,
+                    "total_ms": round(timer.total() * 1000, 2),
+                    **timer.labels,
+                }
+                record.update(
+                    (f"{name}_ms", round(seconds * 1000, 2))
+                    for name, seconds in timer.phases.items()
+                )
+                logger.info(dumps_text(record))
@@ -0,0 +1,128 @@
+"""Hot reload of imported standards.
+
+Polls config.json and the standards directory for changes (mtime/size) and
+reloads only new or changed standards, so `scf-mcp-import import-standard`
+takes effect without restarting the server.
+"""
+
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .metrics import STANDARDS_RELOAD_DURATION
+from .registry import StandardRegistry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RELOAD_INTERVAL = 5.0
+
+
+def reload_interval_from_env() -> float:
+    """Get the polling interval in seconds from the environment.
+
+    SECURITY_CONTROLS_MCP_RELOAD_INTERVAL=0 disables hot reload.
+    """
+    value = os.getenv("SECURITY_CONTROLS_MCP_RELOAD_INTERVAL")
+    if value is None:
+        return DEFAULT_RELOAD_INTERVAL
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        logger.warning(f"Invalid SECURITY_CONTROLS_MCP_RELOAD_INTERVAL '{value}', using default")
+        return DEFAULT_RELOAD_INTERVAL
+
+
+class StandardsWatcher:
+    """Watches the config file and standards directory and refreshes a registry."""
+
+    def __init__(self, registry: StandardRegistry, interval: Optional[float] = None):
+        """Initialize the watcher.
+
+        Args:
+            registry: The registry to refresh when files change
+            interval: Polling interval in seconds. If None, read from environment.
+        """
+        self.registry = registry
+        self.interval = reload_interval_from_env() if interval is None else interval
+        self._last_snapshot = self.snapshot()
+        self._task: Optional[asyncio.Task] = None
+
+    def snapshot(self) -> Tuple:
+        """Stat config.json and every file one level below each standard directory."""
+        config = self.registry.config
+        entries = [self._stat(config.config_file)]
+        try:
+            standard_dirs = sorted(p for p in config.standards_dir.iterdir() if p.is_dir())
+        except OSError:
+            standard_dirs = []
+        for standard_dir in standard_dirs:
+            try:
+                files = sorted(p for p in standard_dir.iterdir() if p.is_file())
+            except OSError:
+                continue
+            entries.extend(self._stat(path) for path in files)
+        return tuple(entries)
+
+    @staticmethod
+    def _stat(path: Path) -> Tuple:
+        try:
+            stat = path.stat()
+            return (str(path), stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            return (str(path),)
+
+    async def poll_once(self) -> bool:
+        """Check for changes and reload if needed.
+
+        Loading runs in a worker thread; the swap happens on the event loop so
+        request handlers never observe a partially updated registry. The
+        snapshot is only recorded once a reload has been applied, so a reload
+        that fails or finds nothing to load (e.g. a half-written file) is
+        retried on the next poll.
+
+        Returns:
+            True if the registry was updated
+        """
+        snapshot = await asyncio.to_thread(self.snapshot)
+        if snapshot == self._last_snapshot:
+            return False
+
+        with STANDARDS_RELOAD_DURATION.time():
+            prepared = await asyncio.to_thread(self.registry.prepare_reload)
+        if prepared is None:
+            return False
+
+        self.registry.apply_reload(prepared)
+        self._last_snapshot = snapshot
+        logger.info(f"Reloaded paid standards: {', '.join(prepared.providers) or 'none'}")
+        return True
+
+    async def run(self) -> None:
+        """Poll until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.poll_once()
+            except Exception as e:
+                # Never let a bad import take the watcher down
+                logger.error(f"Error reloading standards: {e}", exc_info=True)
+
+    def start(self) -> Optional[asyncio.Task]:
+        """Start polling in the background (no-op if the interval is 0)."""
+        if self.interval <= 0 or self._task is not None:
+            return self._task
+        self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        """Stop background polling."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
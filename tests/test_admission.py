@@ -0,0 +1,130 @@
+"""Tests for admission control (rate limits and the concurrency cap)."""
+
+import asyncio
+import json
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from security_controls_mcp.admission import (
+    RATE_LIMITED_CODE,
+    AdmissionMiddleware,
+    ConcurrencyLimiter,
+    RateLimiter,
+    client_id,
+    concurrency_from_env,
+    rate_limit_from_env,
+)
+
+
+async def ok(request):
+    return JSONResponse({"ok": True})
+
+
+def _client(**kwargs):
+    app = Starlette(
+        routes=[Route("/api/x", ok), Route("/health", ok), Route("/mcp", ok, methods=["POST"])]
+    )
+    return TestClient(AdmissionMiddleware(app, exempt_paths=("/health",), **kwargs))
+
+
+class TestRateLimiter:
+    def test_burst_then_refill(self):
+        limiter = RateLimiter(rate=2, burst=3)
+        assert [limiter.check("a", now=0.0) for _ in range(3)] == [0, 0, 0]
+        assert limiter.check("a", now=0.0) == pytest.approx(0.5)
+        assert limiter.check("a", now=0.5) == 0
+        # Other clients have their own bucket
+        assert limiter.check("b", now=0.5) == 0
+
+    def test_client_count_is_bounded(self):
+        limiter = RateLimiter(rate=1, burst=1, max_clients=2)
+        for client in ("a", "b", "c"):
+            limiter.check(client, now=0.0)
+        assert limiter.clients() == 2
+
+    def test_env(self, monkeypatch):
+        assert rate_limit_from_env()[0] == 0
+        monkeypatch.setenv("SECURITY_CONTROLS_MCP_RATE_LIMIT", "5")
+        assert rate_limit_from_env() == (5, 10)
+        monkeypatch.setenv("SECURITY_CONTROLS_MCP_MAX_CONCURRENCY", "lots")
+        assert concurrency_from_env()[0] == 64
+
+
+class TestConcurrencyLimiter:
+    def test_queue_and_handover(self):
+        async def main():
+            limiter = ConcurrencyLimiter(limit=1, max_queue=1, timeout=1.0)
+            assert await limiter.acquire()
+            waiting = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0)
+            assert limiter.queued == 1
+            # Queue full: rejected at once
+            assert not await limiter.acquire()
+            limiter.release()
+            assert await waiting
+            assert limiter.active == 1
+            limiter.release()
+            assert limiter.active == 0
+
+        asyncio.run(main())
+
+    def test_queue_timeout(self):
+        async def main():
+            limiter = ConcurrencyLimiter(limit=1, max_queue=5, timeout=0.01)
+            assert await limiter.acquire()
+            assert not await limiter.acquire()
+            assert limiter.queued == 0
+
+        asyncio.run(main())
+
+
+class TestClientId:
+    def _scope(self, headers, client=("10.0.0.1", 1234)):
+        return {"headers": [(k.encode(), v.encode()) for k, v in headers.items()], "client": client}
+
+    def test_api_key_is_hashed(self):
+        identity = client_id(self._scope({"authorization": "Bearer secret"}))
+        assert identity.startswith("key:") and "secret" not in identity
+        assert identity == client_id(self._scope({"x-api-key": "secret"}))
+
+    def test_address(self):
+        scope = self._scope({"x-forwarded-for": "203.0.113.9, 10.0.0.1"})
+        assert client_id(scope) == "ip:10.0.0.1"
+        assert client_id(scope, trust_forwarded_for=True) == "ip:203.0.113.9"
+
+
+class TestAdmissionMiddleware:
+    def test_rate_limited(self):
+        client = _client(rate_limiter=RateLimiter(rate=1, burst=2))
+        assert [client.get("/api/x").status_code for _ in range(2)] == [200, 200]
+        response = client.get("/api/x")
+        assert response.status_code == 429
+        assert int(response.headers["retry-after"]) >= 1
+        assert response.json()["error"] == "Too Many Requests"
+        assert client.get("/health").status_code == 200
+
+    def test_jsonrpc_rejection(self):
+        client = _client(rate_limiter=RateLimiter(rate=1, burst=1))
+        client.post("/mcp", json={})
+        response = client.post("/mcp", json={})
+        assert response.status_code == 429
+        assert response.headers["content-type"] == "text/event-stream"
+        event = json.loads(response.text.split("data: ", 1)[1])
+        assert event["error"]["code"] == RATE_LIMITED_CODE
+
+    def test_overloaded(self):
+        limiter = ConcurrencyLimiter(limit=1, max_queue=0, timeout=1.0)
+        limiter.active = 1  # every slot taken
+        response = _client(concurrency=limiter).get("/api/x")
+        assert response.status_code == 503
+        assert "retry-after" in response.headers
+
+    def test_slot_released(self):
+        limiter = ConcurrencyLimiter(limit=1, max_queue=0, timeout=1.0)
+        client = _client(concurrency=limiter)
+        assert [client.get("/api/x").status_code for _ in range(3)] == [200, 200, 200]
+        assert limiter.active == 0
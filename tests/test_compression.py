@@ -0,0 +1,129 @@
+"""Tests for the response compression middleware."""
+
+import gzip
+import zlib
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from security_controls_mcp.compression import (
+    CompressedResponseCache,
+    CompressionMiddleware,
+    negotiate_encoding,
+)
+from security_controls_mcp.http_server import app as http_app
+from security_controls_mcp.http_server import compression_cache
+
+LARGE = {"rows": [{"scf_id": f"GOV-{i:02d}", "text": "mapped requirement"} for i in range(200)]}
+calls = {"large": 0}
+
+
+async def large(request):
+    calls["large"] += 1
+    return JSONResponse(LARGE)
+
+
+async def small(request):
+    return PlainTextResponse("ok")
+
+
+async def pre_encoded(request):
+    return Response(gzip.compress(b"x" * 5000), headers={"Content-Encoding": "gzip"})
+
+
+async def rows(request):
+    return StreamingResponse(
+        (f'{{"row": {i}, "pad": "{"-" * 100}"}}\n' for i in range(100)),
+        media_type="application/x-ndjson",
+    )
+
+
+async def sse(request):
+    return StreamingResponse(
+        iter([b"event: message\ndata: {}\n\n"]), media_type="text/event-stream"
+    )
+
+
+@pytest.fixture
+def client():
+    app = Starlette(
+        routes=[
+            Route("/large", large),
+            Route("/small", small),
+            Route("/pre-encoded", pre_encoded),
+            Route("/rows", rows),
+            Route("/sse", sse),
+        ]
+    )
+    cache = CompressedResponseCache(max_bytes=1024 * 1024)
+    wrapped = CompressionMiddleware(
+        app,
+        cache_key=lambda scope: scope["path"] if scope["path"] == "/large" else None,
+        cache=cache,
+    )
+    return TestClient(wrapped)
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding("*") in ("br", "gzip")
+    assert negotiate_encoding("") is None
+
+
+class TestCompressionMiddleware:
+    """Test which responses get compressed and how."""
+
+    def test_large_body_compressed(self, client):
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert "accept-encoding" in response.headers["vary"].lower()
+        assert int(response.headers["content-length"]) < len(response.content)
+        assert response.json() == LARGE
+
+    def test_identity(self, client):
+        response = client.get("/large", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert response.json() == LARGE
+
+    def test_below_threshold_and_pre_encoded_untouched(self, client):
+        assert "content-encoding" not in client.get("/small").headers
+        response = client.get("/pre-encoded", headers={"Accept-Encoding": "gzip"})
+        assert response.content == b"x" * 5000
+
+    def test_cached_response_skips_app(self, client):
+        client.get("/large", headers={"Accept-Encoding": "gzip"})
+        before = calls["large"]
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+        assert calls["large"] == before
+        assert response.json() == LARGE
+
+    def test_stream_chunks_decodable_as_they_arrive(self, client):
+        decompressor = zlib.decompressobj(31)
+        with client.stream("GET", "/rows", headers={"Accept-Encoding": "gzip"}) as response:
+            assert response.headers["content-encoding"] == "gzip"
+            assert "content-length" not in response.headers
+            lines = b""
+            for chunk in response.iter_raw():
+                lines += decompressor.decompress(chunk)
+                # Every flushed chunk ends on a complete row
+                assert lines.endswith(b"\n")
+        assert len(lines.splitlines()) == 100
+
+    def test_small_sse_event_not_held_back(self, client):
+        response = client.get("/sse", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.text == "event: message\ndata: {}\n\n"
+
+
+def test_http_server_caches_compressed_frameworks():
+    client = TestClient(http_app)
+    first = client.get("/api/frameworks", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["content-encoding"] == "gzip"
+    hits = compression_cache.stats()["hits"]
+    second = client.get("/api/frameworks", headers={"Accept-Encoding": "gzip"})
+    assert compression_cache.stats()["hits"] == hits + 1
+    assert second.json() == first.json()
@@ -0,0 +1,66 @@
+"""Tests for precomputed crosswalk artifacts."""
+
+import gzip
+import json
+
+import pytest
+
+from security_controls_mcp.crosswalks import (
+    CROSSWALK_DIR,
+    CrosswalkStore,
+    artifact_name,
+    encode_body,
+    parse_pairs,
+    write_crosswalk_artifacts,
+)
+from security_controls_mcp.data_loader import SCFData
+
+
+@pytest.fixture(scope="module")
+def scf_data():
+    return SCFData()
+
+
+class TestCrosswalkArtifacts:
+    """Test writing and loading crosswalk artifacts."""
+
+    def test_parse_pairs(self):
+        assert parse_pairs("iso_27001_2022:dora, dora:nis2") == [
+            ("iso_27001_2022", "dora"),
+            ("dora", "nis2"),
+        ]
+        with pytest.raises(ValueError):
+            parse_pairs("iso_27001_2022")
+
+    def test_written_artifact_matches_map_frameworks(self, scf_data, tmp_path):
+        (path,) = write_crosswalk_artifacts(scf_data, [("iso_27001_2022", "dora")], tmp_path)
+        body = json.loads(gzip.decompress(path.read_bytes()))
+        assert body["fingerprint"] == scf_data.fingerprint
+        assert body["mappings"] == scf_data.map_frameworks("iso_27001_2022", "dora")
+
+    def test_stale_artifacts_removed(self, scf_data, tmp_path):
+        write_crosswalk_artifacts(scf_data, [("iso_27001_2022", "dora")], tmp_path)
+        write_crosswalk_artifacts(scf_data, [("iso_27001_2022", "nis2")], tmp_path)
+        names = {p.name for p in (tmp_path / CROSSWALK_DIR).iterdir()}
+        assert names == {artifact_name("iso_27001_2022", "nis2")}
+
+    def test_unknown_framework_rejected(self, scf_data, tmp_path):
+        with pytest.raises(ValueError):
+            write_crosswalk_artifacts(scf_data, [("iso_27001_2022", "fake")], tmp_path)
+
+    def test_store_serves_artifact(self, scf_data, tmp_path):
+        (path,) = write_crosswalk_artifacts(scf_data, [("iso_27001_2022", "dora")], tmp_path)
+        store = CrosswalkStore(scf_data, tmp_path)
+        assert store.get("iso_27001_2022", "dora") == path.read_bytes()
+
+    def test_store_ignores_artifact_from_other_data(self, scf_data, tmp_path):
+        directory = tmp_path / CROSSWALK_DIR
+        directory.mkdir()
+        stale = {"fingerprint": "000000000000", "mappings": []}
+        (directory / artifact_name("iso_27001_2022", "dora")).write_bytes(encode_body(stale))
+
+        body = json.loads(
+            gzip.decompress(CrosswalkStore(scf_data, tmp_path).get("iso_27001_2022", "dora"))
+        )
+        assert body["fingerprint"] == scf_data.fingerprint
+        assert body["count"] > 0
@@ -42,6 +42,13 @@ class TestDataLoading:
             assert "controls_mapped" in fw_data
             assert fw_data["controls_mapped"] > 0
 
+    def test_preload_indexes(self, scf_data):
+        """preload_indexes builds the indexes otherwise built on first use."""
+        scf_data.preload_indexes()
+        assert set(scf_data._requirement_bits) >= set(scf_data.frameworks)
+        assert set(scf_data._requirement_index) >= set(scf_data.frameworks)
+        assert scf_data._similarity is not None
+
 
 class TestGetControl:
     """Test get_control method."""
@@ -139,6 +146,40 @@ class TestGetFrameworkControls:
         for control in controls[:5]:  # Sample check
             assert "description" in control
 
+    def test_pages_cover_all_controls(self, scf_data):
+        """Walking the pages returns every control exactly once, grouped by domain."""
+        controls = scf_data.get_framework_controls("nist_800_53_r5")
+        paged = []
+        offset = 0
+        while True:
+            rows, total = scf_data.get_framework_controls_page("nist_800_53_r5", offset, 100)
+            paged.extend(rows)
+            offset += 100
+            if offset >= total:
+                break
+
+        assert total == len(controls) == len(paged)
+        assert sorted(row["scf_id"] for row in paged) == sorted(c["scf_id"] for c in controls)
+        domains = [row["domain"] for row in paged]
+        assert domains == sorted(domains)
+
+    def test_domain_views(self, scf_data):
+        """Domain views cover every control once, domains sorted by name."""
+        domains = scf_data.framework_domains("dora", per_domain=3)
+        assert [d["domain"] for d in domains] == sorted(d["domain"] for d in domains)
+        assert sum(d["total"] for d in domains) == len(scf_data.get_framework_controls("dora"))
+        assert all(len(d["controls"]) == min(d["total"], 3) for d in domains)
+
+    def test_reverse_index_only_framework(self, scf_data):
+        """Frameworks only in the reverse index get a view too."""
+        scf_id = scf_data.controls[0]["id"]
+        scf_data.framework_to_scf["reverse_only"] = {"R-1": [scf_id], "R-2": [scf_id]}
+        scf_data._build_framework_views()
+
+        controls = scf_data.get_framework_controls("reverse_only")
+        assert [c["framework_control_ids"] for c in controls] == [["R-1"], ["R-2"]]
+        assert scf_data.framework_domains("reverse_only")[0]["total"] == 2
+
 
 class TestMapFrameworks:
     """Test map_frameworks method."""
@@ -164,6 +205,52 @@ class TestMapFrameworks:
         assert len(annex) == len(plain)
         assert {m["scf_id"] for m in annex} == {m["scf_id"] for m in plain}
 
+    def test_source_control_normalizes_case_and_whitespace(self, scf_data):
+        """Case and stray whitespace do not change the lookup."""
+        plain = scf_data.map_frameworks("iso_27002_2022", "dora", "5.15")
+        assert scf_data.map_frameworks("iso_27002_2022", "dora", " a.5.15 ") == plain
+
+    def test_iso27001_annex_a_resolves_via_iso27002(self, scf_data):
+        """ISO 27001 Annex A IDs map through the ISO 27002 controls."""
+        annex = scf_data.map_frameworks("iso_27001_2022", "dora", "A.5.15")
+        iso27002 = scf_data.map_frameworks("iso_27002_2022", "dora", "5.15")
+
+        assert len(annex) > 0
+        assert [m["scf_id"] for m in annex] == [m["scf_id"] for m in iso27002]
+        for mapping in annex:
+            assert "A.5.15" in mapping["source_controls"]
+
+    def test_iso27001_plain_ids_stay_clauses(self, scf_data):
+        """Plain ISO 27001 IDs are management clauses, not Annex A controls."""
+        framework, positions = scf_data.lookup_requirement("iso_27001_2022", "5.1")
+        assert framework == "iso_27001_2022"
+        assert positions
+        assert scf_data.lookup_requirement("iso_27001_2022", "A.5.1")[0] == "iso_27002_2022"
+
+    def test_iter_mappings_matches_pairwise_maps(self, scf_data):
+        """One pass over many targets gives the same columns as separate calls."""
+        targets = ["dora", "nis2", "nist_csf_2.0"]
+        rows = list(scf_data.iter_mappings("iso_27002_2022", targets))
+        for target in targets:
+            pairwise = scf_data.map_frameworks("iso_27002_2022", target)
+            assert [row["scf_id"] for row in rows] == [m["scf_id"] for m in pairwise]
+            assert [row["targets"][target] for row in rows] == [
+                m["target_controls"] for m in pairwise
+            ]
+
+    def test_iter_mappings_with_source_control(self, scf_data):
+        rows = list(scf_data.iter_mappings("iso_27002_2022", ["dora", "nis2"], "5.15"))
+        assert len(rows) > 0
+        assert all("5.15" in row["source_controls"] for row in rows)
+
+    def test_pages_match_iter_mappings(self, scf_data):
+        targets = ["dora", "nis2"]
+        rows = list(scf_data.iter_mappings("nist_800_53_r5", targets))
+        first, total = scf_data.map_frameworks_page("nist_800_53_r5", targets, 0, 300)
+        rest, _ = scf_data.map_frameworks_page("nist_800_53_r5", targets, 300, total)
+        assert total == len(rows)
+        assert first + rest == rows
+
     def test_mapping_structure(self, scf_data):
         """Verify mapping result structure."""
         mappings = scf_data.map_frameworks("iso_27001_2022", "dora", "5.1")
@@ -181,6 +268,136 @@ class TestMapFrameworks:
         assert mappings == []
 
 
+class TestCompareFrameworks:
+    """Test the precomputed framework overlap matrix."""
+
+    def test_overlap_matches_map_frameworks(self, scf_data):
+        """Shared control count equals the mapped rows with a target mapping."""
+        mappings = scf_data.map_frameworks("iso_27002_2022", "dora")
+        shared = sum(1 for m in mappings if m["target_controls"])
+        comparison = scf_data.compare_frameworks("iso_27002_2022", "dora")
+        assert comparison["shared_controls"] == shared
+        assert comparison["target_controls"] == scf_data.frameworks["dora"]["controls_mapped"]
+
+    def test_matrix_is_symmetric(self, scf_data):
+        """Swapping source and target swaps the coverage ratios."""
+        forward = scf_data.compare_frameworks("iso_27002_2022", "dora")
+        backward = scf_data.compare_frameworks("dora", "iso_27002_2022")
+        assert forward["shared_controls"] == backward["shared_controls"]
+        assert forward["target_coverage"] == backward["source_coverage"]
+        assert forward["jaccard"] == backward["jaccard"]
+
+    def test_self_comparison_is_full_coverage(self, scf_data):
+        comparison = scf_data.compare_frameworks("dora", "dora")
+        assert comparison["target_coverage"] == 1.0
+        assert comparison["jaccard"] == 1.0
+
+    def test_closest_frameworks_sorted(self, scf_data):
+        closest = scf_data.closest_frameworks("dora", limit=5)
+        assert len(closest) == 5
+        assert all(item["target_framework"] != "dora" for item in closest)
+        scores = [item["jaccard"] for item in closest]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_closest_frameworks_by_coverage(self, scf_data):
+        closest = scf_data.closest_frameworks("nist_800_53_r5", limit=5, metric="coverage")
+        scores = [item["target_coverage"] for item in closest]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_closest_frameworks_invalid_metric(self, scf_data):
+        with pytest.raises(ValueError):
+            scf_data.closest_frameworks("dora", metric="cosine")
+
+    def test_shared_control_ids(self, scf_data):
+        shared = scf_data.shared_control_ids("iso_27002_2022", "dora")
+        assert len(shared) == scf_data.compare_frameworks("iso_27002_2022", "dora")["shared_controls"]
+        for scf_id in shared:
+            mappings = scf_data.get_control(scf_id)["framework_mappings"]
+            assert mappings.get("iso_27002_2022") and mappings.get("dora")
+
+
+class TestGapAnalysis:
+    """Test the multi-target gap analysis engine."""
+
+    def test_full_implementation_meets_everything(self, scf_data):
+        all_controls = [ctrl["id"] for ctrl in scf_data.controls]
+        analysis = scf_data.gap_analysis(["dora", "nis2"], all_controls)
+        for target in analysis["targets"]:
+            assert target["requirements_missing"] == 0
+            assert target["requirements_partial"] == 0
+            assert target["coverage"] == 1.0
+            assert target["weighted_score"] == 1.0
+            assert target["missing_controls"] == []
+
+    def test_no_implementation_misses_everything(self, scf_data):
+        analysis = scf_data.gap_analysis(["dora"], ["FAKE-999"])
+        target = analysis["targets"][0]
+        assert analysis["unknown_ids"] == ["FAKE-999"]
+        assert target["requirements_met"] == 0
+        assert target["requirements_missing"] == target["requirements_total"]
+        assert len(target["missing_controls"]) == scf_data.frameworks["dora"]["controls_mapped"]
+
+    def test_partial_requirements(self, scf_data):
+        """A requirement with several SCF controls is partial when only one is implemented."""
+        requirement_id, scf_ids = next(
+            (req, ids) for req, ids in scf_data.framework_to_scf["dora"].items() if len(ids) > 1
+        )
+        analysis = scf_data.gap_analysis(["dora"], [scf_ids[0]])
+        target = analysis["targets"][0]
+        assert requirement_id in target["partial_requirements"]
+        assert requirement_id not in target["missing_requirements"]
+
+    def test_requirement_ids_resolve_through_source_framework(self, scf_data):
+        by_requirement = scf_data.gap_analysis(
+            ["dora"], source_framework="iso_27002_2022", implemented_requirements=["5.15"]
+        )
+        by_control = scf_data.gap_analysis(
+            ["dora"], scf_data.framework_to_scf["iso_27002_2022"]["5.15"]
+        )
+        assert by_requirement["targets"] == by_control["targets"]
+
+    def test_unknown_framework_raises(self, scf_data):
+        with pytest.raises(ValueError):
+            scf_data.gap_analysis(["fake_framework"], ["GOV-01"])
+
+    def test_requirements_without_source_raise(self, scf_data):
+        with pytest.raises(ValueError):
+            scf_data.gap_analysis(["dora"], implemented_requirements=["5.15"])
+
+
+class TestBaselineLattice:
+    """Test the baseline containment lattice."""
+
+    def test_nist_baselines_nested(self, scf_data):
+        family = scf_data.baseline_family("nist_800_53b_r5_moderate")
+        assert family["family"] == "nist_800_53b_r5"
+        assert "nist_800_53b_r5_high" in family["subset_of"]["nist_800_53b_r5_moderate"]
+        assert any(
+            step["from"] == "nist_800_53b_r5_moderate" and step["to"] == "nist_800_53b_r5_high"
+            for step in family["steps"]
+        )
+
+    def test_steps_are_covering_pairs(self, scf_data):
+        for family in scf_data.baseline_lattice.values():
+            for step in family["steps"]:
+                between = set(family["subset_of"][step["from"]])
+                assert step["to"] in between
+                assert not any(step["to"] in family["subset_of"][c] for c in between)
+
+    def test_delta_matches_bitsets(self, scf_data):
+        delta = scf_data.baseline_delta("nist_800_53b_r5_moderate", "nist_800_53b_r5_high")
+        moderate = {
+            c["scf_id"] for c in scf_data.get_framework_controls("nist_800_53b_r5_moderate")
+        }
+        high = {c["scf_id"] for c in scf_data.get_framework_controls("nist_800_53b_r5_high")}
+        assert {c["scf_id"] for c in delta["added"]} == high - moderate
+        assert {c["scf_id"] for c in delta["removed"]} == moderate - high
+        assert delta["is_subset"] == (moderate <= high)
+
+    def test_unrelated_framework_has_no_family(self, scf_data):
+        assert scf_data.baseline_family("dora") is None
+
+
 class TestCategoryCompleteness:
     """Ensure every framework is in at least one category."""
 
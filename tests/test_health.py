@@ -0,0 +1,83 @@
+"""Tests for the liveness and readiness probes."""
+
+import json
+
+import pytest
+from starlette.testclient import TestClient
+
+from security_controls_mcp import health
+from security_controls_mcp.admission import AdmissionMiddleware
+from security_controls_mcp.health import (
+    METADATA_FILE,
+    build_metadata,
+    read_metadata,
+    readiness_body,
+    write_metadata,
+)
+from security_controls_mcp.http_server import app, scf_data
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+class TestMetadataSidecar:
+    def test_round_trip(self, tmp_path):
+        path = write_metadata(scf_data, tmp_path)
+        assert path.name == METADATA_FILE
+        metadata = read_metadata(tmp_path)
+        assert metadata["fingerprint"] == scf_data.fingerprint
+        assert metadata["controls_count"] == len(scf_data.controls)
+        assert metadata["frameworks_count"] == len(scf_data.frameworks)
+
+    def test_missing_or_invalid(self, tmp_path):
+        assert read_metadata(tmp_path) is None
+        (tmp_path / METADATA_FILE).write_text("{not json")
+        assert read_metadata(tmp_path) is None
+
+    def test_load_metadata_falls_back_to_data(self, monkeypatch):
+        monkeypatch.setattr(health, "read_metadata", lambda data_dir=None: None)
+        metadata = health.load_metadata()
+        assert metadata["fingerprint"] == scf_data.fingerprint
+        assert metadata["frameworks_count"] == len(scf_data.frameworks)
+
+    def test_health_body_keeps_serverless_shape(self):
+        body = json.loads(health.health_body(build_metadata(scf_data, "2026-01-01T00:00:00Z")))
+        assert body["status"] == "ok"
+        assert body["server"] == "security-controls-mcp"
+        assert body["controls_count"] == len(scf_data.controls)
+        assert body["frameworks_count"] == len(scf_data.frameworks)
+        assert body["data_fingerprint"] == scf_data.fingerprint
+        assert body["data_built"] == "2026-01-01T00:00:00Z"
+
+    def test_readiness_body(self):
+        ready = json.loads(readiness_body(build_metadata(scf_data, "unknown"), loaded=False))
+        assert ready["status"] == "ready"
+        assert ready["data"]["loaded"] is False
+        assert ready["data"]["fingerprint"] == scf_data.fingerprint
+        assert json.loads(readiness_body(None, loaded=False))["status"] == "unavailable"
+
+
+class TestProbeEndpoints:
+    def test_liveness(self, client):
+        response = client.get("/livez")
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+
+    def test_readiness(self, client):
+        response = client.get("/readyz")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "ready"
+        assert body["data"]["loaded"] is True
+        assert body["data"]["fingerprint"] == scf_data.fingerprint
+        assert body["data"]["controls_count"] == len(scf_data.controls)
+
+    def test_probes_not_cached(self, client):
+        for path in ("/livez", "/readyz"):
+            assert "etag" not in client.get(path).headers
+
+    def test_probes_exempt_from_admission(self):
+        admission = next(m for m in app.user_middleware if m.cls is AdmissionMiddleware)
+        assert {"/livez", "/readyz", "/health"} <= set(admission.kwargs["exempt_paths"])
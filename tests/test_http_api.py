@@ -0,0 +1,416 @@
+"""Tests for the HTTP server REST API."""
+
+import asyncio
+import json
+
+import pytest
+from starlette.testclient import TestClient
+
+from security_controls_mcp import http_server
+from security_controls_mcp.http_server import app
+
+
+@pytest.fixture
+def client():
+    """Create test client."""
+    return TestClient(app)
+
+
+class TestCompareFrameworks:
+    """Tests for the framework comparison endpoints."""
+
+    def test_compare_pair(self, client):
+        response = client.get("/api/frameworks/iso_27002_2022/compare/dora")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["source_framework"] == "iso_27002_2022"
+        assert data["target_framework"] == "dora"
+        assert 0 < data["target_coverage"] <= 1
+
+    def test_compare_unknown_framework(self, client):
+        response = client.get("/api/frameworks/iso_27002_2022/compare/fake")
+        assert response.status_code == 404
+
+    def test_closest(self, client):
+        response = client.get("/api/frameworks/dora/closest?limit=3&metric=coverage")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 3
+        assert data["metric"] == "coverage"
+
+    def test_closest_invalid_metric(self, client):
+        response = client.get("/api/frameworks/dora/closest?metric=cosine")
+        assert response.status_code == 400
+
+
+class TestRelatedControls:
+    """Tests for GET /api/controls/{control_id}/related."""
+
+    def test_related(self, client):
+        response = client.get("/api/controls/GOV-01/related?limit=5&metric=cosine")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["control_id"] == "GOV-01"
+        assert data["count"] == len(data["related"]) <= 5
+
+    def test_unknown_control(self, client):
+        assert client.get("/api/controls/FAKE-99/related").status_code == 404
+
+    def test_invalid_metric(self, client):
+        assert client.get("/api/controls/GOV-01/related?metric=dice").status_code == 400
+
+
+class TestBaselines:
+    """Tests for the baseline lattice endpoints."""
+
+    def test_lattice(self, client):
+        data = client.get("/api/baselines").json()
+        assert "nist_800_53b_r5" in {family["family"] for family in data["families"]}
+
+    def test_delta(self, client):
+        response = client.get("/api/baselines/cis_csc_8.1_ig1/delta/cis_csc_8.1_ig2")
+        assert response.status_code == 200
+        assert response.json()["to_framework"] == "cis_csc_8.1_ig2"
+
+    def test_delta_unknown_framework(self, client):
+        response = client.get("/api/baselines/cis_csc_8.1_ig1/delta/fake")
+        assert response.status_code == 404
+
+
+class TestGapAnalysis:
+    """Tests for POST /api/gap-analysis."""
+
+    def test_gap_analysis(self, client):
+        response = client.post(
+            "/api/gap-analysis",
+            json={"implemented_controls": ["GOV-01"], "target_frameworks": ["dora", "nis2"]},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert [t["framework"] for t in data["targets"]] == ["dora", "nis2"]
+        assert "missing_requirements" in data["targets"][0]
+
+    def test_gap_analysis_unknown_framework(self, client):
+        response = client.post(
+            "/api/gap-analysis",
+            json={"implemented_controls": ["GOV-01"], "target_frameworks": ["fake"]},
+        )
+        assert response.status_code == 404
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            {"target_frameworks": [["dora"]], "implemented_controls": ["GOV-01"]},
+            {"target_frameworks": ["dora"], "implemented_controls": "GOV-01"},
+            {"target_frameworks": ["dora"], "implemented_controls": [1]},
+            {
+                "target_frameworks": ["dora"],
+                "source_framework": ["iso_27002_2022"],
+                "implemented_requirements": ["5.1"],
+            },
+            {
+                "target_frameworks": ["dora"],
+                "source_framework": "iso_27002_2022",
+                "implemented_requirements": "5.1",
+            },
+        ],
+    )
+    def test_gap_analysis_rejects_wrong_types(self, client, body):
+        response = client.post("/api/gap-analysis", json=body)
+        assert response.status_code == 400
+
+    def test_mcp_gap_analysis_rejects_string_list(self):
+        result = asyncio.run(
+            http_server.call_tool(
+                "gap_analysis",
+                {"target_frameworks": ["dora"], "implemented_controls": "GOV-01"},
+            )
+        )
+        assert "implemented_controls must be a list of strings" in result[0].text
+
+    def test_gap_analysis_requires_targets(self, client):
+        response = client.post("/api/gap-analysis", json={"implemented_controls": ["GOV-01"]})
+        assert response.status_code == 400
+
+
+class TestMapFrameworks:
+    """Tests for POST /api/map."""
+
+    def test_single_target(self, client):
+        response = client.post(
+            "/api/map", json={"source_framework": "iso_27002_2022", "target_framework": "dora"}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == len(data["mappings"]) > 0
+        assert "target_controls" in data["mappings"][0]
+
+    def test_many_targets(self, client):
+        response = client.post(
+            "/api/map", json={"source_framework": "iso_27002_2022", "targets": ["dora", "nis2"]}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["targets"] == ["dora", "nis2"]
+        assert set(data["mappings"][0]["targets"]) == {"dora", "nis2"}
+
+    def test_stream_ndjson(self, client):
+        body = {"source_framework": "iso_27002_2022", "targets": ["dora", "nis2"], "stream": True}
+        response = client.post("/api/map", json=body)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+
+        body["stream"] = False
+        assert rows == client.post("/api/map", json=body).json()["mappings"]
+
+    def test_unknown_target(self, client):
+        response = client.post(
+            "/api/map", json={"source_framework": "iso_27002_2022", "targets": ["dora", "fake"]}
+        )
+        assert response.status_code == 404
+
+    @pytest.mark.parametrize("targets", ["dora", [["dora"]], [1]])
+    def test_targets_must_be_list_of_strings(self, client, targets):
+        response = client.post(
+            "/api/map", json={"source_framework": "iso_27002_2022", "targets": targets}
+        )
+        assert response.status_code == 400
+
+    def test_mcp_targets_must_be_list(self):
+        result = asyncio.run(
+            http_server.call_tool(
+                "map_frameworks", {"source_framework": "iso_27002_2022", "targets": "dora"}
+            )
+        )
+        assert "targets must be a list" in result[0].text
+
+
+class TestPagination:
+    """Tests for cursor pagination of the REST API."""
+
+    def test_walk_framework_controls(self, client):
+        seen = []
+        url = "/api/frameworks/nist_800_53_r5/controls?page_size=250"
+        cursor = None
+        while True:
+            response = client.get(url + (f"&cursor={cursor}" if cursor else ""))
+            assert response.status_code == 200
+            data = response.json()
+            seen.extend(row["scf_id"] for row in data["controls"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+        assert len(seen) == data["total"] > 250
+
+    def test_framework_domains(self, client):
+        data = client.get("/api/frameworks/dora/domains?per_domain=2").json()
+        assert sum(d["total"] for d in data["domains"]) == data["total"]
+        assert all(len(d["controls"]) <= 2 for d in data["domains"])
+
+    def test_walk_map(self, client):
+        body = {"source_framework": "nist_800_53_r5", "targets": ["dora"], "page_size": 300}
+        rows = []
+        while True:
+            data = client.post("/api/map", json=body).json()
+            rows.extend(data["mappings"])
+            if data["next_cursor"] is None:
+                break
+            body["cursor"] = data["next_cursor"]
+        assert len(rows) == data["total"] > 300
+
+        unpaged = {"source_framework": "nist_800_53_r5", "targets": ["dora"]}
+        assert rows == client.post("/api/map", json=unpaged).json()["mappings"]
+
+    def test_cursor_from_other_query_rejected(self, client):
+        body = {"source_framework": "nist_800_53_r5", "target_framework": "dora", "page_size": 10}
+        cursor = client.post("/api/map", json=body).json()["next_cursor"]
+        response = client.get(f"/api/frameworks/dora/controls?cursor={cursor}")
+        assert response.status_code == 400
+
+
+class TestExport:
+    """Tests for the streaming export endpoints."""
+
+    def test_framework_ndjson(self, client):
+        response = client.get("/api/export/frameworks/dora")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        total = client.get("/api/frameworks/dora/controls?page_size=1").json()["total"]
+        assert len(rows) == total
+        assert "framework_control_ids" in rows[0]
+
+    def test_crosswalk_csv_with_fields(self, client):
+        response = client.get(
+            "/api/export/crosswalk/iso_27002_2022/dora?format=csv&fields=scf_id,target_controls"
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "iso_27002_2022-dora.csv" in response.headers["content-disposition"]
+        lines = response.text.splitlines()
+        assert lines[0] == "scf_id,target_controls"
+        body = {"source_framework": "iso_27002_2022", "target_framework": "dora"}
+        assert len(lines) - 1 == client.post("/api/map", json=body).json()["count"]
+
+    def test_catalog(self, client):
+        response = client.get("/api/export/catalog?fields=scf_id,framework_mappings")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert set(rows[0]) == {"scf_id", "framework_mappings"}
+        assert all(rows[0]["framework_mappings"].values())
+
+    def test_unknown_field(self, client):
+        response = client.get("/api/export/catalog?fields=scf_id,secret")
+        assert response.status_code == 400
+
+    def test_unknown_format(self, client):
+        response = client.get("/api/export/catalog?format=xml")
+        assert response.status_code == 400
+
+    def test_unknown_framework(self, client):
+        response = client.get("/api/export/crosswalk/iso_27002_2022/fake")
+        assert response.status_code == 404
+
+
+class TestCrosswalks:
+    """Tests for GET /api/crosswalks with conditional requests."""
+
+    def test_crosswalk_and_revalidation(self, client):
+        response = client.get("/api/crosswalks/iso_27001_2022/dora")
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        etag = response.headers["etag"]
+        body = {"source_framework": "iso_27001_2022", "target_framework": "dora"}
+        assert response.json()["mappings"] == client.post("/api/map", json=body).json()["mappings"]
+
+        revalidated = client.get(
+            "/api/crosswalks/iso_27001_2022/dora", headers={"If-None-Match": etag}
+        )
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == etag
+
+    def test_identity_encoding(self, client):
+        response = client.get(
+            "/api/crosswalks/iso_27001_2022/dora", headers={"Accept-Encoding": "identity"}
+        )
+        assert "content-encoding" not in response.headers
+        assert response.json()["count"] > 0
+
+    def test_etag_per_content_coding(self, client):
+        url = "/api/crosswalks/iso_27001_2022/dora"
+        gzipped = client.get(url, headers={"Accept-Encoding": "gzip"})
+        identity = client.get(url, headers={"Accept-Encoding": "identity"})
+        assert gzipped.headers["etag"] == identity.headers["etag"][:-1] + '-gzip"'
+
+        # Either validator revalidates, and the 304 names the requested coding
+        revalidated = client.get(
+            url,
+            headers={"Accept-Encoding": "identity", "If-None-Match": gzipped.headers["etag"]},
+        )
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == identity.headers["etag"]
+
+    def test_unknown_framework(self, client):
+        response = client.get("/api/crosswalks/iso_27001_2022/fake")
+        assert response.status_code == 404
+
+
+class TestConditionalCaching:
+    """Tests for ETag / Cache-Control on data-only GET endpoints."""
+
+    def test_etag_and_revalidation(self, client):
+        response = client.get("/api/controls/GOV-01", headers={"Accept-Encoding": "identity"})
+        etag = response.headers["etag"]
+        assert response.headers["cache-control"].startswith("public")
+
+        revalidated = client.get("/api/controls/GOV-01", headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+        assert revalidated.content == b""
+
+    def test_compressed_etag_revalidates(self, client):
+        response = client.get("/api/frameworks", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        etag = response.headers["etag"]
+        assert etag.endswith('-gzip"')
+
+        revalidated = client.get("/api/frameworks", headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+
+    def test_etag_depends_on_query(self, client):
+        first = client.get("/api/controls/GOV-01?include_mappings=false")
+        second = client.get("/api/controls/GOV-01?include_mappings=true")
+        assert first.headers["etag"] != second.headers["etag"]
+
+    def test_stale_etag(self, client):
+        response = client.get("/api/controls/GOV-01", headers={"If-None-Match": '"stale"'})
+        assert response.status_code == 200
+
+    def test_health_weak_etag(self, client):
+        response = client.get("/health")
+        assert response.headers["etag"].startswith('W/"')
+        assert response.headers["cache-control"] == "no-cache"
+
+    def test_post_not_cached(self, client):
+        response = client.post("/api/search", json={"query": "encryption"})
+        assert "etag" not in response.headers
+
+    @pytest.mark.parametrize(
+        "url", ["/api/frameworks", "/api/map?source_framework=iso_27001_2022&target_framework=dora"]
+    )
+    def test_vary_lists_each_header_once(self, client, url):
+        response = client.get(url, headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        names = [name.strip().lower() for name in response.headers["vary"].split(",")]
+        assert "accept-encoding" in names
+        assert len(names) == len(set(names))
+
+    def test_map_variants_have_own_etags(self, client):
+        url = "/api/map?source_framework=iso_27001_2022&target_framework=dora"
+        as_json = client.get(url)
+        as_ndjson = client.get(url, headers={"Accept": "application/x-ndjson"})
+        assert as_ndjson.headers["content-type"].startswith("application/x-ndjson")
+        assert as_json.headers["content-type"].startswith("application/json")
+        assert as_json.headers["etag"] != as_ndjson.headers["etag"]
+        for response in (as_json, as_ndjson):
+            assert "accept" in response.headers["vary"].lower()
+
+        revalidated = client.get(url, headers={"If-None-Match": as_json.headers["etag"]})
+        assert revalidated.status_code == 304
+        assert "accept" in revalidated.headers["vary"].lower()
+
+    def test_map_variants_not_shared_in_body_cache(self, client):
+        url = "/api/map?source_framework=iso_27001_2022&target_framework=dora"
+        headers = {"Accept-Encoding": "gzip"}
+        client.get(url, headers=headers)
+        as_ndjson = client.get(url, headers={**headers, "Accept": "application/x-ndjson"})
+        assert as_ndjson.headers["content-type"].startswith("application/x-ndjson")
+
+
+class TestGetQueryEndpoints:
+    """Tests for the GET equivalents of the POST query endpoints."""
+
+    def test_search(self, client):
+        body = {"query": "encryption", "frameworks": ["dora", "iso_27001_2022"], "limit": 5}
+        posted = client.post("/api/search", json=body).json()
+        response = client.get("/api/search?query=encryption&frameworks=dora,iso_27001_2022&limit=5")
+        assert response.json() == posted
+        assert "etag" in response.headers
+
+    def test_search_invalid_limit(self, client):
+        assert client.get("/api/search?query=encryption&limit=many").status_code == 400
+
+    def test_map(self, client):
+        body = {"source_framework": "iso_27001_2022", "targets": ["dora", "nist_csf_2.0"]}
+        posted = client.post("/api/map", json=body).json()
+        response = client.get(
+            "/api/map?source_framework=iso_27001_2022&targets=dora&targets=nist_csf_2.0"
+        )
+        assert response.json() == posted
+
+    def test_gap_analysis(self, client):
+        body = {"target_frameworks": ["dora"], "implemented_controls": ["GOV-01", "IAC-01"]}
+        posted = client.post("/api/gap-analysis", json=body).json()
+        response = client.get(
+            "/api/gap-analysis?target_frameworks=dora&implemented_controls=GOV-01,IAC-01"
+        )
+        assert response.json() == posted
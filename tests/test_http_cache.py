@@ -0,0 +1,97 @@
+"""Tests for HTTP conditional caching."""
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from security_controls_mcp.http_cache import (
+    ConditionalGetMiddleware,
+    cache_control,
+    matching_etag,
+    max_age_from_env,
+    representation_etag,
+    request_etag,
+)
+
+calls = {"data": 0}
+
+
+async def data(request):
+    calls["data"] += 1
+    return JSONResponse({"ok": True})
+
+
+async def missing(request):
+    return JSONResponse({"error": "Not Found"}, status_code=404)
+
+
+def cache_rule(scope):
+    if scope["path"] == "/uncached":
+        return None
+    return request_etag("fp", scope["path"], scope["query_string"]), "public, max-age=60"
+
+
+@pytest.fixture
+def client():
+    app = Starlette(
+        routes=[Route("/data", data), Route("/missing", missing), Route("/uncached", data)]
+    )
+    return TestClient(ConditionalGetMiddleware(app, cache_rule=cache_rule))
+
+
+class TestEtags:
+    def test_query_order_does_not_matter(self):
+        assert request_etag("fp", "/a", b"x=1&y=2") == request_etag("fp", "/a", b"y=2&x=1")
+
+    def test_fingerprint_and_path_matter(self):
+        assert request_etag("fp", "/a", b"") != request_etag("fp2", "/a", b"")
+        assert request_etag("fp", "/a", b"") != request_etag("fp", "/b", b"")
+
+    def test_variant_matters(self):
+        assert request_etag("fp", "/a", b"") == request_etag("fp", "/a", b"", "")
+        assert request_etag("fp", "/a", b"") != request_etag("fp", "/a", b"", "ndjson")
+
+    def test_representation_etag(self):
+        assert representation_etag('"fp-1"', "gzip") == '"fp-1-gzip"'
+        assert representation_etag('"fp-1"', None) == '"fp-1"'
+
+    def test_matching_etag(self):
+        assert matching_etag('"other", W/"fp-1-gzip"', '"fp-1"') == 'W/"fp-1-gzip"'
+        assert matching_etag("*", '"fp-1"') == '"fp-1"'
+        assert matching_etag('"fp-2"', '"fp-1"') is None
+
+    def test_cache_control(self):
+        assert cache_control(60) == "public, max-age=60"
+        assert cache_control(0) == "public, no-cache"
+
+    def test_max_age_from_env(self, monkeypatch):
+        monkeypatch.setenv("SECURITY_CONTROLS_MCP_CACHE_MAX_AGE", "120")
+        assert max_age_from_env() == 120
+        monkeypatch.setenv("SECURITY_CONTROLS_MCP_CACHE_MAX_AGE", "soon")
+        assert max_age_from_env() == 300
+
+
+class TestConditionalGetMiddleware:
+    def test_adds_validators(self, client):
+        response = client.get("/data")
+        assert response.headers["etag"] == request_etag("fp", "/data", b"")
+        assert response.headers["cache-control"] == "public, max-age=60"
+        assert "accept-encoding" in response.headers["vary"].lower()
+
+    def test_not_modified_skips_app(self, client):
+        etag = client.get("/data").headers["etag"]
+        before = calls["data"]
+        response = client.get("/data", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert calls["data"] == before
+
+    def test_errors_not_stamped(self, client):
+        assert "etag" not in client.get("/missing").headers
+
+    def test_uncached_requests(self, client):
+        response = client.get("/uncached", headers={"If-None-Match": "*"})
+        assert response.status_code == 200
+        assert "etag" not in response.headers
@@ -98,6 +98,52 @@ class TestToolCalls:
         assert len(result) == 1
         assert "Mapping" in result[0].text
 
+    @pytest.mark.asyncio
+    async def test_map_frameworks_many_targets(self):
+        """Test map_frameworks with several targets in one call."""
+        result = await call_tool(
+            "map_frameworks",
+            {"source_framework": "iso_27002_2022", "targets": ["dora", "nis2"]},
+        )
+        assert len(result) == 1
+        assert "2 frameworks" in result[0].text
+        assert "`dora`" in result[0].text and "`nis2`" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_map_frameworks_targets_must_be_list(self):
+        """A string targets is rejected, not iterated character by character."""
+        result = await call_tool(
+            "map_frameworks", {"source_framework": "iso_27002_2022", "targets": "dora"}
+        )
+        assert "targets must be a list" in result[0].text
+        assert "'d' not found" not in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_map_frameworks_paged(self):
+        """Test walking map_frameworks page by page with cursors."""
+        arguments = {
+            "source_framework": "nist_800_53_r5",
+            "target_framework": "dora",
+            "page_size": 200,
+        }
+        pages = 0
+        while True:
+            text = (await call_tool("map_frameworks", arguments))[0].text
+            pages += 1
+            if "**Next cursor:**" not in text:
+                break
+            arguments["cursor"] = text.split("**Next cursor:** `")[1].split("`")[0]
+        assert pages > 1
+        assert "of " in text and "Showing" in text
+
+    @pytest.mark.asyncio
+    async def test_get_framework_controls_bad_cursor(self):
+        """Test an invalid cursor is reported as an error."""
+        result = await call_tool(
+            "get_framework_controls", {"framework": "dora", "cursor": "not-a-cursor"}
+        )
+        assert "Invalid cursor" in result[0].text
+
     @pytest.mark.asyncio
     async def test_map_frameworks_invalid_source(self):
         """Test map_frameworks with invalid source framework."""
@@ -109,7 +155,7 @@ class TestToolCalls:
 
     @pytest.mark.asyncio
     async def test_map_frameworks_annex_hint_for_iso27001(self):
-        """Annex-style ISO 27001 control IDs should provide a helpful ISO 27002 hint."""
+        """Annex-style ISO 27001 control IDs resolve via ISO 27002 and say so."""
         result = await call_tool(
             "map_frameworks",
             {
@@ -119,8 +165,129 @@ class TestToolCalls:
             },
         )
         assert len(result) == 1
+        assert "Mapping" in result[0].text
         assert "iso_27002_2022" in result[0].text
 
+    @pytest.mark.asyncio
+    async def test_compare_frameworks_pair(self):
+        """Test compare_frameworks coverage between ISO 27002 and DORA."""
+        result = await call_tool(
+            "compare_frameworks",
+            {"source_framework": "iso_27002_2022", "target_framework": "dora"},
+        )
+        assert len(result) == 1
+        assert "Coverage of dora" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_compare_frameworks_closest(self):
+        """Test compare_frameworks lists closest frameworks without a target."""
+        result = await call_tool("compare_frameworks", {"source_framework": "dora", "limit": 3})
+        assert len(result) == 1
+        assert "closest" in result[0].text.lower()
+        assert result[0].text.count("Jaccard") == 3
+
+    @pytest.mark.asyncio
+    async def test_gap_analysis(self):
+        """Test gap_analysis scores several targets in one call."""
+        result = await call_tool(
+            "gap_analysis",
+            {"implemented_controls": ["GOV-01", "IAC-01"], "target_frameworks": ["dora", "nis2"]},
+        )
+        assert len(result) == 1
+        assert "Requirements met" in result[0].text
+        assert "`dora`" in result[0].text and "`nis2`" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_baseline_delta(self):
+        """Test baseline_delta lists the controls a level adds."""
+        result = await call_tool(
+            "baseline_delta",
+            {"from_framework": "nist_800_53b_r5_moderate", "to_framework": "nist_800_53b_r5_high"},
+        )
+        assert "To add:" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_baseline_delta_family(self):
+        """Test baseline_delta without a target shows the family."""
+        result = await call_tool("baseline_delta", {"from_framework": "cis_csc_8.1_ig1"})
+        assert "Baseline family: cis_csc_8.1" in result[0].text
+        assert "Upgrade steps" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_related_controls(self):
+        """Test related_controls ranks controls by shared requirements."""
+        result = await call_tool("related_controls", {"control_id": "GOV-01", "limit": 5})
+        assert "Controls related to GOV-01" in result[0].text
+        assert "shared requirements" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_related_controls_invalid_control(self):
+        """Test related_controls with an unknown control."""
+        result = await call_tool("related_controls", {"control_id": "FAKE-99"})
+        assert "not found" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_gap_analysis_invalid_target(self):
+        """Test gap_analysis with invalid target framework."""
+        result = await call_tool(
+            "gap_analysis",
+            {"implemented_controls": ["GOV-01"], "target_frameworks": ["fake_framework"]},
+        )
+        assert len(result) == 1
+        assert "not found" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_gap_analysis_rejects_string_list(self):
+        """A string implemented_controls is rejected, not split into characters."""
+        result = await call_tool(
+            "gap_analysis", {"implemented_controls": "GOV-01", "target_frameworks": ["dora"]}
+        )
+        assert "implemented_controls must be a list of strings" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_compare_frameworks_invalid(self):
+        """Test compare_frameworks with invalid framework."""
+        result = await call_tool(
+            "compare_frameworks", {"source_framework": "dora", "target_framework": "fake"}
+        )
+        assert len(result) == 1
+        assert "not found" in result[0].text
+
+    @pytest.mark.asyncio
+    async def test_map_frameworks_official_text_for_annex_a_control(self, tmp_path, monkeypatch):
+        """Enrichment shows the resolved Annex A clause, not the first mapped clause."""
+        from security_controls_mcp import server
+        from security_controls_mcp.config import Config
+        from security_controls_mcp.registry import StandardRegistry
+
+        from .test_paid_standards import _write_standard
+
+        mapping = server.scf_data.map_frameworks("iso_27001_2022", "dora", "A.5.15")[0]
+        control = next(c for c in server.scf_data.controls if c["id"] == mapping["scf_id"])
+        clauses = [
+            (cid, "Management clause")
+            for cid in control["framework_mappings"].get("iso_27001_2022") or []
+        ]
+        config = Config(tmp_path / "config")
+        _write_standard(
+            config.standards_dir, "iso_27001_2022", [*clauses, ("A.5.15", "Access control")]
+        )
+        config.add_standard("iso_27001_2022", "iso_27001_2022")
+        registry = StandardRegistry(config, controls=server.scf_data.controls)
+        monkeypatch.setattr(server, "registry", registry)
+
+        result = await call_tool(
+            "map_frameworks",
+            {
+                "source_framework": "iso_27001_2022",
+                "target_framework": "dora",
+                "source_control": "A.5.15",
+            },
+        )
+        assert "A.5.15" in result[0].text.split("Official Text", 1)[1]
+        assert "Access control" in result[0].text
+        assert "Management clause" not in result[0].text
+
 
 @pytest.mark.slow
 class TestMCPProtocol:
@@ -143,13 +310,14 @@ class TestMCPProtocol:
         from security_controls_mcp.server import list_tools
 
         tools = await list_tools()
-        assert len(tools) == 10, f"Expected 10 tools, got {len(tools)}"
+        assert len(tools) == 14, f"Expected 14 tools, got {len(tools)}"
 
         # Verify tool names match expected set
         tool_names = {t.name for t in tools}
         expected = {
             "version_info", "about", "get_control", "search_controls",
             "list_frameworks", "get_framework_controls", "map_frameworks",
+            "compare_frameworks", "gap_analysis", "baseline_delta", "related_controls",
             "list_available_standards", "query_standard", "get_clause",
         }
         assert tool_names == expected, f"Tool name mismatch: {tool_names ^ expected}"
@@ -0,0 +1,51 @@
+"""Tests for the pluggable JSON encoder."""
+
+import json
+
+import pytest
+
+from security_controls_mcp.json_codec import (
+    BACKENDS,
+    _load_backend,
+    dumps,
+    select_backend,
+    sse_message,
+)
+
+AVAILABLE = [name for name in BACKENDS if _load_backend(name) is not None]
+
+PAYLOAD = {
+    "jsonrpc": "2.0",
+    "id": 7,
+    "result": {
+        "content": [{"type": "text", "text": "**GOV-01** – Gouvernance «sécurité» ✓\n"}],
+        "mappings": [{"scf_id": "IAC-01", "targets": {"dora": ["9.4"]}, "weight": 10}],
+        "jaccard": 0.5,
+        "empty": None,
+        "ok": True,
+    },
+}
+
+
+class TestBackends:
+    """Every installed backend must produce the same JSON."""
+
+    @pytest.mark.parametrize("name", AVAILABLE)
+    def test_compact_utf8_output(self, name):
+        _, backend_dumps, backend_loads = _load_backend(name)
+        encoded = backend_dumps(PAYLOAD)
+        assert isinstance(encoded, bytes)
+        assert encoded == json.dumps(PAYLOAD, ensure_ascii=False, separators=(",", ":")).encode()
+        assert backend_loads(encoded) == PAYLOAD
+
+    def test_fallback(self):
+        assert select_backend("json")[0] == "json"
+        assert select_backend("simplejson")[0] == AVAILABLE[0]
+
+    def test_default_backend(self):
+        assert json.loads(dumps(PAYLOAD)) == PAYLOAD
+
+
+def test_sse_message():
+    message = sse_message({"jsonrpc": "2.0", "id": 1, "result": {}})
+    assert message == b'event: message\ndata: {"jsonrpc":"2.0","id":1,"result":{}}\n\n'
@@ -0,0 +1,144 @@
+"""Tests for the in-process Prometheus metrics."""
+
+import asyncio
+import os
+import signal
+
+import pytest
+from mcp.types import TextContent
+from starlette.testclient import TestClient
+
+from security_controls_mcp.http_server import app as http_app
+from security_controls_mcp.metrics import (
+    HTTP_REQUESTS,
+    TOOL_CALLS,
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    dump_metrics,
+    install_dump_handler,
+    instrument_tool,
+)
+
+
+class TestRegistry:
+    def test_counter(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("things_total", "Things.", ("kind",))
+        counter.inc(kind="a")
+        counter.inc(2, kind="a")
+        text = registry.render()
+        assert "# TYPE security_controls_mcp_things_total counter" in text
+        assert 'security_controls_mcp_things_total{kind="a"} 3' in text
+
+    def test_histogram(self):
+        histogram = Histogram("latency_seconds", "Latency.", (), buckets=(0.1, 1.0))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+        lines = histogram.render()
+        assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{le="1"} 2' in lines
+        assert 'latency_seconds_bucket{le="+Inf"} 3' in lines
+        assert "latency_seconds_sum 5.55" in lines
+        assert "latency_seconds_count 3" in lines
+
+    def test_label_escaping(self):
+        counter = Counter("c_total", "C.", ("path",))
+        counter.inc(path='a"b\\c')
+        assert counter.render() == ['c_total{path="a\\"b\\\\c"} 1']
+
+    def test_wrong_labels(self):
+        with pytest.raises(ValueError):
+            Counter("c_total", "C.", ("tool",)).inc(route="/")
+
+    def test_duplicate_metric(self):
+        registry = MetricsRegistry()
+        registry.counter("x_total", "X.")
+        with pytest.raises(ValueError):
+            registry.counter("x_total", "X.")
+
+    def test_failing_collector_is_skipped(self):
+        registry = MetricsRegistry()
+        registry.add_collector(lambda: 1 / 0)
+        registry.add_collector(lambda: [("up", "gauge", "Up.", [({}, 1)])])
+        assert "security_controls_mcp_up 1" in registry.render()
+
+
+class TestInstrumentTool:
+    def test_records_calls(self):
+        @instrument_tool
+        async def call_tool(name, arguments):
+            if name == "missing":
+                raise ValueError(f"Unknown tool: {name}")
+            return [TextContent(type="text", text="héllo")]
+
+        before = TOOL_CALLS.value(tool="metrics_test", status="ok")
+        asyncio.run(call_tool("metrics_test", {}))
+        assert TOOL_CALLS.value(tool="metrics_test", status="ok") == before + 1
+
+        unknown = TOOL_CALLS.value(tool="unknown", status="error")
+        with pytest.raises(ValueError):
+            asyncio.run(call_tool("missing", {}))
+        assert TOOL_CALLS.value(tool="unknown", status="error") == unknown + 1
+
+
+class TestMetricsEndpoint:
+    def test_scrape(self):
+        client = TestClient(http_app)
+        client.get("/api/controls/GOV-01")
+        client.post(
+            "/mcp",
+            json={
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "tools/call",
+                "params": {"name": "get_control", "arguments": {"control_id": "GOV-01"}},
+            },
+        )
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+        assert (
+            'security_controls_mcp_http_requests_total{method="GET",'
+            'route="/api/controls/{control_id}",status="200"}' in text
+        )
+        assert 'security_controls_mcp_tool_duration_seconds_count{tool="get_control"}' in text
+        assert 'security_controls_mcp_cache_hit_ratio{cache="compression"}' in text
+        assert "security_controls_mcp_executor_queue_depth" in text
+
+    def test_middleware_answers_are_labelled_by_route(self):
+        client = TestClient(http_app)
+        etag = client.get("/api/frameworks").headers["etag"]
+        labels = {"method": "GET", "route": "/api/frameworks", "status": "304"}
+        before = HTTP_REQUESTS.value(**labels)
+        assert client.get("/api/frameworks", headers={"If-None-Match": etag}).status_code == 304
+        assert HTTP_REQUESTS.value(**labels) == before + 1
+
+
+class TestDump:
+    def test_dump_to_file(self, tmp_path):
+        path = tmp_path / "metrics.prom"
+        dump_metrics(str(path))
+        assert "# TYPE security_controls_mcp_tool_calls_total counter" in path.read_text()
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="needs SIGUSR1")
+    def test_sigusr1(self, tmp_path, monkeypatch):
+        path = tmp_path / "metrics.prom"
+        monkeypatch.setenv("SECURITY_CONTROLS_MCP_METRICS_FILE", str(path))
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            assert install_dump_handler(loop)
+            try:
+                os.kill(os.getpid(), signal.SIGUSR1)
+                for _ in range(100):
+                    if path.exists():
+                        break
+                    await asyncio.sleep(0.01)
+            finally:
+                loop.remove_signal_handler(signal.SIGUSR1)
+
+        asyncio.run(main())
+        assert "security_controls_mcp_tool_calls_total" in path.read_text()
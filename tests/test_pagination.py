@@ -0,0 +1,46 @@
+"""Tests for pagination cursors."""
+
+import pytest
+
+from security_controls_mcp.pagination import (
+    MAX_PAGE_SIZE,
+    CursorError,
+    decode_cursor,
+    encode_cursor,
+    next_cursor,
+    query_key,
+    resolve_page,
+)
+
+
+class TestCursors:
+    """Test cursor encoding and validation."""
+
+    def test_round_trip(self):
+        query = query_key("map_frameworks", "iso_27002_2022", ["dora"], None)
+        cursor = encode_cursor("abc123", query, 150)
+        assert decode_cursor(cursor, "abc123", query) == 150
+
+    def test_stale_cursor_rejected(self):
+        query = query_key("get_framework_controls", "dora")
+        cursor = encode_cursor("abc123", query, 50)
+        with pytest.raises(CursorError, match="expired"):
+            decode_cursor(cursor, "def456", query)
+
+    def test_cursor_from_other_query_rejected(self):
+        cursor = encode_cursor("abc123", query_key("get_framework_controls", "dora"), 50)
+        with pytest.raises(CursorError):
+            decode_cursor(cursor, "abc123", query_key("get_framework_controls", "nis2"))
+
+    @pytest.mark.parametrize("cursor", ["garbage", "e30", encode_cursor("abc123", "q", -1)])
+    def test_malformed_cursor_rejected(self, cursor):
+        with pytest.raises(CursorError):
+            decode_cursor(cursor, "abc123", "q")
+
+    def test_next_cursor_stops_at_end(self):
+        assert next_cursor("abc123", "q", 0, 50, 120) is not None
+        assert next_cursor("abc123", "q", 100, 50, 120) is None
+
+    def test_page_size_is_clamped(self):
+        assert resolve_page(None, 0, "abc123", "q") == (0, 1)
+        assert resolve_page(None, 10**6, "abc123", "q") == (0, MAX_PAGE_SIZE)
@@ -8,6 +8,13 @@ import pytest
 from security_controls_mcp.config import Config
 from security_controls_mcp.providers import PaidStandardProvider, StandardMetadata
 from security_controls_mcp.registry import StandardRegistry
+from security_controls_mcp.storage import (
+    COMPACT_INDEX_FILE,
+    CompactClauseStore,
+    flatten_clauses,
+    write_compact_standard,
+)
+from security_controls_mcp.watcher import StandardsWatcher
 
 
 class TestConfig:
@@ -268,3 +275,464 @@ class TestStandardRegistry:
 
             provider = registry.get_provider("nonexistent")
             assert provider is None
+
+
+def _write_standard(standards_dir: Path, standard_id: str, clauses: list[tuple[str, str]]):
+    """Write a minimal imported standard with the given (clause_id, title) annex controls."""
+    standard_dir = standards_dir / standard_id
+    standard_dir.mkdir(parents=True)
+    with open(standard_dir / "metadata.json", "w") as f:
+        json.dump({"standard_id": standard_id, "title": standard_id.upper()}, f)
+    full_text = {
+        "structure": {
+            "sections": [],
+            "annexes": [
+                {
+                    "id": "A",
+                    "title": "Controls",
+                    "controls": [
+                        {"id": cid, "title": title, "content": f"{title} text"}
+                        for cid, title in clauses
+                    ],
+                }
+            ],
+        }
+    }
+    with open(standard_dir / "full_text.json", "w") as f:
+        json.dump(full_text, f)
+    return standard_dir
+
+
+class TestRegistryClauseIndex:
+    """Test the merged clause-ID index across loaded standards."""
+
+    @pytest.fixture
+    def registry(self, tmp_path):
+        config = Config(tmp_path / "test-config")
+        _write_standard(config.standards_dir, "iso_a", [("A.8.24", "Use of cryptography")])
+        _write_standard(
+            config.standards_dir, "iso_b", [("A.8.24", "Cryptography"), ("AC-2", "Accounts")]
+        )
+        config.add_standard("iso_a", "iso_a")
+        config.add_standard("iso_b", "iso_b")
+        return StandardRegistry(config)
+
+    def test_find_clause_returns_all_standards(self, registry):
+        matches = registry.find_clause("A.8.24")
+        assert [standard_id for standard_id, _ in matches] == ["iso_a", "iso_b"]
+        assert matches[1][1].title == "Cryptography"
+
+    def test_find_clause_normalizes_id(self, registry):
+        matches = registry.find_clause(" ac-2 ")
+        assert len(matches) == 1
+        assert matches[0][0] == "iso_b"
+        assert matches[0][1].clause_id == "AC-2"
+
+    def test_get_clause_from_any_standard_uses_first_match(self, registry):
+        standard_id, clause = registry.get_clause_from_any_standard("A.8.24")
+        assert standard_id == "iso_a"
+        assert clause.title == "Use of cryptography"
+        assert registry.get_clause_from_any_standard("Z.9") is None
+
+    def test_changes_only_index_changed_standard(self, registry, monkeypatch):
+        before = registry.state
+        indexed = []
+        list_clause_ids = PaidStandardProvider.list_clause_ids
+
+        def record(provider):
+            indexed.append(provider.metadata.standard_id)
+            return list_clause_ids(provider)
+
+        monkeypatch.setattr(PaidStandardProvider, "list_clause_ids", record)
+        registry.remove_standard("iso_a")
+        registry.add_standard("iso_c", before.providers["iso_a"])
+
+        # Only the changed standard is walked; the previous state is untouched
+        assert set(indexed) == {"iso_a"}
+        assert [sid for sid, _ in registry.find_clause("A.8.24")] == ["iso_b", "iso_c"]
+        assert [sid for sid, _ in before.clause_index["A.8.24"]] == ["iso_a", "iso_b"]
+
+    def test_remove_standard_updates_index(self, registry):
+        registry.remove_standard("iso_b")
+        assert registry.find_clause("AC-2") == []
+        assert [sid for sid, _ in registry.find_clause("A.8.24")] == ["iso_a"]
+
+    def test_add_standard_replaces_existing(self, registry):
+        provider = registry.get_provider("iso_a")
+        registry.add_standard("iso_a", provider)
+        assert [sid for sid, _ in registry.find_clause("A.8.24")] == ["iso_b", "iso_a"]
+
+
+class TestRegistryControlJoin:
+    """Test the precomputed SCF control -> official clause join."""
+
+    CONTROLS = [
+        {"id": "CRY-01", "framework_mappings": {"iso_a": ["A.8.24", "A.8.25"], "dora": ["9.1"]}},
+        {"id": "IAC-01", "framework_mappings": {"iso_b": ["AC-2"], "iso_a": ["A.9.9"]}},
+        {"id": "GOV-01", "framework_mappings": {"iso_a": []}},
+    ]
+
+    @pytest.fixture
+    def config(self, tmp_path):
+        config = Config(tmp_path / "test-config")
+        _write_standard(config.standards_dir, "iso_a", [("A.8.24", "Use of cryptography")])
+        _write_standard(config.standards_dir, "iso_b", [("AC-2", "Accounts")])
+        config.add_standard("iso_a", "iso_a")
+        config.add_standard("iso_b", "iso_b")
+        return config
+
+    def test_join_built_on_load(self, config):
+        registry = StandardRegistry(config, controls=self.CONTROLS)
+
+        official = registry.get_official_clause("CRY-01", "iso_a")
+        assert official.control_id == "A.8.24"
+        assert official.clause.title == "Use of cryptography"
+        assert official.metadata.title == "ISO_A"
+        assert set(registry.get_official_clauses("CRY-01")) == {"iso_a"}
+
+    def test_join_skips_missing_clauses(self, config):
+        registry = StandardRegistry(config, controls=self.CONTROLS)
+
+        # IAC-01 maps to A.9.9 in iso_a, which the standard does not define
+        assert set(registry.get_official_clauses("IAC-01")) == {"iso_b"}
+        assert registry.get_official_clauses("GOV-01") == {}
+
+    def test_join_covers_every_mapped_id(self, tmp_path):
+        config = Config(tmp_path / "test-config")
+        _write_standard(config.standards_dir, "iso_a", [("A.8.25", "Secure development")])
+        config.add_standard("iso_a", "iso_a")
+        registry = StandardRegistry(config, controls=self.CONTROLS)
+
+        # CRY-01 maps to A.8.24 first, which this standard does not define
+        assert registry.get_official_clause("CRY-01", "iso_a").control_id == "A.8.25"
+
+    def test_official_clause_for_requirement_id(self, tmp_path):
+        config = Config(tmp_path / "test-config")
+        _write_standard(
+            config.standards_dir,
+            "iso_a",
+            [("A.8.24", "Use of cryptography"), ("A.8.25", "Secure development"), ("A.5.15", "X")],
+        )
+        config.add_standard("iso_a", "iso_a")
+        registry = StandardRegistry(config, controls=self.CONTROLS)
+
+        assert registry.get_official_clause("CRY-01", "iso_a").control_id == "A.8.24"
+        official = registry.get_official_clause("CRY-01", "iso_a", " a.8.25")
+        assert official.clause.title == "Secure development"
+        # IDs resolved through another mapping key are looked up in the standard
+        assert registry.get_official_clause("CRY-01", "iso_a", "A.5.15").clause.title == "X"
+        assert registry.get_official_clause("CRY-01", "iso_a", "A.1.1") is None
+
+    def test_join_reads_no_clause_text(self, config, monkeypatch):
+        read = []
+        get_clause = PaidStandardProvider.get_clause
+        monkeypatch.setattr(
+            PaidStandardProvider,
+            "get_clause",
+            lambda provider, clause_id: read.append(clause_id) or get_clause(provider, clause_id),
+        )
+        registry = StandardRegistry(config, controls=self.CONTROLS)
+
+        assert read == []
+        assert registry.state.control_clauses["CRY-01"] == {"iso_a": ["A.8.24"]}
+        assert registry.get_official_clause("CRY-01", "iso_a").clause.title == "Use of cryptography"
+        assert read == ["A.8.24"]
+
+    def test_join_follows_registry_changes(self, config):
+        registry = StandardRegistry(config)
+        assert registry.get_official_clauses("CRY-01") == {}
+
+        registry.bind_controls(self.CONTROLS)
+        assert registry.get_official_clause("IAC-01", "iso_b") is not None
+
+        registry.remove_standard("iso_b")
+        assert registry.get_official_clause("IAC-01", "iso_b") is None
+
+        registry.reload()
+        assert registry.get_official_clause("IAC-01", "iso_b") is not None
+
+
+class TestHotReload:
+    """Test reloading new or changed standards without a restart."""
+
+    def test_refresh_loads_new_standard(self, tmp_path):
+        config = Config(tmp_path / "test-config")
+        registry = StandardRegistry(config)
+        assert registry.refresh() is False
+
+        # Simulate the CLI importing a standard into the same config dir
+        _write_standard(config.standards_dir, "iso_a", [("A.8.24", "Use of cryptography")])
+        Config(config.config_dir).add_standard("iso_a", "iso_a")
+
+        assert registry.refresh() is True
+        assert registry.get_provider("iso_a") is not None
+        assert registry.find_clause("A.8.24")[0][0] == "iso_a"
+
+    def test_refresh_keeps_unchanged_providers(self, tmp_path):
+        config = Config(tmp_path / "test-config")
+        _write_standard(config.standards_dir, "iso_a", [("A.1", "One")])
+        _write_standard(config.standards_dir, "iso_b", [("B.1", "Two")])
+        config.add_standard("iso_a", "iso_a")
+        registry = StandardRegistry(config)
+        provider_a = registry.get_provider("iso_a")
+
+        Config(config.config_dir).add_standard("iso_b", "iso_b")
+        assert registry.refresh() is True
+        assert registry.get_provider("iso_a") is provider_a
+        assert registry.get_provider("iso_b") is not None
+
+    def test_refresh_removes_disabled_standard(self, tmp_path):
+        config = Config(tmp_path / "test-config")
+        _write_standard(config.standards_dir, "iso_a", [("A.1", "One")])
+        config.add_standard("iso_a", "iso_a")
+        registry = StandardRegistry(config)
+
+        Config(config.config_dir).add_standard("iso_a", "iso_a", enabled=False)
+        assert registry.refresh() is True
+        assert not registry.has_paid_standards()
+        assert registry.find_clause("A.1") == []
+
+    def test_prepare_reload_does_not_touch_live_state(self, tmp_path):
+        config = Config(tmp_path / "test-config")
+        registry = StandardRegistry(config)
+        _write_standard(config.standards_dir, "iso_a", [("A.1", "One")])
+        Config(config.config_dir).add_standard("iso_a", "iso_a")
+
+        prepared = registry.prepare_reload()
+        assert prepared is not None
+        assert registry.get_provider("iso_a") is None
+
+        registry.apply_reload(prepared)
+        assert registry.get_provider("iso_a") is not None
+
+    def test_reload_swaps_state_as_one_unit(self, tmp_path):
+        config = Config(tmp_path / "test-config")
+        _write_standard(config.standards_dir, "iso_a", [("A.1", "One")])
+        config.add_standard("iso_a", "iso_a")
+        registry = StandardRegistry(config)
+        before = registry.state
+
+        _write_standard(config.standards_dir, "iso_b", [("B.1", "Two")])
+        Config(config.config_dir).add_standard("iso_b", "iso_b")
+        assert registry.refresh() is True
+
+        # The previous state is left intact for readers still holding it
+        assert set(before.providers) == {"iso_a"}
+        assert "B.1" not in before.clause_index
+        assert set(registry.state.providers) == {"iso_a", "iso_b"}
+        assert "B.1" in registry.state.clause_index
+
+    def test_broken_update_keeps_previous_provider(self, tmp_path):
+        config = Config(tmp_path / "test-config")
+        standard_dir = _write_standard(config.standards_dir, "iso_a", [("A.1", "One")])
+        config.add_standard("iso_a", "iso_a")
+        registry = StandardRegistry(config)
+
+        (standard_dir / "full_text.json").write_text("{not json")
+        registry.refresh()
+        assert registry.get_clause_from_any_standard("A.1") is not None
+
+    @pytest.mark.asyncio
+    async def test_watcher_poll_reloads_on_change(self, tmp_path):
+        config = Config(tmp_path / "test-config")
+        registry = StandardRegistry(config)
+        watcher = StandardsWatcher(registry, interval=0)
+
+        assert await watcher.poll_once() is False
+
+        _write_standard(config.standards_dir, "iso_a", [("A.1", "One")])
+        Config(config.config_dir).add_standard("iso_a", "iso_a")
+
+        assert await watcher.poll_once() is True
+        assert registry.has_paid_standards()
+        assert await watcher.poll_once() is False
+
+    @pytest.mark.asyncio
+    async def test_watcher_retries_failed_reload(self, tmp_path, monkeypatch):
+        config = Config(tmp_path / "test-config")
+        registry = StandardRegistry(config)
+        watcher = StandardsWatcher(registry, interval=0)
+        _write_standard(config.standards_dir, "iso_a", [("A.1", "One")])
+        Config(config.config_dir).add_standard("iso_a", "iso_a")
+
+        prepare_reload = registry.prepare_reload
+
+        def half_written():
+            raise json.JSONDecodeError("Expecting value", "", 0)
+
+        monkeypatch.setattr(registry, "prepare_reload", half_written)
+        with pytest.raises(json.JSONDecodeError):
+            await watcher.poll_once()
+
+        # Nothing changes on disk, but the failed reload is retried
+        monkeypatch.setattr(registry, "prepare_reload", prepare_reload)
+        assert await watcher.poll_once() is True
+        assert registry.has_paid_standards()
+
+    def test_config_saved_atomically(self, tmp_path):
+        config = Config(tmp_path / "test-config")
+        config.add_standard("iso_a", "iso_a")
+        assert json.loads(config.config_file.read_text())["standards"]["iso_a"]["path"] == "iso_a"
+        assert [p.name for p in config.config_dir.iterdir() if p.name.startswith(".")] == []
+
+
+class TestCompactStorage:
+    """Test the compressed on-disk standard format."""
+
+    FULL_TEXT = {
+        "structure": {
+            "sections": [
+                {
+                    "id": "1",
+                    "title": "Introduction",
+                    "page": 1,
+                    "content": "This is the introduction section.",
+                    "subsections": [
+                        {"id": "1.1", "title": "Purpose", "page": 1, "content": "Shared text."}
+                    ],
+                },
+                {"id": "2", "title": "Scope", "page": 2, "content": "Shared text."},
+            ],
+            "annexes": [
+                {
+                    "id": "A",
+                    "controls": [
+                        {
+                            "id": "A.1",
+                            "title": "Access Control",
+                            "content": "Access control requirements for privileged accounts.",
+                            "page": 8,
+                            "category": "Organizational",
+                        }
+                    ],
+                }
+            ],
+        }
+    }
+
+    @pytest.fixture
+    def standard_dirs(self, tmp_path):
+        """Write the same standard in JSON and compact format."""
+        metadata = {"standard_id": "mock_std", "title": "Mock Standard"}
+        json_dir = tmp_path / "json"
+        compact_dir = tmp_path / "compact"
+        for standard_dir in (json_dir, compact_dir):
+            standard_dir.mkdir()
+            (standard_dir / "metadata.json").write_text(json.dumps(metadata))
+        (json_dir / "full_text.json").write_text(json.dumps(self.FULL_TEXT))
+        write_compact_standard(self.FULL_TEXT, compact_dir)
+        return json_dir, compact_dir
+
+    def test_compact_matches_json_provider(self, standard_dirs):
+        json_provider, compact_provider = (PaidStandardProvider(d) for d in standard_dirs)
+
+        assert compact_provider.list_clause_ids() == json_provider.list_clause_ids()
+        for clause_id in json_provider.list_clause_ids():
+            assert vars(compact_provider.get_clause(clause_id)) == vars(
+                json_provider.get_clause(clause_id)
+            )
+        assert [vars(c) for c in compact_provider.get_all_clauses()] == [
+            vars(c) for c in json_provider.get_all_clauses()
+        ]
+        for query in ["introduction", "shared", "ccess contr", "privileged accounts", "nothing"]:
+            assert [vars(r) for r in compact_provider.search(query)] == [
+                vars(r) for r in json_provider.search(query)
+            ]
+
+    def test_compact_provider_does_not_need_full_text(self, standard_dirs):
+        _, compact_dir = standard_dirs
+        assert not (compact_dir / "full_text.json").exists()
+        assert (compact_dir / COMPACT_INDEX_FILE).exists()
+        assert PaidStandardProvider(compact_dir).get_clause("A.1").page == 8
+
+    def test_identical_content_stored_once(self, tmp_path):
+        stats = write_compact_standard(self.FULL_TEXT, tmp_path)
+        assert stats["clauses"] == 4
+        assert stats["content_blocks"] == 3
+
+    def _revision(self, text):
+        revised = json.loads(json.dumps(self.FULL_TEXT))
+        revised["structure"]["sections"][1]["content"] = text
+        return revised
+
+    def test_rewrite_keeps_files_of_previous_index(self, tmp_path):
+        write_compact_standard(self.FULL_TEXT, tmp_path)
+        old_index = (tmp_path / COMPACT_INDEX_FILE).read_bytes()
+
+        write_compact_standard(self._revision("Revised scope."), tmp_path)
+        # A reader that read the old index just before the swap still finds its blob
+        new_index = (tmp_path / COMPACT_INDEX_FILE).read_bytes()
+        (tmp_path / COMPACT_INDEX_FILE).write_bytes(old_index)
+        assert CompactClauseStore(tmp_path).content(2) == "Shared text."
+        (tmp_path / COMPACT_INDEX_FILE).write_bytes(new_index)
+        assert CompactClauseStore(tmp_path).content(2) == "Revised scope."
+
+        write_compact_standard(self._revision("Third revision."), tmp_path)
+        assert len(list(tmp_path.glob("clauses-*.bin"))) == 2
+        assert len(list(tmp_path.glob("tokens-*.json"))) == 2
+
+    def test_reads_index_with_fixed_file_names(self, tmp_path):
+        write_compact_standard(self.FULL_TEXT, tmp_path)
+        index = json.loads((tmp_path / COMPACT_INDEX_FILE).read_text())
+        (tmp_path / index.pop("blob")).rename(tmp_path / "clauses.bin")
+        (tmp_path / index.pop("tokens")).rename(tmp_path / "tokens.json")
+        (tmp_path / COMPACT_INDEX_FILE).write_text(json.dumps(index))
+
+        store = CompactClauseStore(tmp_path)
+        assert store.content(3) == "Access control requirements for privileged accounts."
+        assert store.candidates("privileged") == [3]
+
+    def test_index_file_names_stay_in_directory(self, tmp_path):
+        write_compact_standard(self.FULL_TEXT, tmp_path)
+        index = json.loads((tmp_path / COMPACT_INDEX_FILE).read_text())
+        index["blob"] = "../outside.bin"
+        (tmp_path / COMPACT_INDEX_FILE).write_text(json.dumps(index))
+        with pytest.raises(ValueError):
+            CompactClauseStore(tmp_path)
+
+    def test_compact_command_stays_in_standards_dir(self, tmp_path, monkeypatch):
+        pytest.importorskip("pdfplumber")
+        from click.testing import CliRunner
+
+        from security_controls_mcp.cli import compact_standards
+
+        config_dir = tmp_path / "config"
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (outside / "full_text.json").write_text(json.dumps(self.FULL_TEXT))
+        config = Config(config_dir)
+        config.add_standard("escape", "../../outside")
+        inside = config.standards_dir / "inside"
+        inside.mkdir(parents=True)
+        (inside / "full_text.json").write_text(json.dumps(self.FULL_TEXT))
+        config.add_standard("inside", "inside")
+
+        monkeypatch.setenv("SECURITY_CONTROLS_MCP_CONFIG_DIR", str(config_dir))
+        result = CliRunner().invoke(compact_standards)
+        assert result.exit_code == 0
+        assert "Converted 1 standard(s)." in result.output
+        assert not (outside / COMPACT_INDEX_FILE).exists()
+        assert (inside / COMPACT_INDEX_FILE).exists()
+
+    def test_token_candidates_narrow_search(self, standard_dirs):
+        store = CompactClauseStore(standard_dirs[1])
+        assert store.candidates("privileged") == [3]
+        assert store.candidates("shared text") == [1, 2]
+        assert store.candidates("zzz") == []
+        assert store.candidates("!!") is None
+
+    def test_flatten_accepts_bare_structure(self):
+        assert flatten_clauses(self.FULL_TEXT["structure"]) == flatten_clauses(self.FULL_TEXT)
+
+    def test_registry_loads_compact_standard(self, tmp_path):
+        config = Config(tmp_path / "test-config")
+        standard_dir = config.standards_dir / "iso_a"
+        standard_dir.mkdir()
+        (standard_dir / "metadata.json").write_text(
+            json.dumps({"standard_id": "iso_a", "title": "ISO A"})
+        )
+        write_compact_standard(self.FULL_TEXT, standard_dir)
+        config.add_standard("iso_a", "iso_a")
+
+        registry = StandardRegistry(config)
+        assert registry.get_clause_from_any_standard("a.1")[0] == "iso_a"
@@ -0,0 +1,143 @@
+"""Tests for pre-fork multi-worker serving."""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+import security_controls_mcp
+from security_controls_mcp import prefork
+from security_controls_mcp.prefork import (
+    DEFAULT_GRACEFUL_TIMEOUT,
+    PreforkSupervisor,
+    graceful_timeout_from_env,
+    max_requests_from_env,
+    workers_from_env,
+)
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+
+# Workers answer each connection with their PID and exit after `limit`
+# connections; with "ignore-sigterm" they only stop when killed
+SUPERVISOR_SCRIPT = textwrap.dedent("""
+    import os, signal, socket, sys
+    from security_controls_mcp.prefork import PreforkSupervisor
+
+    def serve(sock, limit):
+        if "ignore-sigterm" in sys.argv:
+            signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        for _ in range(limit):
+            conn, _ = sock.accept()
+            conn.sendall(str(os.getpid()).encode())
+            conn.close()
+
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(16)
+    print(sock.getsockname()[1], flush=True)
+    sys.exit(PreforkSupervisor(serve, 2, max_requests=2, graceful_timeout=2).run(sock))
+    """)
+
+
+def _start_supervisor(*args):
+    """Run SUPERVISOR_SCRIPT; returns the process and the port it listens on."""
+    env = dict(os.environ)
+    package_root = os.path.dirname(os.path.dirname(security_controls_mcp.__file__))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+    proc = subprocess.Popen(
+        [sys.executable, "-c", SUPERVISOR_SCRIPT, *args],
+        stdout=subprocess.PIPE,
+        text=True,
+        env=env,
+    )
+    return proc, int(proc.stdout.readline())
+
+
+class TestEnvironment:
+    """Test configuration from the environment."""
+
+    def test_defaults(self, monkeypatch):
+        for name in ("WORKERS", "MAX_REQUESTS", "GRACEFUL_TIMEOUT"):
+            monkeypatch.delenv(f"SECURITY_CONTROLS_MCP_{name}", raising=False)
+        assert workers_from_env() == 1
+        assert max_requests_from_env() == 0
+        assert graceful_timeout_from_env() == DEFAULT_GRACEFUL_TIMEOUT
+
+    def test_values(self, monkeypatch):
+        monkeypatch.setenv("SECURITY_CONTROLS_MCP_WORKERS", "4")
+        monkeypatch.setenv("SECURITY_CONTROLS_MCP_MAX_REQUESTS", "1000")
+        assert workers_from_env() == 4
+        assert max_requests_from_env() == 1000
+
+    def test_auto_and_invalid(self, monkeypatch):
+        monkeypatch.setenv("SECURITY_CONTROLS_MCP_WORKERS", "auto")
+        assert workers_from_env() == (os.cpu_count() or 1)
+        monkeypatch.setenv("SECURITY_CONTROLS_MCP_WORKERS", "many")
+        assert workers_from_env() == 1
+        monkeypatch.setenv("SECURITY_CONTROLS_MCP_WORKERS", "0")
+        assert workers_from_env() == 1
+
+
+class TestPreforkSupervisor:
+    """Test forking, recycling and stopping workers."""
+
+    def test_recycles_and_stops_workers(self):
+        proc, port = _start_supervisor()
+        try:
+            pids = []
+            # The first connection also waits for the supervisor to be running
+            for _ in range(12):
+                with socket.create_connection(("127.0.0.1", port), timeout=5) as conn:
+                    pids.append(int(conn.recv(32)))
+
+            # Each worker serves two connections before it is replaced
+            assert len(set(pids)) >= 6
+            assert proc.pid not in pids
+
+            proc.send_signal(signal.SIGTERM)
+            assert proc.wait(timeout=10) == 0
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+
+    def test_kills_workers_after_graceful_timeout(self):
+        proc, port = _start_supervisor("ignore-sigterm")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=5) as conn:
+                conn.recv(32)
+
+            started = time.monotonic()
+            proc.send_signal(signal.SIGTERM)
+            assert proc.wait(timeout=10) == 0
+            assert 2 <= time.monotonic() - started < 10
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+
+    def test_failing_workers_respawn_without_blocking(self, monkeypatch):
+        monkeypatch.setattr(prefork, "MIN_WORKER_UPTIME", 0.2)
+        supervisor = PreforkSupervisor(lambda sock, limit: None, 2)
+        now = time.monotonic()
+        supervisor._workers = {101: now, 102: now}
+        # Both workers exit with status 1 right after starting
+        exits = [(101, 256), (102, 256), (0, 0)]
+        monkeypatch.setattr(prefork.os, "waitpid", lambda pid, options: exits.pop(0))
+        spawned = []
+        monkeypatch.setattr(supervisor, "_spawn", spawned.append)
+
+        started = time.monotonic()
+        supervisor._reap("sock")
+        supervisor._spawn_due("sock")
+        assert time.monotonic() - started < 0.2
+        assert spawned == []
+
+        time.sleep(0.25)
+        supervisor._spawn_due("sock")
+        assert spawned == ["sock", "sock"]
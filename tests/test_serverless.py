@@ -0,0 +1,73 @@
+"""Tests for the serverless (Vercel) JSON-RPC dispatch."""
+
+import json
+import os
+import subprocess
+import sys
+
+import security_controls_mcp
+from security_controls_mcp import serverless
+
+
+def call(request):
+    return json.loads(serverless.handle(json.dumps(request).encode()))
+
+
+class TestServerlessHandle:
+    def test_static_responses_carry_request_id(self):
+        first = call({"jsonrpc": "2.0", "id": 7, "method": "tools/list"})
+        second = call({"jsonrpc": "2.0", "id": "abc", "method": "tools/list"})
+        assert first["id"] == 7
+        assert second["id"] == "abc"
+        assert first["result"] == second["result"]
+        assert len(first["result"]["tools"]) == 14
+
+    def test_initialize(self):
+        response = call({"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}})
+        assert response["result"]["serverInfo"]["name"] == "security-controls-mcp"
+        assert response["result"]["protocolVersion"] == serverless.PROTOCOL_VERSION
+
+    def test_tools_call(self):
+        response = call(
+            {
+                "jsonrpc": "2.0",
+                "id": 3,
+                "method": "tools/call",
+                "params": {"name": "version_info", "arguments": {}},
+            }
+        )
+        assert response["id"] == 3
+        assert response["result"]["content"][0]["type"] == "text"
+
+    def test_tools_call_reuses_event_loop(self):
+        request = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "tools/call",
+            "params": {"name": "version_info", "arguments": {}},
+        }
+        loop = serverless._loop
+        call(request)
+        call(request)
+        assert serverless._loop is loop
+        assert not loop.is_closed()
+
+    def test_errors(self):
+        assert json.loads(serverless.handle(b""))["error"]["code"] == -32700
+        assert json.loads(serverless.handle(b"{not json"))["error"]["code"] == -32700
+        response = call({"jsonrpc": "2.0", "id": 9, "method": "resources/list"})
+        assert response["id"] == 9
+        assert response["error"]["code"] == -32601
+
+    def test_does_not_import_http_server(self):
+        code = (
+            "import sys; import security_controls_mcp.serverless; "
+            "print('security_controls_mcp.http_server' in sys.modules)"
+        )
+        env = dict(os.environ)
+        package_root = os.path.dirname(os.path.dirname(security_controls_mcp.__file__))
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env
+        )
+        assert result.stdout.strip() == "False"
@@ -0,0 +1,99 @@
+"""Tests for the control similarity table."""
+
+import math
+
+import pytest
+
+from security_controls_mcp.data_loader import SCFData
+from security_controls_mcp.similarity import (
+    SIMILARITY_FILE,
+    TOP_K,
+    build_similarity,
+    load_similarity_snapshot,
+    write_similarity_snapshot,
+)
+
+
+@pytest.fixture(scope="module")
+def scf_data():
+    return SCFData()
+
+
+def _control(control_id, **mappings):
+    return {"id": control_id, "framework_mappings": mappings}
+
+
+class TestBuildSimilarity:
+    """Test scoring of controls by shared requirements."""
+
+    def test_scores(self):
+        controls = [
+            _control("A-01", dora=["1", "2"], nis2=["a"]),
+            _control("A-02", dora=["1", "2"], nis2=None),
+            _control("A-03", dora=["3"]),
+            _control("A-04", dora=None),
+        ]
+        table = build_similarity(controls)
+        assert table["A-01"] == [["A-02", 2, round(2 / 3, 4), round(2 / math.sqrt(6), 4)]]
+        assert table["A-03"] == []
+        assert "A-04" not in table
+
+    def test_keeps_top_k_by_each_metric(self):
+        # A-01 has the best Jaccard with the narrow A-02 but the best cosine
+        # with the broad A-03; with top_k=1 both must be kept
+        broad = ["1", "2", "3", "4"] + [f"x{n}" for n in range(17)]
+        controls = [
+            _control("A-01", dora=["1", "2", "3", "4"]),
+            _control("A-02", dora=["1", "y"]),
+            _control("A-03", dora=broad),
+        ]
+        table = build_similarity(controls, top_k=1)
+        assert [entry[0] for entry in table["A-01"]] == ["A-02", "A-03"]
+
+    def test_matches_brute_force(self, scf_data):
+        table = build_similarity(scf_data.controls[:200])
+        features = {
+            ctrl["id"]: {
+                (fw, req) for fw, ids in ctrl["framework_mappings"].items() if ids for req in ids
+            }
+            for ctrl in scf_data.controls[:200]
+        }
+        for control_id, entries in list(table.items())[:20]:
+            for related_id, shared, jaccard, _ in entries:
+                assert shared == len(features[control_id] & features[related_id])
+                union = len(features[control_id] | features[related_id])
+                assert jaccard == round(shared / union, 4)
+
+
+class TestSnapshot:
+    """Test writing and loading the snapshot."""
+
+    def test_round_trip(self, scf_data, tmp_path):
+        path = write_similarity_snapshot(scf_data.controls, scf_data.fingerprint, tmp_path)
+        assert path.name == SIMILARITY_FILE
+        table = load_similarity_snapshot(path, scf_data.fingerprint)
+        assert table == build_similarity(scf_data.controls)
+
+    def test_other_fingerprint_ignored(self, scf_data, tmp_path):
+        path = write_similarity_snapshot(scf_data.controls, "000000000000", tmp_path)
+        assert load_similarity_snapshot(path, scf_data.fingerprint) is None
+        assert load_similarity_snapshot(tmp_path / "missing.json.gz", scf_data.fingerprint) is None
+
+
+class TestRelatedControls:
+    """Test SCFData.related_controls."""
+
+    def test_ranked_by_metric(self, scf_data):
+        control_id = scf_data.controls[0]["id"]
+        for metric in ("jaccard", "cosine"):
+            related = scf_data.related_controls(control_id, TOP_K, metric)
+            scores = [item[metric] for item in related]
+            assert scores == sorted(scores, reverse=True)
+            assert control_id not in {item["scf_id"] for item in related}
+
+    def test_limit(self, scf_data):
+        assert len(scf_data.related_controls(scf_data.controls[0]["id"], 3)) <= 3
+
+    def test_unknown_metric(self, scf_data):
+        with pytest.raises(ValueError):
+            scf_data.related_controls(scf_data.controls[0]["id"], metric="dice")
@@ -0,0 +1,166 @@
+"""Tests for single-flight request coalescing."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from security_controls_mcp import http_server
+from security_controls_mcp.metrics import SINGLE_FLIGHT_REQUESTS
+from security_controls_mcp.singleflight import (
+    SingleFlight,
+    request_key,
+    single_flight_from_env,
+    single_flight_threads_from_env,
+)
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_one_computation(self):
+        flight = SingleFlight("test")
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"value": 42}
+
+        async def main():
+            return await asyncio.gather(*(flight.do("key", compute) for _ in range(5)))
+
+        results = asyncio.run(main())
+        assert len(calls) == 1
+        assert results == [{"value": 42}] * 5
+        assert flight.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 4}
+
+    def test_sequential_calls_recompute(self):
+        flight = SingleFlight("test")
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return len(calls)
+
+        async def main():
+            return [await flight.do("key", compute), await flight.do("key", compute)]
+
+        assert asyncio.run(main()) == [1, 2]
+
+    def test_error_is_shared(self):
+        flight = SingleFlight("test")
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        async def main():
+            return await asyncio.gather(
+                flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+            )
+
+        results = asyncio.run(main())
+        assert all(isinstance(result, ValueError) for result in results)
+
+    def test_follower_takes_over_cancelled_leader(self):
+        flight = SingleFlight("test")
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def main():
+            leader = asyncio.create_task(flight.do("key", compute))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(flight.do("key", compute))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await follower
+
+        assert asyncio.run(main()) == "done"
+        assert len(calls) == 2
+
+    def test_request_key_is_canonical(self):
+        assert request_key("map", {"a": 1, "b": [2]}) == request_key("map", {"b": [2], "a": 1})
+        assert request_key("map", {"a": 1}) != request_key("map", {"a": 2})
+
+    def test_env(self, monkeypatch):
+        assert single_flight_from_env()
+        monkeypatch.setenv("SECURITY_CONTROLS_MCP_SINGLE_FLIGHT", "0")
+        assert not single_flight_from_env()
+        assert single_flight_threads_from_env()
+        monkeypatch.setenv("SECURITY_CONTROLS_MCP_SINGLE_FLIGHT_THREADS", "0")
+        assert not single_flight_threads_from_env()
+
+
+class TestHTTPCoalescing:
+    @pytest.fixture
+    def slow_search(self, monkeypatch):
+        calls = []
+        search_controls = http_server.scf_data.search_controls
+
+        def slow(*args):
+            calls.append(args)
+            time.sleep(0.2)
+            return search_controls(*args)
+
+        slow.__name__ = "search_controls"
+        monkeypatch.setattr(http_server.scf_data, "search_controls", slow)
+        return calls
+
+    def _gather(self, *requests):
+        async def main():
+            transport = httpx.ASGITransport(app=http_server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await asyncio.gather(*(request(client) for request in requests))
+
+        return asyncio.run(main())
+
+    def test_rest(self, slow_search):
+        before = SINGLE_FLIGHT_REQUESTS.value(flight="rest", role="follower")
+        responses = self._gather(
+            *[lambda client: client.get("/api/search?query=access+review&limit=4")] * 4
+        )
+        assert len(slow_search) == 1
+        assert len({response.content for response in responses}) == 1
+        assert SINGLE_FLIGHT_REQUESTS.value(flight="rest", role="follower") == before + 3
+
+    MCP_BODY = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "tools/call",
+        "params": {"name": "search_controls", "arguments": {"query": "key rotation"}},
+    }
+
+    def test_mcp(self, slow_search):
+        before = SINGLE_FLIGHT_REQUESTS.value(flight="tools", role="follower")
+        responses = self._gather(*[lambda client: client.post("/mcp", json=self.MCP_BODY)] * 4)
+        assert len(slow_search) == 1
+        assert all(response.status_code == 200 for response in responses)
+        assert len({response.content for response in responses}) == 1
+        assert SINGLE_FLIGHT_REQUESTS.value(flight="tools", role="follower") == before + 3
+
+    def test_mcp_on_event_loop_without_threads(self, monkeypatch):
+        monkeypatch.setattr(http_server, "SINGLE_FLIGHT_THREADS", False)
+        threads = []
+        search_controls = http_server.scf_data.search_controls
+
+        def record(*args):
+            threads.append(threading.get_ident())
+            return search_controls(*args)
+
+        record.__name__ = "search_controls"
+        monkeypatch.setattr(http_server.scf_data, "search_controls", record)
+
+        async def main():
+            transport = httpx.ASGITransport(app=http_server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post("/mcp", json=self.MCP_BODY)
+            return response, threading.get_ident()
+
+        response, loop_thread = asyncio.run(main())
+        assert response.status_code == 200
+        assert threads == [loop_thread]
@@ -0,0 +1,249 @@
+"""Tests for tenant-scoped paid standards and the shared provider cache."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from starlette.testclient import TestClient
+
+import security_controls_mcp
+from security_controls_mcp import http_server
+from security_controls_mcp.config import Config
+from security_controls_mcp.provider_cache import ProviderCache
+from security_controls_mcp.registry import StandardRegistry
+from security_controls_mcp.tenancy import (
+    TenantAuthError,
+    TenantRegistries,
+    hash_api_key,
+    load_tenant_registries,
+)
+
+from .test_paid_standards import _write_standard
+
+
+def _tenant_config(tmp_path, name, clauses):
+    config = Config(tmp_path / name)
+    _write_standard(config.standards_dir, "iso_a", clauses)
+    config.add_standard("iso_a", "iso_a")
+    return config
+
+
+class TestProviderCache:
+    """Test the shared LRU provider cache."""
+
+    def test_identical_files_share_one_provider(self, tmp_path):
+        cache = ProviderCache(max_bytes=10**9)
+        first = _tenant_config(tmp_path, "a", [("A.1", "One")])
+        second = _tenant_config(tmp_path, "b", [("A.1", "One")])
+
+        registry_a = StandardRegistry(first, provider_cache=cache)
+        registry_b = StandardRegistry(second, provider_cache=cache)
+
+        assert registry_a.get_provider("iso_a").key == registry_b.get_provider("iso_a").key
+        assert cache.stats()["providers"] == 1
+        assert registry_b.get_clause_from_any_standard("A.1")[1].title == "One"
+
+    def test_different_files_are_separate(self, tmp_path):
+        cache = ProviderCache(max_bytes=10**9)
+        registry_a = StandardRegistry(
+            _tenant_config(tmp_path, "a", [("A.1", "One")]), provider_cache=cache
+        )
+        registry_b = StandardRegistry(
+            _tenant_config(tmp_path, "b", [("A.1", "Uno")]), provider_cache=cache
+        )
+
+        assert cache.stats()["providers"] == 2
+        assert registry_a.get_clause_from_any_standard("A.1")[1].title == "One"
+        assert registry_b.get_clause_from_any_standard("A.1")[1].title == "Uno"
+
+    def test_evicts_to_stay_within_budget(self, tmp_path):
+        cache = ProviderCache(max_bytes=1)
+        registry_a = StandardRegistry(
+            _tenant_config(tmp_path, "a", [("A.1", "One")]), provider_cache=cache
+        )
+        registry_b = StandardRegistry(
+            _tenant_config(tmp_path, "b", [("A.1", "Uno")]), provider_cache=cache
+        )
+
+        assert cache.stats()["providers"] == 1
+        # Evicted providers reload transparently
+        assert registry_a.get_clause_from_any_standard("A.1")[1].title == "One"
+        assert registry_b.get_clause_from_any_standard("A.1")[1].title == "Uno"
+        assert cache.stats()["evictions"] >= 2
+
+    def test_signature_keys_evicted_with_providers(self, tmp_path):
+        cache = ProviderCache(max_bytes=1)
+        for name in ("a", "b", "c"):
+            StandardRegistry(_tenant_config(tmp_path, name, [("A.1", name)]), provider_cache=cache)
+
+        assert cache.stats()["providers"] == 1
+        assert set(cache._keys.values()) <= set(cache._entries)
+
+    def test_changed_files_are_not_cached_under_shared_key(self, tmp_path):
+        cache = ProviderCache(max_bytes=1)
+        registry_a = StandardRegistry(
+            _tenant_config(tmp_path, "a", [("A.1", "One")]), provider_cache=cache
+        )
+        config_b = _tenant_config(tmp_path, "b", [("A.1", "One")])
+        registry_b = StandardRegistry(config_b, provider_cache=cache)
+        StandardRegistry(_tenant_config(tmp_path, "c", [("A.1", "Other")]), provider_cache=cache)
+
+        # Tenant b re-imports different content; before its registry reloads,
+        # tenant a must still see its own text
+        full_text = config_b.standards_dir / "iso_a" / "full_text.json"
+        full_text.write_text(full_text.read_text().replace("One", "Changed"))
+        assert registry_b.get_provider("iso_a").get_clause("A.1").title == "Changed"
+        assert registry_a.get_provider("iso_a").get_clause("A.1").title == "One"
+
+
+class TestTenantRegistries:
+    """Test tenant resolution and isolation."""
+
+    @pytest.fixture
+    def tenants(self, tmp_path):
+        _tenant_config(tmp_path, "team-a", [("A.1", "Team A text")])
+        _tenant_config(tmp_path, "team-b", [("B.1", "Team B text")])
+        return TenantRegistries(
+            {
+                "team-a": {
+                    "config_dir": str(tmp_path / "team-a"),
+                    "api_key_sha256": [hash_api_key("key-a")],
+                },
+                "team-b": {
+                    "config_dir": str(tmp_path / "team-b"),
+                    "api_key_sha256": [hash_api_key("key-b")],
+                },
+            },
+            provider_cache=ProviderCache(max_bytes=10**9),
+        )
+
+    def test_api_key_selects_tenant(self, tenants):
+        assert tenants.resolve({"x-api-key": "key-a"}) == "team-a"
+        assert tenants.resolve({"authorization": "Bearer key-b"}) == "team-b"
+
+    def test_tenants_do_not_see_each_other(self, tenants):
+        registry_a = tenants.registry_for("team-a")
+        registry_b = tenants.registry_for("team-b")
+        assert registry_a.get_clause_from_any_standard("B.1") is None
+        assert registry_b.get_clause_from_any_standard("A.1") is None
+
+    def test_unknown_key_is_rejected(self, tenants):
+        with pytest.raises(TenantAuthError):
+            tenants.resolve({"x-api-key": "wrong"})
+
+    def test_key_must_match_tenant_header(self, tenants):
+        with pytest.raises(TenantAuthError):
+            tenants.resolve({"x-api-key": "key-a", "x-tenant-id": "team-b"})
+
+    def test_tenant_header_ignored_unless_trusted(self, tenants):
+        assert tenants.resolve({"x-tenant-id": "team-a"}) is None
+        tenants.trust_tenant_header = True
+        assert tenants.resolve({"x-tenant-id": "team-a"}) == "team-a"
+        with pytest.raises(TenantAuthError):
+            tenants.resolve({"x-tenant-id": "team-c"})
+
+    def test_anonymous_has_no_paid_standards(self, tenants):
+        assert tenants.resolve({}) is None
+        assert not tenants.registry_for(None).has_paid_standards()
+
+    def test_duplicate_api_key_rejected(self, tmp_path):
+        key_hash = hash_api_key("shared")
+        with pytest.raises(ValueError):
+            TenantRegistries(
+                {
+                    "a": {"config_dir": str(tmp_path / "a"), "api_key_sha256": [key_hash]},
+                    "b": {"config_dir": str(tmp_path / "b"), "api_key_sha256": [key_hash]},
+                }
+            )
+
+    def test_load_from_env(self, tmp_path, monkeypatch):
+        _tenant_config(tmp_path, "team-a", [("A.1", "Team A text")])
+        tenants_file = tmp_path / "tenants.json"
+        tenants_file.write_text(
+            json.dumps(
+                {
+                    "tenants": {
+                        "team-a": {"config_dir": "team-a", "api_key_sha256": [hash_api_key("k")]}
+                    }
+                }
+            )
+        )
+        monkeypatch.setenv("SECURITY_CONTROLS_MCP_TENANTS_FILE", str(tenants_file))
+
+        tenants = load_tenant_registries()
+        assert tenants.registry_for("team-a").get_provider("iso_a") is not None
+
+    def test_not_configured(self, monkeypatch):
+        monkeypatch.delenv("SECURITY_CONTROLS_MCP_TENANTS_FILE", raising=False)
+        assert load_tenant_registries() is None
+
+    def test_server_skips_default_config_in_tenant_mode(self, tmp_path):
+        _tenant_config(tmp_path, "default", [("A.1", "Default text")])
+        tenants_file = tmp_path / "tenants.json"
+        tenants_file.write_text(json.dumps({"tenants": {}}))
+        env = dict(os.environ)
+        package_root = os.path.dirname(os.path.dirname(security_controls_mcp.__file__))
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+        env["SECURITY_CONTROLS_MCP_CONFIG_DIR"] = str(tmp_path / "default")
+        env["SECURITY_CONTROLS_MCP_TENANTS_FILE"] = str(tenants_file)
+        script = (
+            "from security_controls_mcp import http_server as s;"
+            "print(s.registry is s.tenants.anonymous, s.registry.get_provider('iso_a'))"
+        )
+
+        result = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, env=env, check=True
+        )
+        assert result.stdout.strip() == "True None"
+
+
+class TestHttpTenantIsolation:
+    """Test that the MCP endpoint serves each caller its own standards."""
+
+    @pytest.fixture
+    def client(self, tmp_path, monkeypatch):
+        _tenant_config(tmp_path, "team-a", [("A.1", "Team A text")])
+        tenants = TenantRegistries(
+            {
+                "team-a": {
+                    "config_dir": str(tmp_path / "team-a"),
+                    "api_key_sha256": [hash_api_key("key-a")],
+                }
+            },
+            provider_cache=ProviderCache(max_bytes=10**9),
+        )
+        monkeypatch.setattr(http_server, "tenants", tenants)
+        return TestClient(http_server.app)
+
+    @staticmethod
+    def _call(client, headers, name, arguments):
+        body = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "tools/call",
+            "params": {"name": name, "arguments": arguments},
+        }
+        response = client.post("/mcp", json=body, headers=headers)
+        payload = json.loads(response.text.split("data: ", 1)[1])
+        return response.status_code, payload
+
+    def test_tenant_sees_own_clause(self, client):
+        status, payload = self._call(
+            client, {"X-API-Key": "key-a"}, "get_clause", {"standard": "iso_a", "clause_id": "A.1"}
+        )
+        assert status == 200
+        assert "Team A text" in payload["result"]["content"][0]["text"]
+
+    def test_anonymous_sees_no_paid_standards(self, client):
+        status, payload = self._call(
+            client, {}, "get_clause", {"standard": "iso_a", "clause_id": "A.1"}
+        )
+        assert status == 200
+        assert "Team A text" not in payload["result"]["content"][0]["text"]
+
+    def test_invalid_key_rejected(self, client):
+        status, payload = self._call(client, {"X-API-Key": "nope"}, "list_available_standards", {})
+        assert status == 401
+        assert payload["error"]["code"] == -32001
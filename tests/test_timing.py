@@ -0,0 +1,88 @@
+"""Tests for per-request phase timing (Server-Timing)."""
+
+import json
+import logging
+import time
+
+from starlette.testclient import TestClient
+
+from security_controls_mcp.http_server import app as http_app
+from security_controls_mcp.timing import (
+    PhaseTimer,
+    ServerTimingMiddleware,
+    _current,
+    phase,
+    server_timing_from_env,
+    timed_phase,
+)
+
+
+def _phases(header):
+    return {entry.split(";")[0]: float(entry.split("dur=")[1]) for entry in header.split(", ")}
+
+
+class TestPhaseTimer:
+    def test_nested_phases_are_exclusive(self):
+        timer = PhaseTimer()
+        token = _current.set(timer)
+        try:
+            with phase("render"):
+                time.sleep(0.01)
+                with phase("search"):
+                    time.sleep(0.02)
+        finally:
+            _current.reset(token)
+        assert 0.01 <= timer.phases["render"] < 0.02
+        assert timer.phases["search"] >= 0.02
+        assert sum(timer.phases.values()) <= timer.total()
+
+    def test_disabled_is_noop(self):
+        @timed_phase("search")
+        def lookup():
+            return 42
+
+        assert lookup() == 42
+        with phase("parse"):
+            pass
+
+    def test_header(self):
+        timer = PhaseTimer()
+        timer.phases["parse"] = 0.0015
+        assert timer.header().startswith("parse;dur=1.50, total;dur=")
+
+    def test_env(self, monkeypatch):
+        monkeypatch.setenv("SECURITY_CONTROLS_MCP_SERVER_TIMING", "true")
+        assert server_timing_from_env()
+        monkeypatch.setenv("SECURITY_CONTROLS_MCP_SERVER_TIMING", "0")
+        assert not server_timing_from_env()
+
+
+class TestServerTimingMiddleware:
+    def test_mcp_tool_call(self, caplog):
+        client = TestClient(ServerTimingMiddleware(http_app, header=True, log=True))
+        with caplog.at_level(logging.INFO, logger="security_controls_mcp.timing"):
+            response = client.post(
+                "/mcp",
+                json={
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "tools/call",
+                    "params": {"name": "search_controls", "arguments": {"query": "encryption"}},
+                },
+            )
+        phases = _phases(response.headers["server-timing"])
+        assert {"parse", "search", "render", "encode", "total"} <= set(phases)
+
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record["path"] == "/mcp"
+        assert record["tool"] == "search_controls"
+        assert record["status"] == 200
+        assert "search_ms" in record
+
+    def test_rest_endpoint(self):
+        client = TestClient(ServerTimingMiddleware(http_app))
+        response = client.get("/api/search?query=encryption&limit=3")
+        assert {"parse", "search", "encode"} <= set(_phases(response.headers["server-timing"]))
+
+    def test_not_installed_by_default(self):
+        assert "server-timing" not in TestClient(http_app).get("/health").headers